@@ -5,19 +5,46 @@ from typing import Optional
 
 from config.settings import DB_PATH, SCHEMA_PATH
 
+# Commits that changed rows, across every connection this process opened
+_write_count = 0
 
-def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+
+def write_count() -> int:
+    """Number of committed writes made by this process so far."""
+    return _write_count
+
+
+class _CountingConnection(sqlite3.Connection):
+    """Connection that bumps the process-wide write count on each commit."""
+
+    _committed_changes = 0
+
+    def commit(self) -> None:
+        global _write_count
+        super().commit()
+        if self.total_changes != self._committed_changes:
+            self._committed_changes = self.total_changes
+            _write_count += 1
+
+
+def get_connection(
+    db_path: Optional[str] = None, check_same_thread: bool = True
+) -> sqlite3.Connection:
     """Return a SQLite connection with row factory and foreign keys enabled.
 
     Args:
         db_path: Optional path override (used for in-memory testing).
                  Defaults to the configured DB_PATH.
+        check_same_thread: Passed to sqlite3.connect; False allows a
+                 long-lived connection to be shared between threads.
 
     Returns:
         sqlite3.Connection with Row factory and foreign keys ON.
     """
     path = db_path if db_path is not None else str(DB_PATH)
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(
+        path, check_same_thread=check_same_thread, factory=_CountingConnection
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
@@ -13,6 +13,8 @@ DB_DIR = DATA_DIR / "database"
 DB_PATH = DB_DIR / "study_tool.db"
 TESTS_DIR = DATA_DIR / "tests"
 BACKUPS_DIR = DATA_DIR / "backups"
+JOURNAL_PATH = DATA_DIR / "session.journal"
+ESSAY_MODEL_DIR = DATA_DIR / "essay_models"
 ASSETS_DIR = PROJECT_ROOT / "assets"
 SCHEMA_PATH = PROJECT_ROOT / "database" / "schema.sql"
 
@@ -53,6 +55,20 @@ COLOR_TOPIC_STRONG = "#2fa572"
 # Weak topic threshold
 WEAK_TOPIC_THRESHOLD = 70.0
 
+# Essay auto-grading (opt-in): essays whose TF-IDF cosine similarity to
+# the expected answer reaches the threshold are marked correct
+ESSAY_AUTO_GRADE = False
+ESSAY_SIMILARITY_THRESHOLD = 0.5
+
+# Most questions in one "Study What's Due" session
+REVIEW_DUE_LIMIT = 50
+
+# Analytics results kept between database writes
+ANALYTICS_CACHE_SIZE = 64
+
+# Days ahead of today for the readiness forecast chart
+READINESS_HORIZON_DAYS = 14
+
 # Default values
 DEFAULT_OPTIONS_COUNT = 4
 
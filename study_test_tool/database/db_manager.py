@@ -1,12 +1,97 @@
 """Database manager — all SQL operations live here."""
 
+import base64
+import hashlib
+import json
 import sqlite3
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
-from config.database import get_connection
+from config.database import get_connection, write_count
+from config.settings import DB_PATH
 from models.question import Question, QuestionOption
+from models.review_card import ReviewCard
 from models.test import Test
-from models.test_result import QuestionResponse, TestAttempt
+from models.test_result import QuestionResponse, StudySession, TestAttempt
+
+# Most ids bound into one ``IN (...)`` list (SQLite's default limit is 999)
+SQL_PARAM_CHUNK = 900
+
+# Synced tables in dependency order: (table, parent links, payload columns).
+# Parent links name a foreign key column and the table it points at; rows
+# are exchanged with the parent's uuid so integer ids never leave a machine.
+SYNC_TABLES: List[Tuple[str, List[Tuple[str, str]], List[str]]] = [
+    ("tests", [], ["name", "description", "group_name", "created_at"]),
+    (
+        "questions",
+        [("test_id", "tests")],
+        ["question_text", "question_type", "correct_answer", "category", "created_at"],
+    ),
+    ("question_options", [("question_id", "questions")], ["option_text", "is_correct"]),
+    (
+        "sessions",
+        [],
+        [
+            "mode",
+            "score",
+            "total_questions",
+            "percentage",
+            "time_taken",
+            "completed_at",
+            "seed",
+            "shuffle_version",
+            "source_test_ids",
+        ],
+    ),
+    (
+        "test_attempts",
+        [("test_id", "tests"), ("session_id", "sessions")],
+        [
+            "score",
+            "total_questions",
+            "percentage",
+            "time_taken",
+            "mode",
+            "completed_at",
+            "timeline",
+            "seed",
+            "shuffle_version",
+        ],
+    ),
+    (
+        "question_responses",
+        [("attempt_id", "test_attempts"), ("question_id", "questions")],
+        ["user_answer", "is_correct", "was_flagged", "time_spent"],
+    ),
+]
+
+# Parent links that may be NULL; a row without the parent is still synced
+SYNC_OPTIONAL_LINKS = {"session_id"}
+
+# BLOB payload columns, carried as base64 text in change files
+SYNC_BLOB_COLUMNS = {"timeline"}
+
+
+def _parent_uuid_key(fk_column: str) -> str:
+    """Map a foreign key column (test_id) to its change-file key (test_uuid)."""
+    return fk_column[: -len("_id")] + "_uuid"
+
+
+def _content_hash(row: Dict, columns: List[str]) -> str:
+    """Stable digest of a row's payload, used to break timestamp ties."""
+    payload = json.dumps([row.get(col) for col in columns], default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _question_key(text: Optional[str], question_type: Optional[str]) -> str:
+    """Content hash used to recognise the same question across databases.
+
+    Whitespace and case are normalized so trivially reformatted copies of a
+    question still match.
+    """
+    normalized = " ".join((text or "").split()).casefold()
+    payload = f"{question_type or ''}\x1f{normalized}"
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
 
 class DatabaseManager:
@@ -15,6 +100,7 @@ class DatabaseManager:
     def __init__(self, db_path: Optional[str] = None) -> None:
         """Initialize with optional db_path override for testing."""
         self._db_path = db_path
+        self._probe: Optional[sqlite3.Connection] = None
         self._run_migrations()
 
     def _conn(self) -> sqlite3.Connection:
@@ -153,6 +239,95 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def get_question_counts(self) -> Dict[int, int]:
+        """Get the number of questions for every test in one query."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT test_id, COUNT(*) AS cnt FROM questions GROUP BY test_id"
+            ).fetchall()
+            return {row["test_id"]: row["cnt"] for row in rows}
+        finally:
+            conn.close()
+
+    def test_exists(self, test_id: int) -> bool:
+        """Check whether a test exists without loading its questions."""
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM tests WHERE id = ?", (test_id,)
+            ).fetchone()
+            return row is not None
+        finally:
+            conn.close()
+
+    def get_question_problems(
+        self, test_ids: Optional[Sequence[int]] = None
+    ) -> List[Dict]:
+        """Find questions whose answers or options look incomplete.
+
+        Option counts are aggregated per question in one pass and only
+        suspicious rows are returned, so a clean library costs one scan.
+
+        Args:
+            test_ids: Optional filter by test. ``None`` checks every test.
+
+        Returns:
+            List of dicts with test_id, question_id, position (1-based
+            within its test), question_type, missing_answer, option_count
+            and correct_count, ordered by test and position.
+        """
+        where = ""
+        params: list = []
+        if test_ids is not None:
+            if not test_ids:
+                return []
+            where = f"WHERE q.test_id IN ({', '.join('?' * len(test_ids))}) "
+            params.extend(test_ids)
+
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM ("
+                "SELECT q.test_id, q.id AS question_id, "
+                "ROW_NUMBER() OVER (PARTITION BY q.test_id ORDER BY q.id) "
+                "AS position, q.question_type, "
+                "TRIM(COALESCE(q.correct_answer, '')) = '' AS missing_answer, "
+                "COUNT(o.id) AS option_count, "
+                "COALESCE(SUM(o.is_correct = 1), 0) AS correct_count "
+                "FROM questions q "
+                "LEFT JOIN question_options o ON o.question_id = q.id "
+                f"{where}"
+                "GROUP BY q.id"
+                ") WHERE (question_type = 'multiple_choice' AND ("
+                "missing_answer OR option_count = 0 OR correct_count != 1)) "
+                "OR (question_type = 'essay' AND missing_answer) "
+                "ORDER BY test_id, position",
+                params,
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def count_known_questions(
+        self, questions: Sequence[Tuple[str, str]]
+    ) -> int:
+        """Count how many (text, type) pairs already exist in any test.
+
+        Matching ignores case and whitespace, like database merges.
+        """
+        conn = self._conn()
+        try:
+            known = {
+                _question_key(row["question_text"], row["question_type"])
+                for row in conn.execute(
+                    "SELECT question_text, question_type FROM questions"
+                )
+            }
+        finally:
+            conn.close()
+        return sum(_question_key(text, q_type) in known for text, q_type in questions)
+
     # ── Question CRUD ──────────────────────────────────────────
 
     def add_question(self, question: Question) -> int:
@@ -184,6 +359,56 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def create_test_with_questions(
+        self, test: Test, questions: Sequence[Question]
+    ) -> int:
+        """Create a test and all of its questions in a single transaction.
+
+        Used by bulk imports so a large file costs one commit instead of
+        one per question, and a failure leaves no half-imported test.
+
+        Returns:
+            The id of the created test.
+        """
+        conn = self._conn()
+        try:
+            test_id = conn.execute(
+                "INSERT INTO tests (name, description, group_name) "
+                "VALUES (?, ?, ?)",
+                (test.name, test.description, test.group_name),
+            ).lastrowid
+
+            option_rows = []
+            for question in questions:
+                question_id = conn.execute(
+                    "INSERT INTO questions (test_id, question_text, question_type, "
+                    "correct_answer, category) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        test_id,
+                        question.text,
+                        question.type,
+                        question.correct_answer,
+                        question.category,
+                    ),
+                ).lastrowid
+                option_rows.extend(
+                    (question_id, option.text, option.is_correct)
+                    for option in question.options
+                )
+
+            conn.executemany(
+                "INSERT INTO question_options (question_id, option_text, is_correct) "
+                "VALUES (?, ?, ?)",
+                option_rows,
+            )
+            conn.commit()
+            return test_id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     def add_question_option(self, option: QuestionOption) -> int:
         """Add a single option to a question and return its id."""
         conn = self._conn()
@@ -213,10 +438,18 @@ class DatabaseManager:
             "category, created_at FROM questions WHERE test_id = ? ORDER BY id",
             (test_id,),
         ).fetchall()
+        return self._hydrate_questions(conn, q_rows)
 
-        questions = []
-        for q_row in q_rows:
-            question = Question(
+    def _hydrate_questions(
+        self, conn: sqlite3.Connection, q_rows: Sequence[sqlite3.Row]
+    ) -> List[Question]:
+        """Build Question objects from rows, loading all options in one pass.
+
+        Options are fetched with one ``IN`` query per SQL_PARAM_CHUNK
+        questions rather than one query per question.
+        """
+        questions = [
+            Question(
                 id=q_row["id"],
                 test_id=q_row["test_id"],
                 text=q_row["question_text"],
@@ -225,26 +458,136 @@ class DatabaseManager:
                 category=q_row["category"],
                 created_at=q_row["created_at"],
             )
-
+            for q_row in q_rows
+        ]
+        by_id = {question.id: question for question in questions}
+        ids = list(by_id)
+        for start in range(0, len(ids), SQL_PARAM_CHUNK):
+            chunk = ids[start:start + SQL_PARAM_CHUNK]
             o_rows = conn.execute(
                 "SELECT id, question_id, option_text, is_correct "
-                "FROM question_options WHERE question_id = ? ORDER BY id",
-                (question.id,),
+                "FROM question_options "
+                f"WHERE question_id IN ({', '.join('?' * len(chunk))}) "
+                "ORDER BY question_id, id",
+                chunk,
             ).fetchall()
-
-            question.options = [
-                QuestionOption(
-                    id=o_row["id"],
-                    question_id=o_row["question_id"],
-                    text=o_row["option_text"],
-                    is_correct=bool(o_row["is_correct"]),
+            for o_row in o_rows:
+                by_id[o_row["question_id"]].options.append(
+                    QuestionOption(
+                        id=o_row["id"],
+                        question_id=o_row["question_id"],
+                        text=o_row["option_text"],
+                        is_correct=bool(o_row["is_correct"]),
+                    )
                 )
-                for o_row in o_rows
-            ]
-            questions.append(question)
-
         return questions
 
+    def get_question_ids(self, test_ids: Sequence[int]) -> List[int]:
+        """Get the ids of every question in some tests, without loading them.
+
+        Ids are grouped by test in the order of ``test_ids`` and ordered by
+        id within each test.
+        """
+        if not test_ids:
+            return []
+        rank = {test_id: i for i, test_id in enumerate(test_ids)}
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT id, test_id FROM questions "
+                f"WHERE test_id IN ({', '.join('?' * len(rank))})",
+                list(rank),
+            ).fetchall()
+        finally:
+            conn.close()
+        rows.sort(key=lambda row: (rank[row["test_id"]], row["id"]))
+        return [row["id"] for row in rows]
+
+    def get_stratum_counts(
+        self, test_ids: Optional[Sequence[int]] = None
+    ) -> Dict[int, Dict[str, int]]:
+        """Count questions per test and category.
+
+        Args:
+            test_ids: Tests to count; all tests if omitted.
+
+        Returns:
+            Dict of test_id → {category: question count}.
+        """
+        sql = (
+            "SELECT test_id, COALESCE(category, '') AS category, COUNT(*) AS n "
+            "FROM questions"
+        )
+        params: List[int] = []
+        if test_ids is not None:
+            if not test_ids:
+                return {}
+            params = list(test_ids)
+            sql += f" WHERE test_id IN ({', '.join('?' * len(params))})"
+        sql += " GROUP BY test_id, category ORDER BY test_id, category"
+        conn = self._conn()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        counts: Dict[int, Dict[str, int]] = {}
+        for row in rows:
+            per_test = counts.setdefault(row["test_id"], {})
+            per_test[row["category"]] = per_test.get(row["category"], 0) + row["n"]
+        return counts
+
+    def get_question_ids_by_stratum(
+        self, test_ids: Sequence[int]
+    ) -> Dict[int, Dict[str, List[int]]]:
+        """Get question ids grouped by test and category, without loading them.
+
+        Returns:
+            Dict of test_id → {category: [question_id, ...]}, with ids in
+            ascending order. Tests follow the order of ``test_ids``.
+        """
+        if not test_ids:
+            return {}
+        strata: Dict[int, Dict[str, List[int]]] = {tid: {} for tid in test_ids}
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT id, test_id, COALESCE(category, '') AS category "
+                f"FROM questions WHERE test_id IN ({', '.join('?' * len(strata))}) "
+                "ORDER BY test_id, category, id",
+                list(strata),
+            ).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            strata[row["test_id"]].setdefault(row["category"], []).append(row["id"])
+        return {tid: cats for tid, cats in strata.items() if cats}
+
+    def get_questions_by_ids(self, question_ids: Sequence[int]) -> List[Question]:
+        """Load questions with their options for a list of ids.
+
+        Returns:
+            Questions in the order of ``question_ids``; ids that do not
+            exist are skipped.
+        """
+        conn = self._conn()
+        try:
+            rows = []
+            ids = list(question_ids)
+            for start in range(0, len(ids), SQL_PARAM_CHUNK):
+                chunk = ids[start:start + SQL_PARAM_CHUNK]
+                rows.extend(
+                    conn.execute(
+                        "SELECT id, test_id, question_text, question_type, "
+                        "correct_answer, category, created_at FROM questions "
+                        f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                )
+            by_id = {q.id: q for q in self._hydrate_questions(conn, rows)}
+        finally:
+            conn.close()
+        return [by_id[qid] for qid in question_ids if qid in by_id]
+
     def update_question(self, question: Question) -> None:
         """Update a question's text, type, correct_answer, and category."""
         conn = self._conn()
@@ -264,6 +607,106 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def update_question_with_options(self, question: Question) -> bool:
+        """Save an edited question by diffing its options against the stored ones.
+
+        Options keep their ids: an option with an id is updated in place
+        (only if its text or correctness changed), an option without an id
+        reuses an unclaimed stored option with the same text, anything else
+        is inserted, and stored options left unclaimed are deleted. The
+        question row is written at most once, so its updated_at moves once.
+        All of it happens in one transaction.
+
+        Args:
+            question: The edited question; option ids are filled in for new
+                and reused options.
+
+        Returns:
+            True if the answer key or question type changed.
+        """
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT question_text, question_type, correct_answer, category "
+                "FROM questions WHERE id = ?",
+                (question.id,),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Question with id {question.id} not found.")
+
+            stored = {
+                o_row["id"]: (o_row["option_text"], bool(o_row["is_correct"]))
+                for o_row in conn.execute(
+                    "SELECT id, option_text, is_correct FROM question_options "
+                    "WHERE question_id = ? ORDER BY id",
+                    (question.id,),
+                )
+            }
+
+            # Claim stored options: explicit ids first, then by matching text
+            unclaimed = dict(stored)
+            for option in question.options:
+                if option.id is not None and unclaimed.pop(option.id, None) is None:
+                    option.id = None
+            for option in question.options:
+                if option.id is None:
+                    match = next(
+                        (oid for oid, (text, _) in unclaimed.items()
+                         if text == option.text),
+                        None,
+                    )
+                    if match is not None:
+                        option.id = match
+                        del unclaimed[match]
+
+            changed = False
+            for option in question.options:
+                option.question_id = question.id
+                if option.id is None:
+                    option.id = conn.execute(
+                        "INSERT INTO question_options "
+                        "(question_id, option_text, is_correct) VALUES (?, ?, ?)",
+                        (question.id, option.text, option.is_correct),
+                    ).lastrowid
+                    changed = True
+                elif stored[option.id] != (option.text, bool(option.is_correct)):
+                    conn.execute(
+                        "UPDATE question_options SET option_text = ?, is_correct = ? "
+                        "WHERE id = ?",
+                        (option.text, option.is_correct, option.id),
+                    )
+                    changed = True
+            if unclaimed:
+                conn.executemany(
+                    "DELETE FROM question_options WHERE id = ?",
+                    [(oid,) for oid in unclaimed],
+                )
+                changed = True
+
+            fields = (
+                question.text,
+                question.type,
+                question.correct_answer,
+                question.category,
+            )
+            if changed or fields != tuple(row):
+                conn.execute(
+                    "UPDATE questions SET question_text = ?, question_type = ?, "
+                    "correct_answer = ?, category = ? WHERE id = ?",
+                    (*fields, question.id),
+                )
+
+            conn.commit()
+            return row["question_type"] != question.type or (
+                (row["correct_answer"] or "").strip()
+                != (question.correct_answer or "").strip()
+            )
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     def delete_question(self, question_id: int) -> None:
         """Delete a question and cascade to its options."""
         conn = self._conn()
@@ -333,6 +776,146 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def save_attempt_with_responses(self, attempt: TestAttempt) -> int:
+        """Save an attempt and all of its responses in one transaction.
+
+        Returns:
+            The id of the saved attempt (also set on the attempt and its
+            responses).
+        """
+        conn = self._conn()
+        try:
+            self._insert_attempts(conn, [attempt])
+            conn.commit()
+            return attempt.id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def save_session(self, session: StudySession) -> int:
+        """Save a mix session, its per-test attempts, and their responses.
+
+        Everything is written in one transaction; responses for all
+        attempts go in with a single bulk insert.
+
+        Returns:
+            The id of the saved session. Session, attempt and response ids
+            are also set on the passed objects.
+        """
+        conn = self._conn()
+        try:
+            session.id = conn.execute(
+                "INSERT INTO sessions (mode, score, total_questions, percentage, "
+                "time_taken, seed, shuffle_version, source_test_ids) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session.mode,
+                    session.score,
+                    session.total_questions,
+                    session.percentage,
+                    session.time_taken,
+                    session.seed,
+                    session.shuffle_version,
+                    json.dumps(session.source_test_ids),
+                ),
+            ).lastrowid
+            for attempt in session.attempts:
+                attempt.session_id = session.id
+            self._insert_attempts(conn, session.attempts)
+            conn.commit()
+            return session.id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _insert_attempts(
+        conn: sqlite3.Connection, attempts: Sequence[TestAttempt]
+    ) -> None:
+        """Insert attempts, then all of their responses in one executemany."""
+        response_rows = []
+        for attempt in attempts:
+            attempt.id = conn.execute(
+                "INSERT INTO test_attempts (test_id, score, total_questions, "
+                "percentage, time_taken, mode, session_id, timeline, seed, "
+                "shuffle_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    attempt.test_id,
+                    attempt.score,
+                    attempt.total_questions,
+                    attempt.percentage,
+                    attempt.time_taken,
+                    attempt.mode,
+                    attempt.session_id,
+                    attempt.timeline,
+                    attempt.seed,
+                    attempt.shuffle_version,
+                ),
+            ).lastrowid
+            for response in attempt.responses:
+                response.attempt_id = attempt.id
+                response_rows.append(
+                    (
+                        attempt.id,
+                        response.question_id,
+                        response.user_answer,
+                        None if response.is_correct is None
+                        else int(bool(response.is_correct)),
+                        1 if response.was_flagged else 0,
+                        response.time_spent,
+                    )
+                )
+
+        conn.executemany(
+            "INSERT INTO question_responses (attempt_id, question_id, "
+            "user_answer, is_correct, was_flagged, time_spent) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            response_rows,
+        )
+
+    def get_all_sessions(self) -> Dict[int, StudySession]:
+        """Get every mix session (without attempts), keyed by id."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT id, mode, score, total_questions, percentage, "
+                "time_taken, completed_at, seed, shuffle_version, source_test_ids "
+                "FROM sessions"
+            ).fetchall()
+            return {row["id"]: self._row_to_session(row) for row in rows}
+        finally:
+            conn.close()
+
+    def get_session_details(self, session_id: int) -> Optional[StudySession]:
+        """Get a mix session with its attempts and their responses."""
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT id, mode, score, total_questions, percentage, "
+                "time_taken, completed_at, seed, shuffle_version, source_test_ids "
+                "FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if not row:
+                return None
+            session = self._row_to_session(row)
+            attempt_ids = [
+                a_row["id"]
+                for a_row in conn.execute(
+                    "SELECT id FROM test_attempts WHERE session_id = ? ORDER BY id",
+                    (session_id,),
+                )
+            ]
+        finally:
+            conn.close()
+
+        session.attempts = [self.get_attempt_details(aid) for aid in attempt_ids]
+        return session
+
     def get_attempts_for_test(self, test_id: int) -> List[TestAttempt]:
         """Get all attempts for a specific test."""
         conn = self._conn()
@@ -356,7 +939,7 @@ class DatabaseManager:
             rows = conn.execute(
                 "SELECT a.id, a.test_id, a.score, a.total_questions, "
                 "a.percentage, a.time_taken, a.mode, a.completed_at, "
-                "t.name as test_name "
+                "a.session_id, t.name as test_name "
                 "FROM test_attempts a JOIN tests t ON a.test_id = t.id "
                 "ORDER BY a.completed_at DESC"
             ).fetchall()
@@ -371,7 +954,7 @@ class DatabaseManager:
             row = conn.execute(
                 "SELECT a.id, a.test_id, a.score, a.total_questions, "
                 "a.percentage, a.time_taken, a.mode, a.completed_at, "
-                "t.name as test_name "
+                "a.session_id, a.seed, a.shuffle_version, t.name as test_name "
                 "FROM test_attempts a JOIN tests t ON a.test_id = t.id "
                 "WHERE a.id = ?",
                 (attempt_id,),
@@ -452,6 +1035,215 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    # ── Rescoring ─────────────────────────────────────────────
+
+    def rescore_questions(
+        self, question_ids: Sequence[int], retyped_ids: Sequence[int] = ()
+    ) -> Dict[str, int]:
+        """Re-mark past responses to questions against their current answers.
+
+        Responses are re-marked with one UPDATE ... FROM (the same rule as
+        ScoringService.score_question: trimmed exact match), then every
+        attempt that had a response change gets its score and percentage
+        recomputed from its responses. Responses to essay questions keep
+        their marks, since those come from the essay grader or a manual
+        override rather than the answer key, unless the question has just
+        become an essay: then its key-based marks are cleared. Runs in one
+        transaction.
+
+        Args:
+            question_ids: Questions whose answer key or type changed.
+            retyped_ids: Those of ``question_ids`` whose type changed.
+
+        Returns:
+            Dict with responses_changed and attempts_changed.
+        """
+        if not question_ids:
+            return {"responses_changed": 0, "attempts_changed": 0}
+
+        placeholders = ", ".join("?" * len(question_ids))
+        retyped = sorted(set(retyped_ids) & set(question_ids))
+        retyped_placeholders = ", ".join("?" * len(retyped))
+        whitespace = "' ' || char(9) || char(10) || char(13)"
+        new_is_correct = (
+            "CASE WHEN q.question_type = 'essay' THEN NULL "
+            "WHEN TRIM(COALESCE(qr.user_answer, ''), {ws}) = '' THEN 0 "
+            "ELSE TRIM(qr.user_answer, {ws}) = TRIM(COALESCE(q.correct_answer, ''), {ws}) "
+            "END"
+        ).format(ws=whitespace)
+
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS rescore_changes ("
+                "response_id INTEGER PRIMARY KEY, attempt_id INTEGER, "
+                "is_correct INTEGER)"
+            )
+            conn.execute("DELETE FROM rescore_changes")
+            conn.execute(
+                "INSERT INTO rescore_changes (response_id, attempt_id, is_correct) "
+                f"SELECT qr.id, qr.attempt_id, {new_is_correct} "
+                "FROM question_responses qr "
+                "JOIN questions q ON q.id = qr.question_id "
+                f"WHERE qr.question_id IN ({placeholders}) "
+                "AND (q.question_type != 'essay' "
+                f"OR qr.question_id IN ({retyped_placeholders})) "
+                f"AND qr.is_correct IS NOT ({new_is_correct})",
+                [*question_ids, *retyped],
+            )
+            responses_changed = conn.execute(
+                "UPDATE question_responses SET is_correct = c.is_correct "
+                "FROM rescore_changes c WHERE question_responses.id = c.response_id"
+            ).rowcount
+
+            attempts_changed = conn.execute(
+                "UPDATE test_attempts SET score = s.correct, "
+                "percentage = CASE WHEN s.scored > 0 "
+                "THEN ROUND(s.correct * 100.0 / s.scored, 1) ELSE 0.0 END "
+                "FROM ("
+                "SELECT attempt_id, COALESCE(SUM(is_correct = 1), 0) AS correct, "
+                "COUNT(is_correct) AS scored FROM question_responses "
+                "WHERE attempt_id IN (SELECT attempt_id FROM rescore_changes) "
+                "GROUP BY attempt_id"
+                ") AS s "
+                "WHERE test_attempts.id = s.attempt_id AND ("
+                "test_attempts.score IS NOT s.correct OR "
+                "test_attempts.percentage IS NOT CASE WHEN s.scored > 0 "
+                "THEN ROUND(s.correct * 100.0 / s.scored, 1) ELSE 0.0 END)"
+            ).rowcount
+            self._recompute_sessions(conn, "SELECT attempt_id FROM rescore_changes")
+
+            conn.execute("DELETE FROM rescore_changes")
+            conn.commit()
+            return {
+                "responses_changed": responses_changed,
+                "attempts_changed": attempts_changed,
+            }
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _recompute_sessions(conn, attempt_ids_sql: str, params=()) -> None:
+        """Recompute the totals of the sessions linked to some attempts.
+
+        A session's score and question count are the sums over its linked
+        attempts; its percentage is taken over the scored responses of all
+        of them, as when the session was saved.
+
+        Args:
+            conn: Open connection; the caller commits.
+            attempt_ids_sql: SELECT returning the ids of the changed attempts.
+            params: Parameters for ``attempt_ids_sql``.
+        """
+        conn.execute(
+            "UPDATE sessions SET score = s.correct, total_questions = s.total, "
+            "percentage = CASE WHEN s.scored > 0 "
+            "THEN ROUND(s.correct * 100.0 / s.scored, 1) ELSE 0.0 END "
+            "FROM ("
+            "SELECT a.session_id, SUM(a.score) AS correct, "
+            "SUM(a.total_questions) AS total, "
+            "SUM((SELECT COUNT(is_correct) FROM question_responses "
+            "WHERE attempt_id = a.id)) AS scored "
+            "FROM test_attempts a "
+            "WHERE a.session_id IN (SELECT session_id FROM test_attempts "
+            f"WHERE id IN ({attempt_ids_sql})) "
+            "GROUP BY a.session_id"
+            ") AS s WHERE sessions.id = s.session_id",
+            params,
+        )
+
+    def set_response_correct(
+        self, attempt_id: int, question_id: int, is_correct: Optional[bool]
+    ) -> None:
+        """Manually mark one response and recompute its attempt's score.
+
+        Args:
+            attempt_id: The attempt the response belongs to.
+            question_id: The question that was answered.
+            is_correct: The new mark, or None to leave it ungraded.
+
+        Raises:
+            ValueError: If the attempt has no response to that question.
+        """
+        conn = self._conn()
+        try:
+            updated = conn.execute(
+                "UPDATE question_responses SET is_correct = ? "
+                "WHERE attempt_id = ? AND question_id = ?",
+                (
+                    None if is_correct is None else int(bool(is_correct)),
+                    attempt_id,
+                    question_id,
+                ),
+            ).rowcount
+            if not updated:
+                raise ValueError(
+                    f"Attempt {attempt_id} has no response to question {question_id}."
+                )
+            conn.execute(
+                "UPDATE test_attempts SET score = s.correct, "
+                "percentage = CASE WHEN s.scored > 0 "
+                "THEN ROUND(s.correct * 100.0 / s.scored, 1) ELSE 0.0 END "
+                "FROM ("
+                "SELECT COALESCE(SUM(is_correct = 1), 0) AS correct, "
+                "COUNT(is_correct) AS scored "
+                "FROM question_responses WHERE attempt_id = ?"
+                ") AS s WHERE test_attempts.id = ?",
+                (attempt_id, attempt_id),
+            )
+            self._recompute_sessions(conn, "?", (attempt_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # ── Essay Grading ─────────────────────────────────────────
+
+    def get_essay_model_key(self, test_id: int) -> Optional[str]:
+        """Get a cache key that changes whenever a test's essay answers may have.
+
+        Combines the test's updated_at with the count and latest change
+        sequence of its essay questions.
+
+        Returns:
+            The key, or None if the test does not exist.
+        """
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT t.updated_at, COUNT(q.id) AS essays, "
+                "MAX(q.change_seq) AS latest "
+                "FROM tests t LEFT JOIN questions q "
+                "ON q.test_id = t.id AND q.question_type = 'essay' "
+                "WHERE t.id = ? GROUP BY t.id",
+                (test_id,),
+            ).fetchone()
+            if not row:
+                return None
+            return f"{row['updated_at']}|{row['essays']}|{row['latest']}"
+        finally:
+            conn.close()
+
+    def get_essay_references(self, test_id: int) -> List[Tuple[int, str]]:
+        """Get (question_id, expected answer) for a test's gradable essays."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT id, correct_answer FROM questions "
+                "WHERE test_id = ? AND question_type = 'essay' "
+                "AND TRIM(COALESCE(correct_answer, '')) != '' ORDER BY id",
+                (test_id,),
+            ).fetchall()
+            return [(row["id"], row["correct_answer"]) for row in rows]
+        finally:
+            conn.close()
+
     # ── Missed Questions ──────────────────────────────────────
 
     def get_missed_questions(
@@ -561,7 +1353,37 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def get_question_by_id(self, question_id: int) -> Optional[Question]:
+    def get_question_stats(self, test_ids: Sequence[int]) -> List[Dict]:
+        """Get answer history stats for every question in some tests.
+
+        Questions never answered are included with zero counts.
+
+        Returns:
+            Dicts with question_id, answered (scored responses), missed,
+            and days_since_seen (None if never seen), ordered by id.
+        """
+        if not test_ids:
+            return []
+        placeholders = ", ".join("?" * len(test_ids))
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT q.id AS question_id, "
+                "COUNT(qr.is_correct) AS answered, "
+                "COALESCE(SUM(qr.is_correct = 0), 0) AS missed, "
+                "julianday('now') - julianday(MAX(a.completed_at)) AS days_since_seen "
+                "FROM questions q "
+                "LEFT JOIN question_responses qr ON qr.question_id = q.id "
+                "LEFT JOIN test_attempts a ON a.id = qr.attempt_id "
+                f"WHERE q.test_id IN ({placeholders}) "
+                "GROUP BY q.id ORDER BY q.id",
+                list(test_ids),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_question_by_id(self, question_id: int) -> Optional[Question]:
         """Get a single question with its options."""
         conn = self._conn()
         try:
@@ -603,6 +1425,160 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    # ── Spaced repetition ─────────────────────────────────────
+
+    def get_review_cards(self, question_ids: Sequence[int]) -> Dict[int, ReviewCard]:
+        """Get the stored review cards of some questions.
+
+        Returns:
+            Dict of question_id → ReviewCard; questions never reviewed are
+            left out.
+        """
+        cards: Dict[int, ReviewCard] = {}
+        ids = list(question_ids)
+        conn = self._conn()
+        try:
+            for start in range(0, len(ids), SQL_PARAM_CHUNK):
+                chunk = ids[start:start + SQL_PARAM_CHUNK]
+                rows = conn.execute(
+                    "SELECT question_id, ease, interval_days, repetitions, lapses, "
+                    "due_at, last_reviewed FROM review_schedule "
+                    f"WHERE question_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    cards[row["question_id"]] = ReviewCard(**dict(row))
+            return cards
+        finally:
+            conn.close()
+
+    def save_review_cards(self, cards: Sequence[ReviewCard]) -> None:
+        """Insert or update review cards in one transaction."""
+        conn = self._conn()
+        try:
+            conn.executemany(
+                "INSERT INTO review_schedule (question_id, ease, interval_days, "
+                "repetitions, lapses, due_at, last_reviewed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (question_id) DO UPDATE SET "
+                "ease = excluded.ease, interval_days = excluded.interval_days, "
+                "repetitions = excluded.repetitions, lapses = excluded.lapses, "
+                "due_at = excluded.due_at, last_reviewed = excluded.last_reviewed",
+                [
+                    (
+                        card.question_id,
+                        card.ease,
+                        card.interval_days,
+                        card.repetitions,
+                        card.lapses,
+                        card.due_at,
+                        card.last_reviewed,
+                    )
+                    for card in cards
+                ],
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def get_due_question_ids(self, now: float, limit: int) -> List[int]:
+        """Get the ids of the questions due soonest, most overdue first.
+
+        Reads ``limit`` entries from the due index without touching the
+        rest of the schedule.
+        """
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT question_id FROM review_schedule "
+                "WHERE due_at <= ? ORDER BY due_at, question_id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            return [row["question_id"] for row in rows]
+        finally:
+            conn.close()
+
+    def count_due_reviews(self, now: float) -> int:
+        """Count the questions due for review."""
+        conn = self._conn()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM review_schedule WHERE due_at <= ?", (now,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    # ── Difficulty ratings ────────────────────────────────────
+
+    def get_question_ratings(
+        self, question_ids: Sequence[int]
+    ) -> Dict[int, Tuple[float, int]]:
+        """Get stored difficulty ratings.
+
+        Returns:
+            Dict of question_id → (difficulty, answers) for rated questions.
+        """
+        ratings: Dict[int, Tuple[float, int]] = {}
+        ids = list(question_ids)
+        conn = self._conn()
+        try:
+            for start in range(0, len(ids), SQL_PARAM_CHUNK):
+                chunk = ids[start:start + SQL_PARAM_CHUNK]
+                rows = conn.execute(
+                    "SELECT question_id, difficulty, answers FROM question_ratings "
+                    f"WHERE question_id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    ratings[row["question_id"]] = (row["difficulty"], row["answers"])
+            return ratings
+        finally:
+            conn.close()
+
+    def get_category_ratings(self) -> Dict[str, Tuple[float, int]]:
+        """Get every stored category ability as category → (ability, answers)."""
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT category, ability, answers FROM category_ratings"
+            ).fetchall()
+            return {row["category"]: (row["ability"], row["answers"]) for row in rows}
+        finally:
+            conn.close()
+
+    def save_ratings(
+        self,
+        questions: Sequence[Tuple[int, float, int]],
+        categories: Sequence[Tuple[str, float, int]],
+    ) -> None:
+        """Write question and category ratings in one transaction.
+
+        Args:
+            questions: (question_id, difficulty, answers) rows.
+            categories: (category, ability, answers) rows.
+        """
+        conn = self._conn()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO question_ratings "
+                "(question_id, difficulty, answers) VALUES (?, ?, ?)",
+                questions,
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO category_ratings "
+                "(category, ability, answers) VALUES (?, ?, ?)",
+                categories,
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
     # ── Analytics ─────────────────────────────────────────────
 
     def get_scores_over_time(
@@ -667,14 +1643,14 @@ class DatabaseManager:
             conn.close()
 
     def get_attempt_frequency(self, days: int = 30) -> List[Dict]:
-        """Get daily attempt counts for activity charts."""
+        """Get daily attempt counts for activity charts, by local day."""
         conn = self._conn()
         try:
             rows = conn.execute(
-                "SELECT DATE(completed_at) as day, COUNT(*) as count "
+                "SELECT DATE(completed_at, 'localtime') as day, COUNT(*) as count "
                 "FROM test_attempts "
-                "WHERE completed_at >= DATE('now', ?)"
-                "GROUP BY DATE(completed_at) ORDER BY day ASC",
+                "WHERE DATE(completed_at, 'localtime') >= DATE('now', 'localtime', ?) "
+                "GROUP BY day ORDER BY day ASC",
                 (f"-{days} days",),
             ).fetchall()
             return [
@@ -722,6 +1698,801 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def get_attempt_timelines(
+        self, test_id: Optional[int] = None, mode: Optional[str] = None
+    ) -> List[bytes]:
+        """Get the packed event timelines of saved attempts.
+
+        Args:
+            test_id: Optional filter by test.
+            mode: Optional filter by mode.
+
+        Returns:
+            One blob per attempt that recorded a timeline.
+        """
+        conn = self._conn()
+        try:
+            query = "SELECT timeline FROM test_attempts WHERE timeline IS NOT NULL "
+            params: list = []
+            if test_id is not None:
+                query += "AND test_id = ? "
+                params.append(test_id)
+            if mode is not None:
+                query += "AND mode = ? "
+                params.append(mode)
+            return [row["timeline"] for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def iter_response_history(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        test_ids: Optional[Sequence[int]] = None,
+        chunk_size: int = 100_000,
+    ) -> Iterator[List[sqlite3.Row]]:
+        """Stream question responses joined with attempt, question and test.
+
+        Rows are fetched ``chunk_size`` at a time from a single cursor, so
+        memory stays flat regardless of history size.
+
+        Args:
+            start_date: Optional inclusive local start date (YYYY-MM-DD).
+            end_date: Optional inclusive local end date (YYYY-MM-DD).
+            test_ids: Optional filter by test.
+            chunk_size: Rows per yielded chunk.
+
+        Yields:
+            Lists of rows ordered by response id.
+        """
+        query = (
+            "SELECT qr.id AS response_id, qr.attempt_id, a.completed_at, "
+            "CAST(strftime('%s', a.completed_at) AS INTEGER) AS completed_ts, "
+            "COALESCE(a.mode, 'test') AS mode, a.test_id, t.name AS test_name, "
+            "qr.question_id, q.question_type, COALESCE(q.category, '') AS category, "
+            "qr.is_correct, qr.was_flagged, qr.time_spent "
+            "FROM question_responses qr "
+            "JOIN test_attempts a ON a.id = qr.attempt_id "
+            "JOIN questions q ON q.id = qr.question_id "
+            "JOIN tests t ON t.id = a.test_id "
+            "WHERE 1 = 1 "
+        )
+        params: list = []
+        # completed_at is UTC; the bounds are local days, like the dashboards
+        if start_date:
+            query += "AND a.completed_at >= DATETIME(?, 'utc') "
+            params.append(start_date)
+        if end_date:
+            query += "AND a.completed_at < DATETIME(?, '+1 day', 'utc') "
+            params.append(end_date)
+        if test_ids:
+            query += f"AND a.test_id IN ({', '.join('?' * len(test_ids))}) "
+            params.extend(test_ids)
+        query += "ORDER BY qr.id"
+
+        conn = self._conn()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def get_hour_of_week_buckets(
+        self, test_id: Optional[int] = None, mode: Optional[str] = None
+    ) -> List[Tuple[int, int, int, int, int]]:
+        """Get attempt totals per local weekday and hour.
+
+        Reads the trigger-maintained study_hour_buckets table, which holds
+        at most 168 rows per test and mode.
+
+        Args:
+            test_id: Optional filter by test.
+            mode: Optional filter by mode.
+
+        Returns:
+            (weekday, hour, attempts, questions, correct) tuples for every
+            slot with attempts; weekday 0 is Sunday.
+        """
+        conn = self._conn()
+        try:
+            query = (
+                "SELECT weekday, hour, SUM(attempts), SUM(questions), SUM(correct) "
+                "FROM study_hour_buckets WHERE attempts > 0 "
+            )
+            params: list = []
+            if test_id is not None:
+                query += "AND test_id = ? "
+                params.append(test_id)
+            if mode is not None:
+                query += "AND mode = ? "
+                params.append(mode)
+            query += "GROUP BY weekday, hour"
+            return [tuple(row) for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def get_analytics_snapshot(
+        self,
+        after_question_id: int = 0,
+        after_attempt_id: int = 0,
+        after_response_id: int = 0,
+    ) -> Dict:
+        """Read history rows for the in-memory analytics engine.
+
+        Only rows with ids above the given ones are returned, so a loaded
+        engine can append what is new. Everything is read in one
+        transaction, together with the change counter it corresponds to.
+        Rows are plain tuples.
+
+        Returns:
+            Dict with change_seq; tests as (id, name); questions as
+            (id, test_id, category); attempts as (id, test_id, mode,
+            percentage, completed_at, completed_ts); responses as
+            (id, attempt_id, question_id, is_correct or -1, time_spent or
+            -1). Every list is ordered by id.
+        """
+        conn = self._conn()
+        conn.row_factory = None
+        try:
+            conn.execute("BEGIN")
+            snapshot: Dict = {
+                "change_seq": conn.execute(
+                    "SELECT value FROM sync_state WHERE key = 'change_seq'"
+                ).fetchone()[0],
+                "tests": conn.execute(
+                    "SELECT id, name FROM tests ORDER BY id"
+                ).fetchall(),
+                "questions": conn.execute(
+                    "SELECT id, test_id, COALESCE(category, '') FROM questions "
+                    "WHERE id > ? ORDER BY id",
+                    (after_question_id,),
+                ).fetchall(),
+                "attempts": conn.execute(
+                    "SELECT id, test_id, COALESCE(mode, 'test'), percentage, "
+                    "completed_at, "
+                    "COALESCE(CAST(strftime('%s', completed_at) AS INTEGER), 0) "
+                    "FROM test_attempts WHERE id > ? ORDER BY id",
+                    (after_attempt_id,),
+                ).fetchall(),
+                "responses": conn.execute(
+                    "SELECT id, attempt_id, question_id, COALESCE(is_correct, -1), "
+                    "COALESCE(time_spent, -1) "
+                    "FROM question_responses WHERE id > ? ORDER BY id",
+                    (after_response_id,),
+                ).fetchall(),
+            }
+            conn.commit()
+            return snapshot
+        finally:
+            conn.close()
+
+    def has_history_rewrites(
+        self,
+        since_seq: int,
+        max_question_id: int,
+        max_attempt_id: int,
+        max_response_id: int,
+    ) -> bool:
+        """Whether history changed after ``since_seq`` other than by appends.
+
+        True if a question, attempt or response that was already loaded
+        was updated, or if any of them (or a test) was deleted. Uses the
+        change_seq indexes, so it reads only the changed rows.
+        """
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT "
+                "EXISTS (SELECT 1 FROM sync_tombstones WHERE change_seq > ? "
+                "AND table_name IN "
+                "('tests', 'questions', 'test_attempts', 'question_responses')) "
+                "OR EXISTS (SELECT 1 FROM questions WHERE change_seq > ? AND id <= ?) "
+                "OR EXISTS (SELECT 1 FROM test_attempts "
+                "WHERE change_seq > ? AND id <= ?) "
+                "OR EXISTS (SELECT 1 FROM question_responses "
+                "WHERE change_seq > ? AND id <= ?)",
+                (
+                    since_seq,
+                    since_seq, max_question_id,
+                    since_seq, max_attempt_id,
+                    since_seq, max_response_id,
+                ),
+            ).fetchone()
+            return bool(row[0])
+        finally:
+            conn.close()
+
+    # ── Sync ──────────────────────────────────────────────────
+
+    def get_change_cursor(self) -> int:
+        """Return the current value of the global change counter."""
+        conn = self._conn()
+        try:
+            return self._current_change_seq(conn)
+        finally:
+            conn.close()
+
+    def get_change_token(self) -> Tuple[int, int]:
+        """Return a token that changes whenever the database is written.
+
+        Pairs ``PRAGMA data_version`` with this process's write count.
+        data_version is read on one connection held open for the purpose;
+        it moves whenever any other connection commits, including other
+        processes, and the pragma reads no tables.
+        """
+        if self._probe is None:
+            self._probe = get_connection(self._db_path, check_same_thread=False)
+        data_version = self._probe.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, write_count()
+
+    def close(self) -> None:
+        """Close the connection kept open for change tokens, if any.
+
+        The manager stays usable; the next get_change_token reopens it.
+        """
+        if self._probe is not None:
+            self._probe.close()
+            self._probe = None
+
+    def get_changes_since(self, cursor: int) -> Dict:
+        """Collect every row changed and every row deleted after ``cursor``.
+
+        Reads run in one transaction so the returned cursor matches the
+        snapshot the rows were taken from.
+
+        Returns:
+            Dict with since, cursor, one list of row dicts per synced table
+            (keyed by table name), and a ``deleted`` list of table/uuid pairs.
+        """
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN")
+            latest = self._current_change_seq(conn)
+            changes: Dict = {"since": cursor, "cursor": latest}
+
+            for table, parents, columns in SYNC_TABLES:
+                select = [f"c.{col}" for col in ["uuid", "updated_at", *columns]]
+                joins = []
+                for i, (fk, parent) in enumerate(parents):
+                    join = "LEFT JOIN" if fk in SYNC_OPTIONAL_LINKS else "JOIN"
+                    select.append(f"p{i}.uuid AS {_parent_uuid_key(fk)}")
+                    joins.append(f"{join} {parent} p{i} ON p{i}.id = c.{fk}")
+                rows = conn.execute(
+                    f"SELECT {', '.join(select)} FROM {table} c "
+                    f"{' '.join(joins)} "
+                    "WHERE c.change_seq > ? AND c.change_seq <= ? "
+                    "ORDER BY c.change_seq",
+                    (cursor, latest),
+                ).fetchall()
+                changes[table] = [
+                    self._encode_change_row(conn, dict(row)) for row in rows
+                ]
+
+            rows = conn.execute(
+                "SELECT table_name, uuid FROM sync_tombstones "
+                "WHERE change_seq > ? AND change_seq <= ? ORDER BY change_seq",
+                (cursor, latest),
+            ).fetchall()
+            changes["deleted"] = [
+                {"table": row["table_name"], "uuid": row["uuid"]} for row in rows
+            ]
+            return changes
+        finally:
+            conn.close()
+
+    def apply_changes(self, changes: Dict) -> Dict[str, int]:
+        """Apply a change set produced by get_changes_since on another machine.
+
+        Runs in a single transaction. Conflicts are resolved the same way on
+        every machine: the row with the later updated_at wins, ties go to
+        the larger content hash, and a delete always beats an edit.
+
+        Returns:
+            Dict with inserted, updated, deleted, and skipped row counts.
+        """
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "skipped": 0}
+        known_tables = {table for table, _, _ in SYNC_TABLES}
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for table, parents, columns in SYNC_TABLES:
+                for row in changes.get(table, []):
+                    outcome = self._apply_change_row(
+                        conn, table, parents, columns, row
+                    )
+                    counts[outcome] += 1
+
+            for entry in changes.get("deleted", []):
+                table = entry.get("table")
+                uuid = entry.get("uuid")
+                if table not in known_tables or not uuid:
+                    counts["skipped"] += 1
+                    continue
+                cursor = conn.execute(
+                    f"DELETE FROM {table} WHERE uuid = ?", (uuid,)
+                )
+                if cursor.rowcount:
+                    counts["deleted"] += 1
+                else:
+                    # Remember the delete so a late copy of the row is ignored
+                    conn.execute(
+                        "INSERT OR IGNORE INTO sync_tombstones "
+                        "(uuid, table_name, change_seq) VALUES (?, ?, ?)",
+                        (uuid, table, self._next_change_seq(conn)),
+                    )
+                    counts["skipped"] += 1
+
+            conn.commit()
+            return counts
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _apply_change_row(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        parents: List[Tuple[str, str]],
+        columns: List[str],
+        row: Dict,
+    ) -> str:
+        """Insert or update one incoming row. Returns the outcome key."""
+        uuid = row.get("uuid")
+        if not uuid:
+            return "skipped"
+        if conn.execute(
+            "SELECT 1 FROM sync_tombstones WHERE uuid = ?", (uuid,)
+        ).fetchone():
+            return "skipped"
+
+        decoded = self._decode_change_row(conn, row)
+        values = {col: decoded.get(col) for col in columns}
+        for fk, parent in parents:
+            parent_uuid = row.get(_parent_uuid_key(fk))
+            parent_row = conn.execute(
+                f"SELECT id FROM {parent} WHERE uuid = ?", (parent_uuid,)
+            ).fetchone()
+            if parent_row is None and fk not in SYNC_OPTIONAL_LINKS:
+                return "skipped"
+            values[fk] = parent_row["id"] if parent_row is not None else None
+
+        local = conn.execute(
+            f"SELECT id, updated_at, {', '.join(columns)} "
+            f"FROM {table} WHERE uuid = ?",
+            (uuid,),
+        ).fetchone()
+
+        if local is None:
+            names = [*values, "uuid", "updated_at"]
+            conn.execute(
+                f"INSERT INTO {table} ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' * len(names))})",
+                (*values.values(), uuid, row.get("updated_at")),
+            )
+            return "inserted"
+
+        # Both sides are hashed in their change-file form, so machines with
+        # different local ids still agree on the winner
+        local_row = self._encode_change_row(conn, dict(local))
+        incoming = (row.get("updated_at") or "", _content_hash(row, columns))
+        current = (local["updated_at"] or "", _content_hash(local_row, columns))
+        if incoming[1] == current[1] or incoming <= current:
+            return "skipped"
+
+        # Writing change_seq directly bypasses the update trigger, so the
+        # winning row keeps its original updated_at on both machines.
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        conn.execute(
+            f"UPDATE {table} SET {assignments}, updated_at = ?, change_seq = ? "
+            "WHERE id = ?",
+            (
+                *values.values(),
+                row.get("updated_at"),
+                self._next_change_seq(conn),
+                local["id"],
+            ),
+        )
+        return "updated"
+
+    @staticmethod
+    def _encode_change_row(conn: sqlite3.Connection, row: Dict) -> Dict:
+        """Put a row's payload in change-file form.
+
+        BLOBs become base64 text and a session's source test ids become
+        test uuids, since local ids mean nothing on another machine.
+        """
+        for column in SYNC_BLOB_COLUMNS.intersection(row):
+            if row[column] is not None:
+                row[column] = base64.b64encode(row[column]).decode("ascii")
+        if row.get("source_test_ids") is not None:
+            row["source_test_ids"] = DatabaseManager._remap_test_refs(
+                conn, row["source_test_ids"], "id", "uuid"
+            )
+        return row
+
+    @staticmethod
+    def _decode_change_row(conn: sqlite3.Connection, row: Dict) -> Dict:
+        """Inverse of _encode_change_row; returns a new dict."""
+        row = dict(row)
+        for column in SYNC_BLOB_COLUMNS.intersection(row):
+            if row[column] is not None:
+                row[column] = base64.b64decode(row[column])
+        if row.get("source_test_ids") is not None:
+            row["source_test_ids"] = DatabaseManager._remap_test_refs(
+                conn, row["source_test_ids"], "uuid", "id"
+            )
+        return row
+
+    @staticmethod
+    def _remap_test_refs(
+        conn: sqlite3.Connection, refs_json: str, from_column: str, to_column: str
+    ) -> str:
+        """Translate a JSON list of test ids to uuids or back, in order.
+
+        Tests missing on this machine are dropped.
+        """
+        refs = json.loads(refs_json)
+        mapped = []
+        for ref in refs:
+            found = conn.execute(
+                f"SELECT {to_column} FROM tests WHERE {from_column} = ?", (ref,)
+            ).fetchone()
+            if found is not None:
+                mapped.append(found[0])
+        return json.dumps(mapped)
+
+    # ── Merge ─────────────────────────────────────────────────
+
+    def merge_database(self, source_path: str) -> Dict[str, int]:
+        """Copy another study database into this one with set-based SQL.
+
+        The source is attached and only read. Tests are matched by uuid,
+        then by name and group; questions by uuid, then by content hash
+        within their matched test. Everything else is copied with
+        ``INSERT ... SELECT``, remapping foreign ids through temporary
+        mapping tables. The whole merge is one transaction.
+
+        Returns:
+            Dict with tests_added, tests_matched, questions_added,
+            questions_matched, options_added, attempts_added,
+            attempts_skipped, sessions_added, and responses_added.
+
+        Raises:
+            ValueError: If the source is this database or not a study database.
+        """
+        own_path = self._db_path if self._db_path is not None else str(DB_PATH)
+        if Path(source_path).resolve() == Path(own_path).resolve():
+            raise ValueError("Cannot merge a database into itself.")
+
+        conn = self._conn()
+        try:
+            conn.create_function("question_key", 2, _question_key, deterministic=True)
+            # Random uuids make index inserts scattered; a larger page cache
+            # keeps the uuid indexes resident for the bulk copy.
+            conn.execute("PRAGMA cache_size = -131072")
+            conn.execute("ATTACH DATABASE ? AS src", (source_path,))
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                counts = self._merge_attached(conn)
+                conn.commit()
+                return counts
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.execute("DETACH DATABASE src")
+        finally:
+            conn.close()
+
+    def _merge_attached(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Run the merge statements against the attached ``src`` schema."""
+        # Sources older than mix sessions have no sessions table
+        src_columns = {
+            table: self._attached_columns(conn, table, required=table != "sessions")
+            for table, _, _ in SYNC_TABLES
+        }
+        # Merged rows are pre-stamped with one change_seq, which keeps the
+        # per-row tracking triggers out of the bulk inserts.
+        change_seq = self._next_change_seq(conn)
+
+        def src(table: str, column: str, default: str = "NULL") -> str:
+            return f"s.{column}" if column in src_columns[table] else default
+
+        def uuid_expr(table: str) -> str:
+            fresh = "lower(hex(randomblob(16)))"
+            if "uuid" not in src_columns[table]:
+                return fresh
+            return (
+                f"CASE WHEN s.uuid IS NULL OR EXISTS (SELECT 1 FROM main.{table} d "
+                f"WHERE d.uuid = s.uuid) THEN {fresh} ELSE s.uuid END"
+            )
+
+        def updated_expr(table: str) -> str:
+            return f"COALESCE({src(table, 'updated_at')}, CURRENT_TIMESTAMP)"
+
+        for name in ("map_tests", "map_questions", "map_sessions", "map_attempts"):
+            conn.execute(
+                f"CREATE TEMP TABLE {name} (src_id INTEGER PRIMARY KEY, "
+                "dst_id INTEGER NOT NULL, is_new INTEGER NOT NULL)"
+            )
+
+        # Tests: uuid, then name + group, otherwise new
+        if "uuid" in src_columns["tests"]:
+            conn.execute(
+                "INSERT OR IGNORE INTO temp.map_tests "
+                "SELECT s.id, d.id, 0 FROM src.tests s "
+                "JOIN main.tests d ON d.uuid = s.uuid"
+            )
+        conn.execute(
+            "INSERT OR IGNORE INTO temp.map_tests "
+            "SELECT s.id, MIN(d.id), 0 FROM src.tests s "
+            "JOIN main.tests d ON d.name = s.name "
+            "AND COALESCE(d.group_name, '') = "
+            f"COALESCE({src('tests', 'group_name')}, '') "
+            "GROUP BY s.id"
+        )
+        self._map_new_rows(conn, "tests", "map_tests", "SELECT id FROM src.tests")
+        conn.execute(
+            "INSERT INTO main.tests (id, name, description, group_name, "
+            "created_at, updated_at, uuid, change_seq) "
+            "SELECT m.dst_id, s.name, COALESCE(s.description, ''), "
+            f"COALESCE({src('tests', 'group_name')}, ''), s.created_at, "
+            f"{updated_expr('tests')}, {uuid_expr('tests')}, ? "
+            "FROM src.tests s JOIN temp.map_tests m ON m.src_id = s.id "
+            "WHERE m.is_new = 1 ORDER BY m.dst_id",
+            (change_seq,),
+        )
+
+        # Questions: uuid, then content hash within the matched test
+        if "uuid" in src_columns["questions"]:
+            conn.execute(
+                "INSERT OR IGNORE INTO temp.map_questions "
+                "SELECT s.id, d.id, 0 FROM src.questions s "
+                "JOIN main.questions d ON d.uuid = s.uuid"
+            )
+        conn.execute(
+            "CREATE TEMP TABLE dst_question_keys AS "
+            "SELECT id, test_id, question_key(question_text, question_type) AS qkey "
+            "FROM main.questions WHERE test_id IN "
+            "(SELECT dst_id FROM temp.map_tests WHERE is_new = 0)"
+        )
+        conn.execute(
+            "CREATE INDEX temp.idx_dst_question_keys "
+            "ON dst_question_keys (test_id, qkey)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO temp.map_questions "
+            "SELECT src_id, dst_id, 0 FROM ("
+            "SELECT s.id AS src_id, (SELECT MIN(k.id) FROM temp.dst_question_keys k "
+            "WHERE k.test_id = m.dst_id "
+            "AND k.qkey = question_key(s.question_text, s.question_type)) AS dst_id "
+            "FROM src.questions s JOIN temp.map_tests m ON m.src_id = s.test_id "
+            "WHERE m.is_new = 0) WHERE dst_id IS NOT NULL"
+        )
+        self._map_new_rows(
+            conn, "questions", "map_questions", "SELECT id FROM src.questions"
+        )
+        conn.execute(
+            "INSERT INTO main.questions (id, test_id, question_text, question_type, "
+            "correct_answer, category, created_at, updated_at, uuid, change_seq) "
+            "SELECT mq.dst_id, mt.dst_id, s.question_text, s.question_type, "
+            "COALESCE(s.correct_answer, ''), COALESCE(s.category, ''), s.created_at, "
+            f"{updated_expr('questions')}, {uuid_expr('questions')}, ? "
+            "FROM src.questions s "
+            "JOIN temp.map_questions mq ON mq.src_id = s.id "
+            "JOIN temp.map_tests mt ON mt.src_id = s.test_id "
+            "WHERE mq.is_new = 1 ORDER BY mq.dst_id",
+            (change_seq,),
+        )
+
+        # Options only travel with newly added questions
+        options_added = conn.execute(
+            "INSERT INTO main.question_options (question_id, option_text, "
+            "is_correct, updated_at, uuid, change_seq) "
+            "SELECT m.dst_id, s.option_text, s.is_correct, "
+            f"{updated_expr('question_options')}, {uuid_expr('question_options')}, ? "
+            "FROM src.question_options s "
+            "JOIN temp.map_questions m ON m.src_id = s.question_id "
+            "WHERE m.is_new = 1 ORDER BY s.id",
+            (change_seq,),
+        ).rowcount
+
+        # Attempts: uuid match means the attempt was already merged or synced
+        if "uuid" in src_columns["test_attempts"]:
+            conn.execute(
+                "INSERT OR IGNORE INTO temp.map_attempts "
+                "SELECT s.id, d.id, 0 FROM src.test_attempts s "
+                "JOIN main.test_attempts d ON d.uuid = s.uuid"
+            )
+        # Attempts without a uuid get a fresh one when copied, so a repeat
+        # merge recognises them by content instead
+        no_uuid = "s.uuid IS NULL" if "uuid" in src_columns["test_attempts"] else "1"
+        conn.execute(
+            "INSERT OR IGNORE INTO temp.map_attempts "
+            "SELECT s.id, MIN(d.id), 0 FROM src.test_attempts s "
+            "JOIN temp.map_tests mt ON mt.src_id = s.test_id "
+            "JOIN main.test_attempts d ON d.test_id = mt.dst_id "
+            "AND d.completed_at IS s.completed_at AND d.score IS s.score "
+            "AND d.total_questions IS s.total_questions "
+            "AND COALESCE(d.mode, 'test') = "
+            f"COALESCE({src('test_attempts', 'mode')}, 'test') "
+            f"WHERE {no_uuid} GROUP BY s.id"
+        )
+        self._map_new_rows(
+            conn,
+            "test_attempts",
+            "map_attempts",
+            "SELECT id FROM src.test_attempts "
+            "WHERE test_id IN (SELECT src_id FROM temp.map_tests)",
+        )
+
+        # Sessions: uuid match, otherwise copied along with a new attempt
+        has_sessions = bool(src_columns["sessions"]) and (
+            "session_id" in src_columns["test_attempts"]
+        )
+        if has_sessions:
+            if "uuid" in src_columns["sessions"]:
+                conn.execute(
+                    "INSERT OR IGNORE INTO temp.map_sessions "
+                    "SELECT s.id, d.id, 0 FROM src.sessions s "
+                    "JOIN main.sessions d ON d.uuid = s.uuid"
+                )
+            self._map_new_rows(
+                conn,
+                "sessions",
+                "map_sessions",
+                "SELECT DISTINCT s.session_id AS id FROM src.test_attempts s "
+                "JOIN temp.map_attempts ma ON ma.src_id = s.id "
+                "WHERE ma.is_new = 1 AND s.session_id IS NOT NULL",
+            )
+            # source_test_ids holds source test ids; remap them in order
+            conn.execute(
+                "INSERT INTO main.sessions (id, mode, score, total_questions, "
+                "percentage, time_taken, completed_at, seed, shuffle_version, "
+                "source_test_ids, updated_at, uuid, change_seq) "
+                "SELECT m.dst_id, COALESCE(s.mode, 'test'), s.score, "
+                "s.total_questions, s.percentage, s.time_taken, s.completed_at, "
+                f"{src('sessions', 'seed')}, {src('sessions', 'shuffle_version')}, "
+                f"CASE WHEN {src('sessions', 'source_test_ids')} IS NULL THEN NULL "
+                "ELSE (SELECT json_group_array(dst_id) FROM ("
+                "SELECT mt.dst_id FROM json_each(s.source_test_ids) j "
+                "JOIN temp.map_tests mt ON mt.src_id = j.value ORDER BY j.key)) END, "
+                f"{updated_expr('sessions')}, {uuid_expr('sessions')}, ? "
+                "FROM src.sessions s JOIN temp.map_sessions m ON m.src_id = s.id "
+                "WHERE m.is_new = 1 ORDER BY m.dst_id",
+                (change_seq,),
+            )
+        session_expr = "ms.dst_id" if has_sessions else "NULL"
+        conn.execute(
+            "INSERT INTO main.test_attempts (id, test_id, score, total_questions, "
+            "percentage, time_taken, mode, completed_at, session_id, timeline, "
+            "seed, shuffle_version, updated_at, uuid, change_seq) "
+            "SELECT ma.dst_id, mt.dst_id, s.score, s.total_questions, s.percentage, "
+            f"s.time_taken, COALESCE({src('test_attempts', 'mode')}, 'test'), "
+            f"s.completed_at, {session_expr}, {src('test_attempts', 'timeline')}, "
+            f"{src('test_attempts', 'seed')}, "
+            f"{src('test_attempts', 'shuffle_version')}, "
+            f"{updated_expr('test_attempts')}, {uuid_expr('test_attempts')}, ? "
+            "FROM src.test_attempts s "
+            "JOIN temp.map_attempts ma ON ma.src_id = s.id "
+            "JOIN temp.map_tests mt ON mt.src_id = s.test_id "
+            + (
+                "LEFT JOIN temp.map_sessions ms ON ms.src_id = s.session_id "
+                if has_sessions
+                else ""
+            )
+            + "WHERE ma.is_new = 1 ORDER BY ma.dst_id",
+            (change_seq,),
+        )
+
+        responses_added = conn.execute(
+            "INSERT INTO main.question_responses (attempt_id, question_id, "
+            "user_answer, is_correct, was_flagged, time_spent, updated_at, uuid, "
+            "change_seq) "
+            "SELECT ma.dst_id, mq.dst_id, s.user_answer, s.is_correct, "
+            "s.was_flagged, s.time_spent, "
+            f"{updated_expr('question_responses')}, "
+            f"{uuid_expr('question_responses')}, ? "
+            "FROM src.question_responses s "
+            "JOIN temp.map_attempts ma ON ma.src_id = s.attempt_id "
+            "JOIN temp.map_questions mq ON mq.src_id = s.question_id "
+            "WHERE ma.is_new = 1 ORDER BY s.id",
+            (change_seq,),
+        ).rowcount
+
+        def count(table: str, is_new: int) -> int:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM temp.{table} WHERE is_new = ?", (is_new,)
+            ).fetchone()[0]
+
+        return {
+            "tests_added": count("map_tests", 1),
+            "tests_matched": count("map_tests", 0),
+            "questions_added": count("map_questions", 1),
+            "questions_matched": count("map_questions", 0),
+            "options_added": options_added,
+            "attempts_added": count("map_attempts", 1),
+            "attempts_skipped": count("map_attempts", 0),
+            "sessions_added": count("map_sessions", 1),
+            "responses_added": responses_added,
+        }
+
+    @staticmethod
+    def _map_new_rows(
+        conn: sqlite3.Connection, table: str, map_table: str, source_ids_sql: str
+    ) -> None:
+        """Assign fresh destination ids to every unmapped source row.
+
+        Ids continue after both MAX(id) and the AUTOINCREMENT sequence, so
+        deleted ids are never reused.
+        """
+        base = conn.execute(
+            f"SELECT MAX(COALESCE((SELECT MAX(id) FROM main.{table}), 0), "
+            "COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = ?), 0))",
+            (table,),
+        ).fetchone()[0]
+        conn.execute(
+            f"INSERT INTO temp.{map_table} (src_id, dst_id, is_new) "
+            "SELECT id, ? + ROW_NUMBER() OVER (ORDER BY id), 1 "
+            f"FROM ({source_ids_sql}) "
+            f"WHERE id NOT IN (SELECT src_id FROM temp.{map_table})",
+            (base,),
+        )
+
+    @staticmethod
+    def _attached_columns(
+        conn: sqlite3.Connection, table: str, required: bool = True
+    ) -> Set[str]:
+        """Column names of a table in the attached source database.
+
+        An optional table that is missing yields an empty set.
+        """
+        columns = {
+            row["name"]
+            for row in conn.execute(f"PRAGMA src.table_info({table})").fetchall()
+        }
+        if not columns and required:
+            raise ValueError(f"Source is not a study database: no '{table}' table.")
+        return columns
+
+    @staticmethod
+    def _current_change_seq(conn: sqlite3.Connection) -> int:
+        """Read the global change counter on an open connection."""
+        row = conn.execute(
+            "SELECT value FROM sync_state WHERE key = 'change_seq'"
+        ).fetchone()
+        return row["value"] if row else 0
+
+    @staticmethod
+    def _next_change_seq(conn: sqlite3.Connection) -> int:
+        """Advance the global change counter and return the new value."""
+        conn.execute(
+            "UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq'"
+        )
+        return DatabaseManager._current_change_seq(conn)
+
+    @staticmethod
+    def _row_to_session(row: sqlite3.Row) -> StudySession:
+        """Convert a database row to a StudySession."""
+        return StudySession(
+            id=row["id"],
+            mode=row["mode"] or "test",
+            score=row["score"],
+            total_questions=row["total_questions"],
+            percentage=row["percentage"],
+            time_taken=row["time_taken"],
+            completed_at=row["completed_at"],
+            seed=row["seed"],
+            shuffle_version=row["shuffle_version"],
+            source_test_ids=json.loads(row["source_test_ids"] or "[]"),
+        )
+
     @staticmethod
     def _row_to_attempt(row: sqlite3.Row) -> TestAttempt:
         """Convert a database row to a TestAttempt."""
@@ -736,4 +2507,7 @@ class DatabaseManager:
             mode=row["mode"] if "mode" in keys else "test",
             completed_at=row["completed_at"],
             test_name=row["test_name"] if "test_name" in keys else None,
+            session_id=row["session_id"] if "session_id" in keys else None,
+            seed=row["seed"] if "seed" in keys else None,
+            shuffle_version=row["shuffle_version"] if "shuffle_version" in keys else None,
         )
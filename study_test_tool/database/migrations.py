@@ -5,6 +5,79 @@ from typing import List, Optional, Tuple
 
 from config.database import get_connection
 
+_TRACKED_TABLES = [
+    "tests",
+    "questions",
+    "question_options",
+    "test_attempts",
+    "question_responses",
+]
+
+
+def _insert_tracking_trigger(table: str) -> str:
+    """CREATE TRIGGER statement stamping new rows (mirrors schema.sql)."""
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS track_{table}_insert "
+        f"AFTER INSERT ON {table} "
+        "FOR EACH ROW WHEN NEW.change_seq = 0 "
+        "BEGIN "
+        "UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq'; "
+        f"UPDATE {table} SET "
+        "uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))), "
+        "updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP), "
+        "change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq') "
+        "WHERE id = NEW.id; "
+        "END"
+    )
+
+
+def _update_tracking_trigger(table: str) -> str:
+    """CREATE TRIGGER statement restamping edited rows (mirrors schema.sql)."""
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS track_{table}_update "
+        f"AFTER UPDATE ON {table} "
+        "FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq "
+        "BEGIN "
+        "UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq'; "
+        f"UPDATE {table} SET "
+        "updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at "
+        "THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END, "
+        "change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq') "
+        "WHERE id = NEW.id; "
+        "END"
+    )
+
+
+def _local_hour_of_week(row: str) -> str:
+    """SQL for the local (weekday, hour) an attempt row was completed in."""
+    return (
+        f"CAST(strftime('%w', {row}.completed_at, 'localtime') AS INTEGER), "
+        f"CAST(strftime('%H', {row}.completed_at, 'localtime') AS INTEGER)"
+    )
+
+
+_BUCKET_ADD = (
+    "ON CONFLICT (test_id, mode, weekday, hour) DO UPDATE SET "
+    "attempts = attempts + 1, "
+    "questions = questions + excluded.questions, "
+    "correct = correct + excluded.correct; "
+)
+_BUCKET_SUBTRACT = (
+    "UPDATE study_hour_buckets SET attempts = attempts - 1, "
+    "questions = questions - OLD.total_questions, correct = correct - OLD.score "
+    "WHERE OLD.completed_at IS NOT NULL "
+    "AND test_id = OLD.test_id AND mode = COALESCE(OLD.mode, 'test') "
+    "AND (weekday, hour) = (" + _local_hour_of_week("OLD") + "); "
+)
+_BUCKET_INSERT = (
+    "INSERT INTO study_hour_buckets "
+    "(test_id, mode, weekday, hour, attempts, questions, correct) "
+    "SELECT NEW.test_id, COALESCE(NEW.mode, 'test'), "
+    + _local_hour_of_week("NEW")
+    + ", 1, NEW.total_questions, NEW.score WHERE NEW.completed_at IS NOT NULL "
+    + _BUCKET_ADD
+)
+
 # Each migration: (version, description, list_of_sql_statements)
 MIGRATIONS: List[Tuple[int, str, List[str]]] = [
     (
@@ -24,6 +97,205 @@ MIGRATIONS: List[Tuple[int, str, List[str]]] = [
             "ON question_responses (is_correct)",
         ],
     ),
+    (
+        3,
+        "Add uuid/change_seq change tracking for delta sync",
+        [
+            # Superseded by the track_tests_update trigger in schema.sql
+            "DROP TRIGGER IF EXISTS update_tests_timestamp",
+            "ALTER TABLE tests ADD COLUMN uuid TEXT",
+            "ALTER TABLE tests ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE questions ADD COLUMN updated_at TIMESTAMP",
+            "ALTER TABLE questions ADD COLUMN uuid TEXT",
+            "ALTER TABLE questions ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE question_options ADD COLUMN updated_at TIMESTAMP",
+            "ALTER TABLE question_options ADD COLUMN uuid TEXT",
+            "ALTER TABLE question_options "
+            "ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE test_attempts ADD COLUMN updated_at TIMESTAMP",
+            "ALTER TABLE test_attempts ADD COLUMN uuid TEXT",
+            "ALTER TABLE test_attempts ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE question_responses ADD COLUMN updated_at TIMESTAMP",
+            "ALTER TABLE question_responses ADD COLUMN uuid TEXT",
+            "ALTER TABLE question_responses "
+            "ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "key TEXT PRIMARY KEY, value INTEGER NOT NULL DEFAULT 0)",
+            "CREATE TABLE IF NOT EXISTS sync_tombstones ("
+            "uuid TEXT PRIMARY KEY, table_name TEXT NOT NULL, "
+            "change_seq INTEGER NOT NULL)",
+            # Backfill: every pre-existing row becomes change 1. Setting
+            # change_seq explicitly keeps the update triggers from firing.
+            "UPDATE tests SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "UPDATE questions SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "UPDATE question_options "
+            "SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "UPDATE test_attempts "
+            "SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, completed_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "UPDATE question_responses "
+            "SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "INSERT OR IGNORE INTO sync_state (key, value) VALUES ('change_seq', 0)",
+            "UPDATE sync_state SET value = MAX(value, 1) WHERE key = 'change_seq'",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tests_uuid ON tests (uuid)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_uuid ON questions (uuid)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_question_options_uuid "
+            "ON question_options (uuid)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_test_attempts_uuid "
+            "ON test_attempts (uuid)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_question_responses_uuid "
+            "ON question_responses (uuid)",
+            "CREATE INDEX IF NOT EXISTS idx_tests_change_seq ON tests (change_seq)",
+            "CREATE INDEX IF NOT EXISTS idx_questions_change_seq "
+            "ON questions (change_seq)",
+            "CREATE INDEX IF NOT EXISTS idx_question_options_change_seq "
+            "ON question_options (change_seq)",
+            "CREATE INDEX IF NOT EXISTS idx_test_attempts_change_seq "
+            "ON test_attempts (change_seq)",
+            "CREATE INDEX IF NOT EXISTS idx_question_responses_change_seq "
+            "ON question_responses (change_seq)",
+        ],
+    ),
+    (
+        4,
+        "Let pre-stamped bulk inserts skip the change tracking triggers",
+        [
+            *(f"DROP TRIGGER IF EXISTS track_{t}_insert" for t in _TRACKED_TABLES),
+            *(_insert_tracking_trigger(t) for t in _TRACKED_TABLES),
+        ],
+    ),
+    (
+        5,
+        "Add sessions table linking the attempts of a mix test",
+        [
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, mode TEXT DEFAULT 'test', "
+            "score INTEGER NOT NULL DEFAULT 0, "
+            "total_questions INTEGER NOT NULL DEFAULT 0, "
+            "percentage REAL NOT NULL DEFAULT 0.0, time_taken INTEGER, "
+            "completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)",
+            "ALTER TABLE test_attempts ADD COLUMN session_id INTEGER "
+            "REFERENCES sessions (id) ON DELETE SET NULL",
+            "CREATE INDEX IF NOT EXISTS idx_test_attempts_session_id "
+            "ON test_attempts (session_id)",
+        ],
+    ),
+    (
+        6,
+        "Add packed event timeline to test_attempts",
+        [
+            "ALTER TABLE test_attempts ADD COLUMN timeline BLOB",
+        ],
+    ),
+    (
+        7,
+        "Store shuffle seeds so session layouts can be regenerated",
+        [
+            "ALTER TABLE test_attempts ADD COLUMN seed INTEGER",
+            "ALTER TABLE test_attempts ADD COLUMN shuffle_version INTEGER",
+            "ALTER TABLE sessions ADD COLUMN seed INTEGER",
+            "ALTER TABLE sessions ADD COLUMN shuffle_version INTEGER",
+            "ALTER TABLE sessions ADD COLUMN source_test_ids TEXT",
+        ],
+    ),
+    (
+        8,
+        "Index questions by test and category for stratified mixes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_questions_test_category "
+            "ON questions (test_id, category, id)",
+        ],
+    ),
+    (
+        9,
+        "Add spaced-repetition review schedule",
+        [
+            "CREATE TABLE IF NOT EXISTS review_schedule ("
+            "question_id INTEGER PRIMARY KEY, "
+            "ease REAL NOT NULL DEFAULT 2.5, "
+            "interval_days REAL NOT NULL DEFAULT 0, "
+            "repetitions INTEGER NOT NULL DEFAULT 0, "
+            "lapses INTEGER NOT NULL DEFAULT 0, "
+            "due_at REAL NOT NULL, last_reviewed REAL, "
+            "FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE)",
+            "CREATE INDEX IF NOT EXISTS idx_review_schedule_due "
+            "ON review_schedule (due_at, question_id)",
+        ],
+    ),
+    (
+        10,
+        "Add question difficulty and category ability ratings",
+        [
+            "CREATE TABLE IF NOT EXISTS question_ratings ("
+            "question_id INTEGER PRIMARY KEY, "
+            "difficulty REAL NOT NULL DEFAULT 0, "
+            "answers INTEGER NOT NULL DEFAULT 0, "
+            "FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE)",
+            "CREATE TABLE IF NOT EXISTS category_ratings ("
+            "category TEXT PRIMARY KEY, "
+            "ability REAL NOT NULL DEFAULT 0, "
+            "answers INTEGER NOT NULL DEFAULT 0)",
+        ],
+    ),
+    (
+        11,
+        "Pre-aggregate attempts by local hour of the week",
+        [
+            "CREATE TABLE IF NOT EXISTS study_hour_buckets ("
+            "test_id INTEGER NOT NULL, mode TEXT NOT NULL, "
+            "weekday INTEGER NOT NULL, hour INTEGER NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "questions INTEGER NOT NULL DEFAULT 0, "
+            "correct INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (test_id, mode, weekday, hour))",
+            "CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_insert "
+            "AFTER INSERT ON test_attempts FOR EACH ROW "
+            "BEGIN " + _BUCKET_INSERT + "END",
+            "CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_delete "
+            "AFTER DELETE ON test_attempts FOR EACH ROW "
+            "BEGIN " + _BUCKET_SUBTRACT + "END",
+            "CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_update "
+            "AFTER UPDATE OF test_id, mode, score, total_questions, completed_at "
+            "ON test_attempts FOR EACH ROW "
+            "BEGIN " + _BUCKET_SUBTRACT + _BUCKET_INSERT + "END",
+            # Rebuild from scratch: attempts saved before the triggers existed
+            "DELETE FROM study_hour_buckets",
+            "INSERT INTO study_hour_buckets "
+            "(test_id, mode, weekday, hour, attempts, questions, correct) "
+            "SELECT test_id, COALESCE(mode, 'test'), "
+            + _local_hour_of_week("test_attempts")
+            + ", COUNT(*), SUM(total_questions), SUM(score) "
+            "FROM test_attempts WHERE completed_at IS NOT NULL "
+            "GROUP BY 1, 2, 3, 4",
+        ],
+    ),
+    (
+        12,
+        "Track sessions for delta sync",
+        [
+            "ALTER TABLE sessions ADD COLUMN updated_at TIMESTAMP",
+            "ALTER TABLE sessions ADD COLUMN uuid TEXT",
+            "ALTER TABLE sessions ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+            "UPDATE sessions SET uuid = COALESCE(uuid, lower(hex(randomblob(16)))), "
+            "updated_at = COALESCE(updated_at, completed_at, CURRENT_TIMESTAMP), "
+            "change_seq = 1 WHERE change_seq = 0",
+            "UPDATE sync_state SET value = MAX(value, 1) WHERE key = 'change_seq'",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_uuid ON sessions (uuid)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_change_seq "
+            "ON sessions (change_seq)",
+            _insert_tracking_trigger("sessions"),
+            _update_tracking_trigger("sessions"),
+        ],
+    ),
 ]
 
 
@@ -6,7 +6,9 @@ CREATE TABLE IF NOT EXISTS tests (
     description TEXT DEFAULT '',
     group_name TEXT DEFAULT '',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS questions (
@@ -17,6 +19,9 @@ CREATE TABLE IF NOT EXISTS questions (
     correct_answer TEXT NOT NULL DEFAULT '',
     category TEXT DEFAULT '',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (test_id) REFERENCES tests (id) ON DELETE CASCADE
 );
 
@@ -25,9 +30,30 @@ CREATE TABLE IF NOT EXISTS question_options (
     question_id INTEGER NOT NULL,
     option_text TEXT NOT NULL,
     is_correct BOOLEAN DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE
 );
 
+-- A sitting that spans several tests (a mix test); each source test
+-- still gets its own attempt row, linked here through session_id.
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    mode TEXT DEFAULT 'test',
+    score INTEGER NOT NULL DEFAULT 0,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    percentage REAL NOT NULL DEFAULT 0.0,
+    time_taken INTEGER,
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    seed INTEGER,
+    shuffle_version INTEGER,
+    source_test_ids TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0
+);
+
 CREATE TABLE IF NOT EXISTS test_attempts (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     test_id INTEGER NOT NULL,
@@ -37,6 +63,13 @@ CREATE TABLE IF NOT EXISTS test_attempts (
     time_taken INTEGER,
     mode TEXT DEFAULT 'test',
     completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0,
+    session_id INTEGER REFERENCES sessions (id) ON DELETE SET NULL,
+    timeline BLOB,
+    seed INTEGER,
+    shuffle_version INTEGER,
     FOREIGN KEY (test_id) REFERENCES tests (id) ON DELETE CASCADE
 );
 
@@ -48,23 +81,314 @@ CREATE TABLE IF NOT EXISTS question_responses (
     is_correct BOOLEAN,
     was_flagged BOOLEAN DEFAULT 0,
     time_spent INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    uuid TEXT,
+    change_seq INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (attempt_id) REFERENCES test_attempts (id) ON DELETE CASCADE,
     FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE
 );
 
+-- Spaced-repetition state per question; due_at is unix seconds
+CREATE TABLE IF NOT EXISTS review_schedule (
+    question_id INTEGER PRIMARY KEY,
+    ease REAL NOT NULL DEFAULT 2.5,
+    interval_days REAL NOT NULL DEFAULT 0,
+    repetitions INTEGER NOT NULL DEFAULT 0,
+    lapses INTEGER NOT NULL DEFAULT 0,
+    due_at REAL NOT NULL,
+    last_reviewed REAL,
+    FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE
+);
+
+-- Online difficulty (per question) and ability (per category) ratings,
+-- on a shared logit scale
+CREATE TABLE IF NOT EXISTS question_ratings (
+    question_id INTEGER PRIMARY KEY,
+    difficulty REAL NOT NULL DEFAULT 0,
+    answers INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS category_ratings (
+    category TEXT PRIMARY KEY,
+    ability REAL NOT NULL DEFAULT 0,
+    answers INTEGER NOT NULL DEFAULT 0
+);
+
 -- Indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_questions_test_id ON questions (test_id);
+CREATE INDEX IF NOT EXISTS idx_questions_test_category ON questions (test_id, category, id);
 CREATE INDEX IF NOT EXISTS idx_question_options_question_id ON question_options (question_id);
 CREATE INDEX IF NOT EXISTS idx_test_attempts_test_id ON test_attempts (test_id);
 CREATE INDEX IF NOT EXISTS idx_test_attempts_completed_at ON test_attempts (completed_at);
 CREATE INDEX IF NOT EXISTS idx_question_responses_attempt_id ON question_responses (attempt_id);
 CREATE INDEX IF NOT EXISTS idx_question_responses_question_id ON question_responses (question_id);
 CREATE INDEX IF NOT EXISTS idx_question_responses_is_correct ON question_responses (is_correct);
+CREATE INDEX IF NOT EXISTS idx_review_schedule_due ON review_schedule (due_at, question_id);
+
+-- Change tracking for delta sync between machines.
+-- Every insert/update stamps the row with the next value of a global
+-- change counter; deletes leave a tombstone keyed by the row's uuid.
+-- Writes that set change_seq themselves (sync apply, bulk merge) skip
+-- the triggers and must supply uuid and updated_at; an explicitly
+-- written updated_at is always preserved.
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO sync_state (key, value) VALUES ('change_seq', 0);
 
--- Trigger to update the updated_at column on tests
-CREATE TRIGGER IF NOT EXISTS update_tests_timestamp
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    uuid TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    change_seq INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_change_seq ON sync_tombstones (change_seq);
+
+CREATE TRIGGER IF NOT EXISTS track_tests_insert
+AFTER INSERT ON tests
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE tests SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_tests_update
 AFTER UPDATE ON tests
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE tests SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_tests_delete
+AFTER DELETE ON tests
+FOR EACH ROW WHEN OLD.uuid IS NOT NULL
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    INSERT OR REPLACE INTO sync_tombstones (uuid, table_name, change_seq)
+    VALUES (OLD.uuid, 'tests', (SELECT value FROM sync_state WHERE key = 'change_seq'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_questions_insert
+AFTER INSERT ON questions
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE questions SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_questions_update
+AFTER UPDATE ON questions
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE questions SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_questions_delete
+AFTER DELETE ON questions
+FOR EACH ROW WHEN OLD.uuid IS NOT NULL
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    INSERT OR REPLACE INTO sync_tombstones (uuid, table_name, change_seq)
+    VALUES (OLD.uuid, 'questions', (SELECT value FROM sync_state WHERE key = 'change_seq'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_question_options_insert
+AFTER INSERT ON question_options
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE question_options SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_question_options_update
+AFTER UPDATE ON question_options
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE question_options SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_question_options_delete
+AFTER DELETE ON question_options
+FOR EACH ROW WHEN OLD.uuid IS NOT NULL
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    INSERT OR REPLACE INTO sync_tombstones (uuid, table_name, change_seq)
+    VALUES (OLD.uuid, 'question_options', (SELECT value FROM sync_state WHERE key = 'change_seq'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_sessions_insert
+AFTER INSERT ON sessions
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE sessions SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_sessions_update
+AFTER UPDATE ON sessions
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE sessions SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_test_attempts_insert
+AFTER INSERT ON test_attempts
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE test_attempts SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_test_attempts_update
+AFTER UPDATE ON test_attempts
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE test_attempts SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_question_responses_insert
+AFTER INSERT ON question_responses
+FOR EACH ROW WHEN NEW.change_seq = 0
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE question_responses SET
+        uuid = COALESCE(NEW.uuid, lower(hex(randomblob(16)))),
+        updated_at = COALESCE(NEW.updated_at, CURRENT_TIMESTAMP),
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_question_responses_update
+AFTER UPDATE ON question_responses
+FOR EACH ROW WHEN NEW.change_seq IS OLD.change_seq
+BEGIN
+    UPDATE sync_state SET value = value + 1 WHERE key = 'change_seq';
+    UPDATE question_responses SET
+        updated_at = CASE WHEN NEW.updated_at IS OLD.updated_at
+                     THEN CURRENT_TIMESTAMP ELSE NEW.updated_at END,
+        change_seq = (SELECT value FROM sync_state WHERE key = 'change_seq')
+    WHERE id = NEW.id;
+END;
+
+-- Attempts pre-aggregated by test, mode and local hour of the week, so
+-- the study-time heatmap never scans test_attempts. completed_at is
+-- stored as UTC; the 'localtime' modifier converts it when the row is
+-- bucketed. weekday is strftime('%w'): 0 = Sunday.
+CREATE TABLE IF NOT EXISTS study_hour_buckets (
+    test_id INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    questions INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (test_id, mode, weekday, hour)
+);
+
+CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_insert
+AFTER INSERT ON test_attempts
+FOR EACH ROW
+BEGIN
+    INSERT INTO study_hour_buckets
+        (test_id, mode, weekday, hour, attempts, questions, correct)
+    SELECT
+        NEW.test_id, COALESCE(NEW.mode, 'test'),
+        CAST(strftime('%w', NEW.completed_at, 'localtime') AS INTEGER),
+        CAST(strftime('%H', NEW.completed_at, 'localtime') AS INTEGER),
+        1, NEW.total_questions, NEW.score
+    WHERE NEW.completed_at IS NOT NULL
+    ON CONFLICT (test_id, mode, weekday, hour) DO UPDATE SET
+        attempts = attempts + 1,
+        questions = questions + excluded.questions,
+        correct = correct + excluded.correct;
+END;
+
+CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_delete
+AFTER DELETE ON test_attempts
+FOR EACH ROW
+BEGIN
+    UPDATE study_hour_buckets SET
+        attempts = attempts - 1,
+        questions = questions - OLD.total_questions,
+        correct = correct - OLD.score
+    WHERE OLD.completed_at IS NOT NULL
+      AND test_id = OLD.test_id AND mode = COALESCE(OLD.mode, 'test')
+      AND (weekday, hour) = (
+          CAST(strftime('%w', OLD.completed_at, 'localtime') AS INTEGER),
+          CAST(strftime('%H', OLD.completed_at, 'localtime') AS INTEGER));
+END;
+
+CREATE TRIGGER IF NOT EXISTS bucket_test_attempts_update
+AFTER UPDATE OF test_id, mode, score, total_questions, completed_at ON test_attempts
 FOR EACH ROW
 BEGIN
-    UPDATE tests SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+    UPDATE study_hour_buckets SET
+        attempts = attempts - 1,
+        questions = questions - OLD.total_questions,
+        correct = correct - OLD.score
+    WHERE OLD.completed_at IS NOT NULL
+      AND test_id = OLD.test_id AND mode = COALESCE(OLD.mode, 'test')
+      AND (weekday, hour) = (
+          CAST(strftime('%w', OLD.completed_at, 'localtime') AS INTEGER),
+          CAST(strftime('%H', OLD.completed_at, 'localtime') AS INTEGER));
+    INSERT INTO study_hour_buckets
+        (test_id, mode, weekday, hour, attempts, questions, correct)
+    SELECT
+        NEW.test_id, COALESCE(NEW.mode, 'test'),
+        CAST(strftime('%w', NEW.completed_at, 'localtime') AS INTEGER),
+        CAST(strftime('%H', NEW.completed_at, 'localtime') AS INTEGER),
+        1, NEW.total_questions, NEW.score
+    WHERE NEW.completed_at IS NOT NULL
+    ON CONFLICT (test_id, mode, weekday, hour) DO UPDATE SET
+        attempts = attempts + 1,
+        questions = questions + excluded.questions,
+        correct = correct + excluded.correct;
 END;
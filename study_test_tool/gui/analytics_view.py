@@ -1,5 +1,10 @@
 """Analytics view — performance graphs and weak topic identification."""
 
+import threading
+import tkinter.filedialog as filedialog
+import tkinter.messagebox as messagebox
+from datetime import date, timedelta
+
 import customtkinter as ctk
 
 from config.settings import (
@@ -11,9 +16,16 @@ from config.settings import (
     FONT_SIZE_HEADING,
     FONT_SIZE_SMALL,
     FONT_SIZE_TITLE,
+    READINESS_HORIZON_DAYS,
 )
 from gui.components.graph_widget import GraphWidget
-from services.analytics_service import AnalyticsService
+from services.analytics_service import (
+    FLAG_FAST_WRONG,
+    FLAG_SLOW_CORRECT,
+    WEEKDAY_LABELS,
+    AnalyticsService,
+)
+from services.history_export_service import HistoryExportService
 from services.test_service import TestService
 from utils.constants import SCREEN_HOME
 
@@ -26,9 +38,15 @@ class AnalyticsViewFrame(ctk.CTkFrame):
         self.controller = controller
         self.analytics_service = AnalyticsService()
         self.test_service = TestService()
+        self.history_export_service = HistoryExportService()
+        self._test_ids = {}  # test name → id, refreshed in on_show
 
         self._build_ui()
 
+    def close_connections(self) -> None:
+        """Release the database connection the analytics service keeps open."""
+        self.analytics_service.close()
+
     def _build_ui(self) -> None:
         """Build the analytics layout."""
         # Top bar
@@ -49,6 +67,14 @@ class AnalyticsViewFrame(ctk.CTkFrame):
             font=(FONT_FAMILY, FONT_SIZE_TITLE, "bold"),
         ).pack(side="left", padx=20)
 
+        self.export_btn = ctk.CTkButton(
+            top_frame,
+            text="Export History",
+            width=130,
+            command=self._on_export_history,
+        )
+        self.export_btn.pack(side="right")
+
         # Tab selector
         tab_frame = ctk.CTkFrame(self, fg_color="transparent")
         tab_frame.pack(fill="x", padx=30, pady=(0, 5))
@@ -56,7 +82,15 @@ class AnalyticsViewFrame(ctk.CTkFrame):
         self.tab_var = ctk.StringVar(value="Score Trends")
         self.tab_seg = ctk.CTkSegmentedButton(
             tab_frame,
-            values=["Score Trends", "Test Comparison", "Study Activity", "Weak Topics"],
+            values=[
+                "Score Trends",
+                "Test Comparison",
+                "Study Activity",
+                "Time vs Accuracy",
+                "Study Times",
+                "Readiness",
+                "Weak Topics",
+            ],
             variable=self.tab_var,
             command=self._on_tab_change,
         )
@@ -103,6 +137,7 @@ class AnalyticsViewFrame(ctk.CTkFrame):
     def on_show(self, **kwargs) -> None:
         """Load data when shown."""
         tests = self.test_service.get_all_tests()
+        self._test_ids = {t.name: t.id for t in tests}
         test_names = ["All Tests"] + [t.name for t in tests]
         self.test_filter_menu.configure(values=test_names)
         self.test_filter_var.set("All Tests")
@@ -120,14 +155,41 @@ class AnalyticsViewFrame(ctk.CTkFrame):
 
     def _get_selected_test_id(self):
         """Get test_id from filter, or None for 'All Tests'."""
-        test_filter = self.test_filter_var.get()
-        if test_filter == "All Tests":
-            return None
-        tests = self.test_service.get_all_tests()
-        for t in tests:
-            if t.name == test_filter:
-                return t.id
-        return None
+        return self._test_ids.get(self.test_filter_var.get())
+
+    def _on_export_history(self) -> None:
+        """Export response history for the selected test to a folder."""
+        out_dir = filedialog.askdirectory(title="Export History To")
+        if not out_dir:
+            return
+
+        test_id = self._get_selected_test_id()
+        test_ids = [test_id] if test_id is not None else None
+        self.export_btn.configure(state="disabled", text="Exporting...")
+
+        thread = threading.Thread(
+            target=self._export_history, args=(out_dir, test_ids), daemon=True
+        )
+        thread.start()
+
+    def _export_history(self, out_dir: str, test_ids) -> None:
+        """Run the export off the UI thread (called from background thread)."""
+        try:
+            result = self.history_export_service.export_response_history(
+                out_dir, test_ids=test_ids
+            )
+            self.after(0, lambda: self._on_export_done(result["rows"], None))
+        except Exception as e:
+            message = str(e)
+            self.after(0, lambda: self._on_export_done(0, message))
+
+    def _on_export_done(self, rows: int, error) -> None:
+        """Restore the button and report the export outcome."""
+        self.export_btn.configure(state="normal", text="Export History")
+        if error:
+            messagebox.showerror("Export Error", error)
+        else:
+            messagebox.showinfo("Export Complete", f"Exported {rows} responses.")
 
     def _render_current_tab(self) -> None:
         """Render the currently selected tab."""
@@ -144,6 +206,12 @@ class AnalyticsViewFrame(ctk.CTkFrame):
             self._render_test_comparison()
         elif tab == "Study Activity":
             self._render_study_activity()
+        elif tab == "Time vs Accuracy":
+            self._render_time_vs_accuracy()
+        elif tab == "Study Times":
+            self._render_study_times()
+        elif tab == "Readiness":
+            self._render_readiness()
         elif tab == "Weak Topics":
             self._render_weak_topics()
 
@@ -207,6 +275,104 @@ class AnalyticsViewFrame(ctk.CTkFrame):
             title="Study Activity (Last 30 Days)",
         )
 
+    def _render_time_vs_accuracy(self) -> None:
+        """Render median answer time against accuracy, one point per question."""
+        test_id = self._get_selected_test_id()
+        questions = [
+            q
+            for q in self.analytics_service.get_response_times(test_id)["questions"]
+            if q["accuracy"] is not None
+        ]
+
+        if not questions:
+            self.empty_label.pack(pady=40)
+            return
+
+        flag_colors = {
+            FLAG_SLOW_CORRECT: COLOR_TOPIC_MODERATE,
+            FLAG_FAST_WRONG: COLOR_TOPIC_WEAK,
+        }
+        slow = sum(q["flag"] == FLAG_SLOW_CORRECT for q in questions)
+        fast = sum(q["flag"] == FLAG_FAST_WRONG for q in questions)
+
+        self.graph_widget.pack(fill="both", expand=True)
+        self.graph_widget.draw_scatter_chart(
+            [q["p50"] for q in questions],
+            [q["accuracy"] for q in questions],
+            title=(
+                f"Time vs Accuracy ({slow} slow but correct, " f"{fast} fast but wrong)"
+            ),
+            x_label="Median Time (s)",
+            y_label="Accuracy (%)",
+            colors_list=[
+                flag_colors.get(q["flag"], COLOR_TOPIC_STRONG) for q in questions
+            ],
+        )
+
+    def _render_study_times(self) -> None:
+        """Render volume and accuracy heatmaps by weekday and hour."""
+        test_id = self._get_selected_test_id()
+        heatmap = self.analytics_service.get_study_heatmap(test_id=test_id)
+
+        if not any(map(any, heatmap["attempts"])):
+            self.empty_label.pack(pady=40)
+            return
+
+        title = "Study Times (local time)"
+        best, worst = heatmap["best"], heatmap["worst"]
+        if best and worst and best is not worst:
+            title = (
+                f"Best: {best['day']} {best['hour']:02d}:00 ({best['accuracy']}%)"
+                f"  ·  Worst: {worst['day']} {worst['hour']:02d}:00 "
+                f"({worst['accuracy']}%)"
+            )
+
+        self.graph_widget.pack(fill="both", expand=True)
+        self.graph_widget.draw_heatmaps(
+            [
+                {"data": heatmap["attempts"], "title": "Attempts", "cmap": "Blues"},
+                {
+                    "data": heatmap["accuracy"],
+                    "title": "Accuracy (%)",
+                    "cmap": "RdYlGn",
+                    "vmin": 0,
+                    "vmax": 100,
+                },
+            ],
+            WEEKDAY_LABELS,
+            title=title,
+        )
+
+    def _render_readiness(self) -> None:
+        """Render projected scores with 95% bands, per test or per category.
+
+        With "All Tests" selected each bar is a test; with one test
+        selected, each bar is a category (its curve spans all tests).
+        """
+        target = date.today() + timedelta(days=READINESS_HORIZON_DAYS)
+        forecast = self.analytics_service.get_readiness_forecast(on=target)
+        if self._get_selected_test_id() is None:
+            rows, key, title = forecast["tests"], "test_name", "Test"
+        else:
+            rows, key, title = forecast["categories"], "category", "Category"
+        rows = [r for r in rows if r["projected"] is not None]
+
+        if not rows:
+            self.empty_label.pack(pady=40)
+            return
+
+        self.graph_widget.pack(fill="both", expand=True)
+        self.graph_widget.draw_bar_chart(
+            [r[key] for r in rows],
+            [r["projected"] for r in rows],
+            title=f"{title} Readiness on {target.isoformat()} (95% band)",
+            y_label="Projected Score (%)",
+            errors=[
+                [r["projected"] - r["lower"] for r in rows],
+                [r["upper"] - r["projected"] for r in rows],
+            ],
+        )
+
     def _render_weak_topics(self) -> None:
         """Render weak topics list with color-coded indicators."""
         test_id = self._get_selected_test_id()
@@ -4,9 +4,10 @@ import matplotlib
 
 matplotlib.use("TkAgg")
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import customtkinter as ctk
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
@@ -114,6 +115,7 @@ class GraphWidget(ctk.CTkFrame):
         title: str = "",
         y_label: str = "",
         colors_list: Optional[list] = None,
+        errors: Optional[list] = None,
     ) -> None:
         """Draw a bar chart.
 
@@ -123,6 +125,8 @@ class GraphWidget(ctk.CTkFrame):
             title: Chart title.
             y_label: Y-axis label.
             colors_list: Optional per-bar colors.
+            errors: Optional error bars, as matplotlib ``yerr`` (one list,
+                or a [below, above] pair of lists).
         """
         theme = self._get_theme_colors()
         self._figure.clear()
@@ -131,7 +135,14 @@ class GraphWidget(ctk.CTkFrame):
         ax.set_facecolor(theme["bg"])
 
         bar_colors = colors_list if colors_list else [theme["bar"]] * len(labels)
-        bars = ax.bar(range(len(labels)), values, color=bar_colors)
+        bars = ax.bar(
+            range(len(labels)),
+            values,
+            color=bar_colors,
+            yerr=errors,
+            ecolor=theme["text"],
+            capsize=3,
+        )
 
         ax.set_xticks(range(len(labels)))
         ax.set_xticklabels(labels, rotation=30, ha="right", fontsize=9)
@@ -183,3 +194,100 @@ class GraphWidget(ctk.CTkFrame):
             spine.set_color(theme["grid"])
 
         self.refresh()
+
+    def draw_scatter_chart(
+        self,
+        x_data: list,
+        y_data: list,
+        title: str = "",
+        x_label: str = "",
+        y_label: str = "",
+        colors_list: Optional[list] = None,
+    ) -> None:
+        """Draw a scatter chart.
+
+        Args:
+            x_data: X-axis values.
+            y_data: Y-axis values.
+            title: Chart title.
+            x_label: X-axis label.
+            y_label: Y-axis label.
+            colors_list: Optional per-point colors.
+        """
+        theme = self._get_theme_colors()
+        self._figure.clear()
+
+        ax = self._figure.add_subplot(111)
+        ax.set_facecolor(theme["bg"])
+        ax.scatter(
+            x_data,
+            y_data,
+            c=colors_list if colors_list else theme["line"],
+            alpha=0.7,
+            edgecolors="none",
+        )
+
+        if title:
+            ax.set_title(title, color=theme["text"], fontsize=12)
+        if x_label:
+            ax.set_xlabel(x_label, color=theme["text"])
+        if y_label:
+            ax.set_ylabel(y_label, color=theme["text"])
+
+        ax.tick_params(colors=theme["text"])
+        ax.grid(True, alpha=0.3, color=theme["grid"])
+
+        for spine in ax.spines.values():
+            spine.set_color(theme["grid"])
+
+        ax.set_ylim(-5, 105)
+
+        self.refresh()
+
+    def draw_heatmaps(
+        self,
+        panels: List[Dict],
+        row_labels: list,
+        title: str = "",
+    ) -> None:
+        """Draw side-by-side hour-of-day heatmaps as image plots.
+
+        Args:
+            panels: One dict per heatmap with ``data`` (rows × 24 grid,
+                None for empty cells), ``title``, ``cmap`` and optional
+                ``vmin``/``vmax``.
+            row_labels: Label of each grid row.
+            title: Figure title.
+        """
+        theme = self._get_theme_colors()
+        self._figure.clear()
+
+        for i, panel in enumerate(panels):
+            ax = self._figure.add_subplot(1, len(panels), i + 1)
+            ax.set_facecolor(theme["grid"])
+            grid = np.ma.masked_invalid(np.array(panel["data"], dtype=float))
+            image = ax.imshow(
+                grid,
+                cmap=panel["cmap"],
+                vmin=panel.get("vmin"),
+                vmax=panel.get("vmax"),
+                aspect="auto",
+                interpolation="nearest",
+            )
+            colorbar = self._figure.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+            colorbar.ax.tick_params(colors=theme["text"], labelsize=8)
+
+            ax.set_title(panel["title"], color=theme["text"], fontsize=11)
+            ax.set_yticks(range(len(row_labels)))
+            ax.set_yticklabels(row_labels, fontsize=8)
+            ax.set_xticks(range(0, 24, 3))
+            ax.set_xlabel("Hour", color=theme["text"])
+            ax.tick_params(colors=theme["text"])
+
+            for spine in ax.spines.values():
+                spine.set_color(theme["grid"])
+
+        if title:
+            self._figure.suptitle(title, color=theme["text"], fontsize=12)
+
+        self.refresh()
@@ -0,0 +1,253 @@
+"""Import preview dialog — parse a file in the background before saving it."""
+
+import queue
+import threading
+from pathlib import Path
+from typing import Optional
+
+import customtkinter as ctk
+
+from config.settings import (
+    COLOR_SUCCESS,
+    COLOR_WARNING,
+    FONT_FAMILY,
+    FONT_SIZE_BODY,
+    FONT_SIZE_HEADING,
+    FONT_SIZE_SMALL,
+    QUESTION_TYPE_MC,
+)
+from models.question import Question
+from models.test import Test
+from services.import_service import ImportService
+
+# Questions shown in the preview list; the rest are only counted
+PREVIEW_LIMIT = 25
+
+# How often the Tk thread applies updates posted by the parse thread (ms)
+UPDATE_POLL_MS = 50
+
+
+class ImportPreviewDialog(ctk.CTkToplevel):
+    """Modal dry-run preview of an import.
+
+    The file is parsed on a worker thread and the first questions appear
+    as soon as they are parsed. Nothing is written until Import is
+    clicked, and the import then saves the already-parsed questions.
+    """
+
+    def __init__(self, parent, import_service: ImportService, file_path: str) -> None:
+        super().__init__(parent)
+        self.title("Import Preview")
+        self.geometry("560x560")
+        self.resizable(False, False)
+
+        self._import_service = import_service
+        self._file_path = file_path
+        self._parsed: Optional[Test] = None
+        self._test_id: Optional[int] = None
+        self._parsed_count = 0
+        self._closed = False
+        # Tk is not thread-safe: the worker queues callbacks and the Tk
+        # thread runs them from _poll_updates
+        self._updates: queue.Queue = queue.Queue()
+        self._poll_id: Optional[str] = None
+
+        # Make modal
+        self.transient(parent)
+        self.grab_set()
+        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
+
+        self._build_ui()
+
+        # Center on parent
+        self.update_idletasks()
+        x = parent.winfo_rootx() + (parent.winfo_width() - 560) // 2
+        y = parent.winfo_rooty() + (parent.winfo_height() - 560) // 2
+        self.geometry(f"+{x}+{y}")
+
+        threading.Thread(target=self._parse, daemon=True).start()
+        self._poll_updates()
+
+    def _build_ui(self) -> None:
+        """Build the dialog layout."""
+        ctk.CTkLabel(
+            self,
+            text=f"Preview: {Path(self._file_path).name}",
+            font=(FONT_FAMILY, FONT_SIZE_HEADING, "bold"),
+        ).pack(pady=(15, 5), padx=20)
+
+        self._status_label = ctk.CTkLabel(
+            self,
+            text="Parsing...",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            text_color="gray",
+        )
+        self._status_label.pack(pady=(0, 5))
+
+        self._question_list = ctk.CTkScrollableFrame(self, height=300)
+        self._question_list.pack(fill="both", expand=True, padx=20, pady=5)
+
+        self._stats_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            justify="left",
+            anchor="w",
+        )
+        self._stats_label.pack(fill="x", padx=20, pady=5)
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(fill="x", padx=20, pady=(5, 15))
+
+        ctk.CTkButton(
+            btn_frame,
+            text="Cancel",
+            width=100,
+            fg_color="gray",
+            command=self._on_cancel,
+        ).pack(side="right", padx=5)
+
+        self._import_btn = ctk.CTkButton(
+            btn_frame,
+            text="Import",
+            width=100,
+            fg_color=COLOR_SUCCESS,
+            state="disabled",
+            command=self._on_confirm,
+        )
+        self._import_btn.pack(side="right", padx=5)
+
+    # ── Background parsing ─────────────────────────────────────
+
+    def _parse(self) -> None:
+        """Parse and analyse the file (runs on a worker thread)."""
+        try:
+            parsed = self._import_service.parse_file(
+                self._file_path,
+                on_question=self._on_question_parsed,
+                progress_callback=self._on_page_progress,
+            )
+            stats = self._import_service.analyze_import(parsed)
+        except Exception as e:
+            message = str(e)
+            self._post(lambda: self._on_parse_error(message))
+            return
+        self._post(lambda: self._on_parse_done(parsed, stats))
+
+    def _post(self, callback) -> None:
+        """Queue a UI update from the worker thread."""
+        self._updates.put(callback)
+
+    def _poll_updates(self) -> None:
+        """Run queued UI updates on the Tk thread until the dialog closes."""
+        while not self._closed:
+            try:
+                callback = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            callback()
+        if not self._closed:
+            self._poll_id = self.after(UPDATE_POLL_MS, self._poll_updates)
+
+    def _on_question_parsed(self, question: Question) -> None:
+        """Stream the first questions into the list (worker thread)."""
+        self._parsed_count += 1
+        number = self._parsed_count
+        if number <= PREVIEW_LIMIT:
+            self._post(lambda: self._add_question_row(number, question))
+
+    def _on_page_progress(self, done: int, total: int) -> None:
+        """Show PDF page progress (worker thread)."""
+        self._post(
+            lambda: self._status_label.configure(text=f"Reading page {done}/{total}...")
+        )
+
+    # ── UI updates ─────────────────────────────────────────────
+
+    def _add_question_row(self, number: int, question: Question) -> None:
+        """Add one parsed question to the preview list."""
+        if question.type == QUESTION_TYPE_MC:
+            detail = f"{len(question.options)} options"
+            if question.correct_answer:
+                detail += f", answer: {question.correct_answer}"
+        else:
+            detail = "essay"
+
+        ctk.CTkLabel(
+            self._question_list,
+            text=f"{number}. {question.text}",
+            font=(FONT_FAMILY, FONT_SIZE_BODY),
+            wraplength=470,
+            justify="left",
+            anchor="w",
+        ).pack(fill="x", pady=(6, 0), padx=5)
+        ctk.CTkLabel(
+            self._question_list,
+            text=detail,
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            text_color="gray",
+            anchor="w",
+        ).pack(fill="x", padx=20)
+
+    def _on_parse_done(self, parsed: Test, stats: dict) -> None:
+        """Show validation stats and enable Import."""
+        self._parsed = parsed
+        shown = min(stats["question_count"], PREVIEW_LIMIT)
+        self._status_label.configure(
+            text=f"Showing {shown} of {stats['question_count']} questions"
+        )
+
+        lines = [
+            f"Test name: {parsed.name}",
+            f"{stats['mc_count']} multiple choice, {stats['essay_count']} essay",
+        ]
+        if stats["duplicates_in_file"]:
+            lines.append(f"{stats['duplicates_in_file']} repeated within this file")
+        if stats["duplicates_in_library"]:
+            lines.append(
+                f"{stats['duplicates_in_library']} already in your library"
+            )
+        warnings = stats["warnings"]
+        if warnings:
+            lines.append(f"⚠ {len(warnings)} issue(s): " + "; ".join(warnings[:3]))
+            if len(warnings) > 3:
+                lines[-1] += "; ..."
+            self._stats_label.configure(text_color=COLOR_WARNING)
+        self._stats_label.configure(text="\n".join(lines))
+        self._import_btn.configure(state="normal")
+
+    def _on_parse_error(self, message: str) -> None:
+        """Show a parse failure; nothing has been saved."""
+        self._status_label.configure(
+            text=f"Could not import: {message}", text_color=COLOR_WARNING
+        )
+
+    def _on_confirm(self) -> None:
+        """Save the parsed test and close."""
+        try:
+            self._test_id = self._import_service.commit_import(self._parsed)
+        except Exception as e:
+            self._on_parse_error(str(e))
+            return
+        self._close()
+
+    def _on_cancel(self) -> None:
+        """Close without saving anything."""
+        self._close()
+
+    def _close(self) -> None:
+        """Stop applying worker updates and destroy the dialog."""
+        self._closed = True
+        if self._poll_id is not None:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.destroy()
+
+    def get_result(self) -> Optional[int]:
+        """Return the created test id after dialog closes.
+
+        Returns:
+            The new test id, or None if the import was cancelled.
+        """
+        self.wait_window()
+        return self._test_id
@@ -1,6 +1,6 @@
 """Mix test dialog — select tests and question count for a mixed test."""
 
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import customtkinter as ctk
 
@@ -12,6 +12,15 @@ from config.settings import (
     FONT_SIZE_SMALL,
 )
 from models.test import Test
+from services.mix_service import MixService, largest_remainder
+from utils.constants import MIX_STRATIFIED, MIX_UNIFORM, MIX_WEIGHTED
+
+# Selection strategy menu labels
+STRATEGY_LABELS = {
+    "Random": MIX_UNIFORM,
+    "Prioritize missed & unseen": MIX_WEIGHTED,
+    "Balanced by test & category": MIX_STRATIFIED,
+}
 
 
 class MixTestDialog(ctk.CTkToplevel):
@@ -21,14 +30,26 @@ class MixTestDialog(ctk.CTkToplevel):
         self,
         parent,
         tests_with_counts: List[Tuple[Test, int]],
+        strata: Optional[Dict[int, Dict[str, int]]] = None,
     ) -> None:
+        """Create the dialog.
+
+        Args:
+            parent: Parent window.
+            tests_with_counts: (test, question count) pairs to offer.
+            strata: test_id → {category: question count}, used to preview
+                the allocation of a balanced mix.
+        """
         super().__init__(parent)
         self.title("Mix Test")
-        self.geometry("450x480")
+        self.geometry("450x600")
         self.resizable(False, False)
 
-        self._result: Optional[Tuple[List[int], int]] = None
+        self._result: Optional[Tuple[List[int], int, str, Optional[Dict[int, int]]]] = (
+            None
+        )
         self._tests_with_counts = tests_with_counts
+        self._strata = strata or {}
         self._checkboxes: List[Tuple[ctk.CTkCheckBox, int]] = []
         self._check_vars: List[ctk.BooleanVar] = []
 
@@ -41,7 +62,7 @@ class MixTestDialog(ctk.CTkToplevel):
         # Center on parent
         self.update_idletasks()
         x = parent.winfo_rootx() + (parent.winfo_width() - 450) // 2
-        y = parent.winfo_rooty() + (parent.winfo_height() - 480) // 2
+        y = parent.winfo_rooty() + (parent.winfo_height() - 600) // 2
         self.geometry(f"+{x}+{y}")
 
     def _build_ui(self) -> None:
@@ -122,6 +143,45 @@ class MixTestDialog(ctk.CTkToplevel):
         self._count_entry = ctk.CTkEntry(count_frame, width=80)
         self._count_entry.insert(0, "10")
         self._count_entry.pack(side="left")
+        self._count_entry.bind("<KeyRelease>", lambda e: self._update_allocation())
+
+        # Selection strategy
+        strategy_frame = ctk.CTkFrame(self, fg_color="transparent")
+        strategy_frame.pack(fill="x", padx=25, pady=5)
+
+        ctk.CTkLabel(
+            strategy_frame,
+            text="Selection:",
+            font=(FONT_FAMILY, FONT_SIZE_BODY),
+        ).pack(side="left", padx=(0, 10))
+
+        self._strategy_var = ctk.StringVar(value="Random")
+        ctk.CTkOptionMenu(
+            strategy_frame,
+            variable=self._strategy_var,
+            values=list(STRATEGY_LABELS),
+            command=lambda _: self._update_allocation(),
+            width=220,
+        ).pack(side="left")
+
+        self._equal_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            self,
+            text="Equal share per test",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            variable=self._equal_var,
+            command=self._update_allocation,
+        ).pack(anchor="w", padx=25, pady=(5, 0))
+
+        self._allocation_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            text_color="gray",
+            wraplength=400,
+            justify="left",
+        )
+        self._allocation_label.pack(anchor="w", padx=25, pady=(2, 0))
 
         # OK / Cancel buttons
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -147,6 +207,49 @@ class MixTestDialog(ctk.CTkToplevel):
         """Update the total available label when checkboxes change."""
         total = self._get_total_available()
         self._total_label.configure(text=f"Total available: {total}")
+        self._update_allocation()
+
+    def _selected_ids(self) -> List[int]:
+        """Ids of the checked tests, in list order."""
+        return [
+            self._checkboxes[i][1]
+            for i, var in enumerate(self._check_vars)
+            if var.get()
+        ]
+
+    def _test_quotas(self, test_ids: List[int], count: int) -> Optional[Dict[int, int]]:
+        """Fixed per-test quotas for an equal-share mix, else None."""
+        if not self._equal_var.get():
+            return None
+        sizes = {tid: sum(self._strata.get(tid, {}).values()) for tid in test_ids}
+        return largest_remainder(count, {tid: 1 for tid in test_ids}, sizes)
+
+    def _update_allocation(self) -> None:
+        """Preview how a balanced mix would be drawn from each test."""
+        test_ids = self._selected_ids()
+        try:
+            count = int(self._count_entry.get().strip())
+        except ValueError:
+            count = 0
+        if STRATEGY_LABELS[self._strategy_var.get()] != MIX_STRATIFIED or not test_ids:
+            self._allocation_label.configure(text="")
+            return
+
+        plan = MixService.plan_stratified(
+            count,
+            {tid: self._strata.get(tid, {}) for tid in test_ids},
+            self._test_quotas(test_ids, count),
+        )
+        names = {test.id: test.name for test, _ in self._tests_with_counts}
+        lines = []
+        for tid in test_ids:
+            cats = plan[tid]
+            detail = ", ".join(
+                f"{cat or 'Uncategorized'} {n}" for cat, n in cats.items() if n
+            )
+            line = f"{names[tid]}: {sum(cats.values())}"
+            lines.append(f"{line}  ({detail})" if detail else line)
+        self._allocation_label.configure(text="\n".join(lines))
 
     def _get_total_available(self) -> int:
         """Count total questions from selected tests."""
@@ -170,10 +273,7 @@ class MixTestDialog(ctk.CTkToplevel):
 
     def _on_ok(self) -> None:
         """Validate and return selected tests and count."""
-        selected_ids = []
-        for i, var in enumerate(self._check_vars):
-            if var.get():
-                selected_ids.append(self._checkboxes[i][1])
+        selected_ids = self._selected_ids()
 
         if not selected_ids:
             return  # Nothing selected
@@ -185,14 +285,22 @@ class MixTestDialog(ctk.CTkToplevel):
         if count <= 0:
             return
 
-        self._result = (selected_ids, count)
+        strategy = STRATEGY_LABELS[self._strategy_var.get()]
+        quotas = None
+        if strategy == MIX_STRATIFIED:
+            quotas = self._test_quotas(selected_ids, count)
+        self._result = (selected_ids, count, strategy, quotas)
         self.destroy()
 
-    def get_result(self) -> Optional[Tuple[List[int], int]]:
+    def get_result(
+        self,
+    ) -> Optional[Tuple[List[int], int, str, Optional[Dict[int, int]]]]:
         """Return the selection after dialog closes.
 
         Returns:
-            Tuple of (selected_test_ids, question_count), or None if cancelled.
+            Tuple of (selected_test_ids, question_count, strategy,
+            test_quotas), or None if cancelled. test_quotas is only set for
+            an equal-share balanced mix.
         """
         self.wait_window()
         return self._result
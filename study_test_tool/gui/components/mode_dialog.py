@@ -12,10 +12,11 @@ class ModeSelectionDialog(ctk.CTkToplevel):
     def __init__(self, parent) -> None:
         super().__init__(parent)
         self.title("Select Mode")
-        self.geometry("360x220")
+        self.geometry("360x250")
         self.resizable(False, False)
 
         self._mode = None
+        self._adaptive_var = ctk.BooleanVar(value=False)
 
         # Make modal
         self.transient(parent)
@@ -26,7 +27,7 @@ class ModeSelectionDialog(ctk.CTkToplevel):
         # Center on parent
         self.update_idletasks()
         x = parent.winfo_rootx() + (parent.winfo_width() - 360) // 2
-        y = parent.winfo_rooty() + (parent.winfo_height() - 220) // 2
+        y = parent.winfo_rooty() + (parent.winfo_height() - 250) // 2
         self.geometry(f"+{x}+{y}")
 
     def _build_ui(self) -> None:
@@ -65,6 +66,13 @@ class ModeSelectionDialog(ctk.CTkToplevel):
             text_color="gray",
         ).pack(pady=(10, 5))
 
+        ctk.CTkCheckBox(
+            self,
+            text="Adaptive order (practice): match questions to your level",
+            font=(FONT_FAMILY, FONT_SIZE_BODY - 2),
+            variable=self._adaptive_var,
+        ).pack(pady=(0, 10))
+
     def _select_test(self) -> None:
         """Select test mode."""
         self._mode = MODE_TEST
@@ -83,3 +91,8 @@ class ModeSelectionDialog(ctk.CTkToplevel):
         """
         self.wait_window()
         return self._mode
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether an adaptive practice order was requested."""
+        return self._mode == MODE_PRACTICE and self._adaptive_var.get()
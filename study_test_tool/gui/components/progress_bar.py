@@ -1,6 +1,6 @@
 """Progress bar — row of clickable question indicators."""
 
-from typing import Callable, Dict, Set
+from typing import Callable, Dict, Iterable, Set
 
 import customtkinter as ctk
 
@@ -70,3 +70,31 @@ class ProgressBar(ctk.CTkFrame):
             else:
                 color = COLOR_UNANSWERED
             btn.configure(fg_color=color)
+
+    def update_indices(
+        self,
+        indices: Iterable[int],
+        current_index: int,
+        is_answered: Callable[[int], bool],
+        is_flagged: Callable[[int], bool],
+    ) -> None:
+        """Recolor only the given buttons.
+
+        Args:
+            indices: Button positions whose status may have changed.
+            current_index: Index of the currently displayed question.
+            is_answered: Whether the question at a position is answered.
+            is_flagged: Whether the question at a position is flagged.
+        """
+        for i in indices:
+            if not 0 <= i < len(self._buttons):
+                continue
+            if i == current_index:
+                color = COLOR_CURRENT
+            elif is_flagged(i):
+                color = COLOR_FLAGGED
+            elif is_answered(i):
+                color = COLOR_ANSWERED
+            else:
+                color = COLOR_UNANSWERED
+            self._buttons[i].configure(fg_color=color)
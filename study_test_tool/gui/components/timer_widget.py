@@ -19,9 +19,13 @@ class TimerWidget(ctk.CTkLabel):
         self._timer = Timer()
         self._running = False
 
-    def start(self) -> None:
-        """Start the timer and begin updating the display."""
-        self._timer.start()
+    def start(self, offset: float = 0.0) -> None:
+        """Start the timer and begin updating the display.
+
+        Args:
+            offset: Seconds already elapsed (when resuming a session).
+        """
+        self._timer.start(offset)
         self._running = True
         self._tick()
 
@@ -2,6 +2,7 @@
 
 import threading
 import tkinter.messagebox as messagebox
+from collections import defaultdict
 
 import customtkinter as ctk
 
@@ -28,6 +29,8 @@ class HistoryViewFrame(ctk.CTkFrame):
 
         self._all_attempts = []
         self._tests = []
+        self._sessions = {}
+        self._session_test_names = {}
 
         self._build_ui()
 
@@ -141,15 +144,25 @@ class HistoryViewFrame(ctk.CTkFrame):
         try:
             attempts = self.scoring_service.get_all_attempts()
             tests = self.test_service.get_all_tests()
-            self.after(0, lambda: self._on_data_loaded(attempts, tests))
+            sessions = self.scoring_service.get_all_sessions()
+            self.after(0, lambda: self._on_data_loaded(attempts, tests, sessions))
         except Exception as e:
-            self.after(0, lambda: self._on_load_error(str(e)))
+            message = str(e)
+            self.after(0, lambda: self._on_load_error(message))
 
-    def _on_data_loaded(self, attempts, tests) -> None:
+    def _on_data_loaded(self, attempts, tests, sessions) -> None:
         """Update the UI with loaded data (runs on main thread)."""
         self.loading_label.pack_forget()
         self._all_attempts = attempts
         self._tests = tests
+        self._sessions = sessions
+
+        # Source test names per mix session, for the grouped row label
+        names = defaultdict(list)
+        for attempt in attempts:
+            if attempt.session_id in sessions:
+                names[attempt.session_id].append(attempt.test_name or "Unknown")
+        self._session_test_names = {sid: sorted(n) for sid, n in names.items()}
 
         # Update filter menu
         test_names = ["All Tests"] + [t.name for t in tests]
@@ -197,33 +210,46 @@ class HistoryViewFrame(ctk.CTkFrame):
 
         self.empty_label.pack_forget()
 
+        # Attempts from one mix session collapse into a single session row
+        shown_sessions = set()
         for attempt in attempts:
-            self._create_row(attempt)
-
-    def _create_row(self, attempt) -> None:
-        """Create one clickable row in the history table."""
+            session = self._sessions.get(attempt.session_id)
+            if session is None:
+                self._create_row(
+                    attempt,
+                    attempt.test_name or "Unknown",
+                    lambda a=attempt: self._on_row_click(a),
+                )
+            elif session.id not in shown_sessions:
+                shown_sessions.add(session.id)
+                names = self._session_test_names.get(session.id, [])
+                self._create_row(
+                    session,
+                    f"Mix: {', '.join(names)}",
+                    lambda s=session: self._on_session_click(s),
+                )
+
+    def _create_row(self, record, name: str, on_click) -> None:
+        """Create one clickable row for an attempt or a mix session."""
         row = ctk.CTkFrame(self.table_body, corner_radius=4, cursor="hand2")
         row.pack(fill="x", pady=2)
 
         # Make the whole row clickable
-        row.bind(
-            "<Button-1>",
-            lambda e, a=attempt: self._on_row_click(a),
-        )
+        row.bind("<Button-1>", lambda e: on_click())
 
-        date_str = attempt.completed_at or "N/A"
+        date_str = record.completed_at or "N/A"
         if len(date_str) > 16:
             date_str = date_str[:16]
 
-        mode_label = attempt.mode.capitalize() if attempt.mode else "Test"
+        mode_label = record.mode.capitalize() if record.mode else "Test"
 
         values = [
             (date_str, 160),
-            (attempt.test_name or "Unknown", 200),
+            (name, 200),
             (mode_label, 80),
-            (f"{attempt.score}/{attempt.total_questions}", 80),
-            (f"{attempt.percentage}%", 60),
-            (self._format_time(attempt.time_taken), 70),
+            (f"{record.score}/{record.total_questions}", 80),
+            (f"{record.percentage}%", 60),
+            (self._format_time(record.time_taken), 70),
         ]
 
         for text, width in values:
@@ -235,15 +261,16 @@ class HistoryViewFrame(ctk.CTkFrame):
                 anchor="w",
             )
             lbl.pack(side="left", padx=5, pady=5)
-            lbl.bind(
-                "<Button-1>",
-                lambda e, a=attempt: self._on_row_click(a),
-            )
+            lbl.bind("<Button-1>", lambda e: on_click())
 
     def _on_row_click(self, attempt) -> None:
         """Navigate to the detailed results view for this attempt."""
         self.controller.show_frame(SCREEN_RESULTS, attempt_id=attempt.id)
 
+    def _on_session_click(self, session) -> None:
+        """Navigate to the combined results view for a mix session."""
+        self.controller.show_frame(SCREEN_RESULTS, session_id=session.id)
+
     @staticmethod
     def _format_time(seconds) -> str:
         """Format seconds to MM:SS."""
@@ -6,6 +6,7 @@ import customtkinter as ctk
 
 from config.settings import (
     APP_NAME,
+    JOURNAL_PATH,
     MIN_WINDOW_HEIGHT,
     MIN_WINDOW_WIDTH,
     WINDOW_HEIGHT,
@@ -18,6 +19,7 @@ from gui.review_view import ReviewViewFrame
 from gui.test_editor import TestEditorFrame
 from gui.test_selector import TestSelectorFrame
 from gui.test_taking import TestTakingFrame
+from services.session_journal import SessionJournal
 from utils.constants import (
     SCREEN_ANALYTICS,
     SCREEN_EDITOR,
@@ -72,6 +74,9 @@ class App(ctk.CTk):
         # Show home screen
         self.show_frame(SCREEN_HOME)
 
+        # Offer to resume a session interrupted by a crash or forced quit
+        self.after(200, self._offer_resume)
+
     def show_frame(self, name: str, **kwargs) -> None:
         """Raise a screen to the front and call its on_show method.
 
@@ -85,13 +90,32 @@ class App(ctk.CTk):
         if hasattr(frame, "on_show"):
             frame.on_show(**kwargs)
 
+    def _offer_resume(self) -> None:
+        """Restore an interrupted session from its journal if the user agrees."""
+        state = SessionJournal.replay(str(JOURNAL_PATH))
+        if state is None:
+            JOURNAL_PATH.unlink(missing_ok=True)
+            return
+        answered = len(state.responses)
+        total = len(state.question_order)
+        if messagebox.askyesno(
+            "Resume Session",
+            f'"{state.title}" was interrupted with {answered} of {total} '
+            "question(s) answered.\n\nResume where you left off?",
+        ):
+            self.show_frame(SCREEN_TEST_TAKING, resume=state)
+        else:
+            JOURNAL_PATH.unlink(missing_ok=True)
+
     def _on_close(self) -> None:
         """Handle window close — confirm if a test is in progress."""
         if self._current_screen == SCREEN_TEST_TAKING:
             if not messagebox.askyesno(
                 "Quit",
                 "A test is in progress. Are you sure you want to quit?\n\n"
-                "Your progress will be lost.",
+                "You can resume it the next time you open the app.",
             ):
                 return
+            self.frames[SCREEN_TEST_TAKING].close_journal()
+        self.frames[SCREEN_ANALYTICS].close_connections()
         self.destroy()
@@ -1,6 +1,7 @@
 """Results view — displays score and question-by-question review."""
 
 from collections import defaultdict
+from typing import Dict, Optional
 
 import customtkinter as ctk
 
@@ -16,6 +17,8 @@ from config.settings import (
     QUESTION_TYPE_ESSAY,
     QUESTION_TYPE_MC,
 )
+from services.mix_service import MixService
+from services.randomizer_service import GENERATOR_VERSION
 from services.scoring_service import ScoringService
 from services.test_service import TestService
 from utils.constants import SCREEN_HOME, SCREEN_TEST_TAKING
@@ -29,7 +32,9 @@ class ResultsViewFrame(ctk.CTkFrame):
         self.controller = controller
         self.scoring_service = ScoringService()
         self.test_service = TestService()
+        self.mix_service = MixService()
         self._test_id = None
+        self._same_order: Optional[Dict] = None  # how to regenerate the layout
 
         self._build_ui()
 
@@ -73,6 +78,13 @@ class ResultsViewFrame(ctk.CTkFrame):
         )
         self.retake_btn.pack(side="left", padx=5)
 
+        self.same_order_btn = ctk.CTkButton(
+            btn_frame,
+            text="Retake Same Order",
+            width=140,
+            command=self._on_retake_same_order,
+        )
+
         # Scrollable question review
         self.review_frame = ctk.CTkScrollableFrame(self)
         self.review_frame.pack(fill="both", expand=True, padx=30, pady=(5, 20))
@@ -82,6 +94,7 @@ class ResultsViewFrame(ctk.CTkFrame):
         attempt_id=None,
         session=None,
         score_data=None,
+        session_id=None,
         **kwargs,
     ) -> None:
         """Show results — from a just-completed test or from history.
@@ -90,19 +103,36 @@ class ResultsViewFrame(ctk.CTkFrame):
             attempt_id: The saved attempt ID.
             session: The TestSession (available if coming from test-taking).
             score_data: Score dict (available if coming from test-taking).
+            session_id: A saved mix session ID (from history).
         """
         # Clear previous review
         for widget in self.review_frame.winfo_children():
             widget.destroy()
+        self._same_order = None
 
         if session and score_data:
             self._show_from_session(session, score_data)
+        elif session_id:
+            self._show_session_from_db(session_id)
         elif attempt_id:
             self._show_from_db(attempt_id)
 
+        if self._same_order is not None:
+            self.same_order_btn.pack(side="left", padx=5)
+        else:
+            self.same_order_btn.pack_forget()
+
     def _show_from_session(self, session, score_data: dict) -> None:
         """Display results from a just-completed session."""
         self._test_id = session.test_id
+        self._remember_layout(
+            session.seed,
+            GENERATOR_VERSION,
+            session.mode,
+            test_id=session.test_id,
+            mix_test_ids=session.source_test_ids,
+            count=session.total_questions,
+        )
 
         # Header
         score = score_data["score"]
@@ -127,6 +157,7 @@ class ResultsViewFrame(ctk.CTkFrame):
             )
             is_correct = response.is_correct if response else None
             was_flagged = question.id in session.flagged
+            similarity = score_data.get("essay_scores", {}).get(question.id)
 
             self._create_review_card(
                 num=i,
@@ -137,6 +168,8 @@ class ResultsViewFrame(ctk.CTkFrame):
                 is_correct=is_correct,
                 was_flagged=was_flagged,
                 options=question.options,
+                similarity=similarity,
+                response=response,
             )
 
         # Per-source-test breakdown for mix tests
@@ -209,6 +242,11 @@ class ResultsViewFrame(ctk.CTkFrame):
             return
 
         self._test_id = attempt.test_id
+        if attempt.session_id is None:
+            self._remember_layout(
+                attempt.seed, attempt.shuffle_version, attempt.mode,
+                test_id=attempt.test_id,
+            )
 
         self.score_label.configure(
             text=f"{attempt.score}/{attempt.total_questions} — {attempt.percentage}%"
@@ -217,20 +255,76 @@ class ResultsViewFrame(ctk.CTkFrame):
         time_str = self._format_time(attempt.time_taken) if attempt.time_taken else "N/A"
         self.details_label.configure(text=f"Time: {time_str}")
 
+        self._add_attempt_review_cards(attempt)
+
+    def _show_session_from_db(self, session_id: int) -> None:
+        """Display a saved mix session: combined score, then every attempt."""
+        session = self.scoring_service.get_session_details(session_id)
+        if not session:
+            self.score_label.configure(text="Results not found.")
+            return
+
+        self._test_id = None
+        self._remember_layout(
+            session.seed, session.shuffle_version, session.mode,
+            mix_test_ids=session.source_test_ids,
+            count=session.total_questions,
+        )
+
+        self.score_label.configure(
+            text=f"{session.score}/{session.total_questions} — {session.percentage}%"
+        )
+        time_str = self._format_time(session.time_taken) if session.time_taken else "N/A"
+        self.details_label.configure(
+            text=f"Time: {time_str}  |  Mix of {len(session.attempts)} test(s)"
+        )
+
+        num = 1
+        for attempt in session.attempts:
+            num = self._add_attempt_review_cards(attempt, num)
+
+        section = ctk.CTkFrame(self.review_frame, corner_radius=8)
+        section.pack(fill="x", pady=(15, 5), padx=5)
+
+        ctk.CTkLabel(
+            section,
+            text="Score by Source Test",
+            font=(FONT_FAMILY, FONT_SIZE_HEADING, "bold"),
+            text_color=COLOR_PRIMARY,
+        ).pack(anchor="w", padx=15, pady=(10, 5))
+
+        for attempt in session.attempts:
+            ctk.CTkLabel(
+                section,
+                text=f"{attempt.test_name}: {attempt.score}/"
+                f"{attempt.total_questions} ({attempt.percentage}%)",
+                font=(FONT_FAMILY, FONT_SIZE_BODY),
+                anchor="w",
+            ).pack(fill="x", padx=25, pady=2)
+
+        ctk.CTkFrame(section, height=8, fg_color="transparent").pack()
+
+    def _add_attempt_review_cards(self, attempt, start_num: int = 1) -> int:
+        """Add review cards for a saved attempt's responses.
+
+        Returns:
+            The number to give the next card.
+        """
         # Load test for question details
         test = self.test_service.get_test_by_id(attempt.test_id)
         if not test:
-            return
+            return start_num
 
         q_map = {q.id: q for q in test.questions}
 
-        for i, response in enumerate(attempt.responses, 1):
+        num = start_num
+        for response in attempt.responses:
             question = q_map.get(response.question_id)
             if not question:
                 continue
 
             self._create_review_card(
-                num=i,
+                num=num,
                 question_text=question.text,
                 question_type=question.type,
                 user_answer=response.user_answer,
@@ -238,7 +332,10 @@ class ResultsViewFrame(ctk.CTkFrame):
                 is_correct=response.is_correct,
                 was_flagged=response.was_flagged,
                 options=question.options,
+                response=response,
             )
+            num += 1
+        return num
 
     def _create_review_card(
         self,
@@ -250,8 +347,14 @@ class ResultsViewFrame(ctk.CTkFrame):
         is_correct: bool,
         was_flagged: bool,
         options=None,
+        similarity: Optional[float] = None,
+        response=None,
     ) -> None:
-        """Create a review card for one question."""
+        """Create a review card for one question.
+
+        Essay cards for saved responses get buttons to set the mark by hand,
+        overriding (or standing in for) auto-grading.
+        """
         card = ctk.CTkFrame(self.review_frame, corner_radius=8)
         card.pack(fill="x", pady=5, padx=5)
 
@@ -268,22 +371,13 @@ class ResultsViewFrame(ctk.CTkFrame):
         ).pack(side="left")
 
         # Status indicator
-        if is_correct is None:
-            status_text = "Essay — Self-evaluate"
-            status_color = "gray"
-        elif is_correct:
-            status_text = "Correct"
-            status_color = COLOR_CORRECT
-        else:
-            status_text = "Incorrect"
-            status_color = COLOR_INCORRECT
-
-        ctk.CTkLabel(
+        status_label = ctk.CTkLabel(
             header_frame,
-            text=status_text,
+            text="",
             font=(FONT_FAMILY, FONT_SIZE_SMALL, "bold"),
-            text_color=status_color,
-        ).pack(side="right")
+        )
+        status_label.pack(side="right")
+        self._set_status(status_label, question_type, is_correct, similarity)
 
         # Question text
         ctk.CTkLabel(
@@ -357,11 +451,106 @@ class ResultsViewFrame(ctk.CTkFrame):
                     anchor="nw",
                 ).pack(fill="x")
 
+            if response is not None and response.attempt_id is not None:
+                override_frame = ctk.CTkFrame(essay_frame, fg_color="transparent")
+                override_frame.pack(fill="x", pady=(5, 0))
+                for text, mark, color in (
+                    ("Mark Correct", True, COLOR_CORRECT),
+                    ("Mark Incorrect", False, COLOR_INCORRECT),
+                ):
+                    ctk.CTkButton(
+                        override_frame,
+                        text=text,
+                        width=110,
+                        height=26,
+                        fg_color=color,
+                        command=lambda m=mark: self._on_override(
+                            response, m, status_label
+                        ),
+                    ).pack(side="left", padx=(0, 5))
+
+    @staticmethod
+    def _set_status(
+        label: ctk.CTkLabel,
+        question_type: str,
+        is_correct: Optional[bool],
+        similarity: Optional[float] = None,
+    ) -> None:
+        """Show a question's mark in its card header."""
+        if is_correct is None:
+            text, color = "Essay — Self-evaluate", "gray"
+        elif is_correct:
+            text, color = "Correct", COLOR_CORRECT
+        else:
+            text, color = "Incorrect", COLOR_INCORRECT
+        if question_type == QUESTION_TYPE_ESSAY and similarity is not None:
+            text += f" ({similarity:.0%} match)"
+        label.configure(text=text, text_color=color)
+
+    def _on_override(self, response, is_correct: bool, status_label) -> None:
+        """Save a manual essay mark and update the card."""
+        self.scoring_service.override_response(
+            response.attempt_id, response.question_id, is_correct
+        )
+        response.is_correct = is_correct
+        self._set_status(status_label, QUESTION_TYPE_ESSAY, is_correct)
+
     def _on_retake(self) -> None:
         """Navigate to retake the same test."""
         if self._test_id:
             self.controller.show_frame(SCREEN_TEST_TAKING, test_id=self._test_id)
 
+    def _remember_layout(
+        self,
+        seed: Optional[int],
+        shuffle_version: Optional[int],
+        mode: str,
+        test_id: Optional[int] = None,
+        mix_test_ids=None,
+        count: int = 0,
+    ) -> None:
+        """Keep what is needed to regenerate this session's exact layout.
+
+        Only sessions shuffled from a seed by the current generator can
+        be regenerated.
+        """
+        if seed is None or shuffle_version != GENERATOR_VERSION:
+            return
+        if test_id is not None:
+            self._same_order = {"seed": seed, "mode": mode, "test_id": test_id}
+        elif mix_test_ids:
+            self._same_order = {
+                "seed": seed,
+                "mode": mode,
+                "mix_test_ids": list(mix_test_ids),
+                "count": count,
+            }
+
+    def _on_retake_same_order(self) -> None:
+        """Retake with the identical question and option order."""
+        layout = self._same_order
+        if layout is None:
+            return
+        if "test_id" in layout:
+            self.controller.show_frame(
+                SCREEN_TEST_TAKING,
+                test_id=layout["test_id"],
+                mode=layout["mode"],
+                seed=layout["seed"],
+            )
+            return
+        questions = self.mix_service.select_questions(
+            layout["mix_test_ids"], layout["count"], seed=layout["seed"]
+        )
+        if questions:
+            self.controller.show_frame(
+                SCREEN_TEST_TAKING,
+                mode=layout["mode"],
+                questions=questions,
+                seed=layout["seed"],
+                mix_test_ids=layout["mix_test_ids"],
+            )
+
     @staticmethod
     def _format_time(seconds: int) -> str:
         """Format seconds to MM:SS or HH:MM:SS."""
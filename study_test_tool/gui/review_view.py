@@ -9,8 +9,10 @@ from config.settings import (
     FONT_SIZE_HEADING,
     FONT_SIZE_SMALL,
     FONT_SIZE_TITLE,
+    REVIEW_DUE_LIMIT,
 )
 from services.review_service import ReviewService
+from services.spaced_repetition_service import SpacedRepetitionService
 from services.test_service import TestService
 from utils.constants import MODE_PRACTICE, SCREEN_HOME, SCREEN_TEST_TAKING
 
@@ -22,6 +24,7 @@ class ReviewViewFrame(ctk.CTkFrame):
         super().__init__(parent)
         self.controller = controller
         self.review_service = ReviewService()
+        self.scheduler = SpacedRepetitionService()
         self.test_service = TestService()
 
         self._missed_data = []
@@ -49,6 +52,22 @@ class ReviewViewFrame(ctk.CTkFrame):
             font=(FONT_FAMILY, FONT_SIZE_TITLE, "bold"),
         ).pack(side="left", padx=20)
 
+        self.study_due_btn = ctk.CTkButton(
+            top_frame,
+            text="Study What's Due",
+            width=140,
+            command=self._on_study_due,
+        )
+        self.study_due_btn.pack(side="right")
+
+        self.due_label = ctk.CTkLabel(
+            top_frame,
+            text="",
+            font=(FONT_FAMILY, FONT_SIZE_SMALL),
+            text_color="gray",
+        )
+        self.due_label.pack(side="right", padx=10)
+
         # Filter row
         filter_frame = ctk.CTkFrame(self, fg_color="transparent")
         filter_frame.pack(fill="x", padx=30, pady=(0, 10))
@@ -129,6 +148,10 @@ class ReviewViewFrame(ctk.CTkFrame):
         self.test_filter_var.set("All Tests")
         self.filter_type_var.set("All Missed")
 
+        due = self.scheduler.count_due()
+        self.due_label.configure(text=f"{due} due for review")
+        self.study_due_btn.configure(state="normal" if due else "disabled")
+
         self._load_questions()
 
     def _on_filter_change(self, value: str) -> None:
@@ -275,3 +298,17 @@ class ReviewViewFrame(ctk.CTkFrame):
             mode=MODE_PRACTICE,
             review_question_ids=selected_ids,
         )
+
+    def _on_study_due(self) -> None:
+        """Start a practice session with the questions due for review."""
+        questions = self.scheduler.get_due_questions(REVIEW_DUE_LIMIT)
+        if not questions:
+            return
+
+        self.controller.show_frame(
+            SCREEN_TEST_TAKING,
+            mode=MODE_PRACTICE,
+            questions=questions,
+            mix_test_name="Due for Review",
+            mix_test_ids=list(dict.fromkeys(q.test_id for q in questions)),
+        )
@@ -1,5 +1,7 @@
 """Test editor screen — create and edit tests with questions."""
 
+import queue
+import threading
 import tkinter.messagebox as messagebox
 
 import customtkinter as ctk
@@ -19,9 +21,13 @@ from config.settings import (
 from models.question import Question, QuestionOption
 from models.test import Test
 from services.question_service import QuestionService
+from services.scoring_service import ScoringService
 from services.test_service import TestService
 from utils.constants import SCREEN_HOME
 
+# How often the Tk thread checks for a finished background rescore (ms)
+RESCORE_POLL_MS = 50
+
 
 class TestEditorFrame(ctk.CTkFrame):
     """Screen for creating and editing tests with their questions."""
@@ -31,9 +37,11 @@ class TestEditorFrame(ctk.CTkFrame):
         self.controller = controller
         self.test_service = TestService()
         self.question_service = QuestionService()
+        self.scoring_service = ScoringService()
 
         self._test_id = None
         self._editing_question_id = None
+        self._editing_question_type = None
         self._clean_snapshot = None
 
         self._build_ui()
@@ -211,6 +219,9 @@ class TestEditorFrame(ctk.CTkFrame):
 
             self.option_entries.append(entry)
 
+        # Stored option id behind each entry while editing, so saves keep ids
+        self._editing_option_ids = [None] * len(self.option_entries)
+
         # Essay answer frame
         self.essay_frame = ctk.CTkFrame(form_scroll, fg_color="transparent")
 
@@ -409,7 +420,11 @@ class TestEditorFrame(ctk.CTkFrame):
                 if opt_text:
                     is_correct = i == correct_idx
                     options.append(
-                        QuestionOption(text=opt_text, is_correct=is_correct)
+                        QuestionOption(
+                            id=self._editing_option_ids[i],
+                            text=opt_text,
+                            is_correct=is_correct,
+                        )
                     )
                     if is_correct:
                         correct_answer = opt_text
@@ -454,7 +469,10 @@ class TestEditorFrame(ctk.CTkFrame):
 
         if self._editing_question_id is not None:
             question.id = self._editing_question_id
-            self.question_service.update_question(question)
+            if self.question_service.update_question(question):
+                self._rescore_in_background(
+                    question.id, question.type != self._editing_question_type
+                )
             self._editing_question_id = None
             self.add_btn.configure(text="Add Question")
             self.cancel_edit_btn.pack_forget()
@@ -464,6 +482,49 @@ class TestEditorFrame(ctk.CTkFrame):
         self._reset_form()
         self._refresh_question_list()
 
+    def _rescore_in_background(self, question_id: int, retyped: bool) -> None:
+        """Re-mark past attempts after an answer key edit, off the UI thread."""
+        retyped_ids = [question_id] if retyped else []
+        outcome: queue.Queue = queue.Queue()
+
+        def run() -> None:
+            try:
+                result = self.scoring_service.rescore_questions(
+                    [question_id], retyped_ids
+                )
+            except Exception as e:
+                outcome.put((None, str(e)))
+                return
+            outcome.put((result, None))
+
+        threading.Thread(target=run, daemon=True).start()
+        self._poll_rescore(outcome)
+
+    def _poll_rescore(self, outcome: queue.Queue) -> None:
+        """Report a background rescore once it finishes (Tk thread only)."""
+        if not self.winfo_exists():
+            return
+        try:
+            result, error = outcome.get_nowait()
+        except queue.Empty:
+            self.after(RESCORE_POLL_MS, lambda: self._poll_rescore(outcome))
+            return
+        if error is not None:
+            messagebox.showerror(
+                "Rescore Error", f"Could not update past scores: {error}"
+            )
+        elif result["attempts_changed"]:
+            self._on_rescore_done(result)
+
+    def _on_rescore_done(self, result: dict) -> None:
+        """Report how much history the answer key edit changed."""
+        count = result["attempts_changed"]
+        messagebox.showinfo(
+            "Scores Updated",
+            f"Re-marked past answers: {count} attempt{'s' if count != 1 else ''} "
+            "had their score updated.",
+        )
+
     def _get_form_snapshot(self) -> tuple:
         """Return a tuple capturing the current state of all form fields."""
         question_text = self.question_text.get("1.0", "end-1c")
@@ -490,6 +551,7 @@ class TestEditorFrame(ctk.CTkFrame):
             ):
                 return
         self._editing_question_id = question.id
+        self._editing_question_type = question.type
         self.form_title.configure(text="Edit Question")
         self.add_btn.configure(text="Update Question")
         self.cancel_edit_btn.pack(pady=5)
@@ -505,10 +567,12 @@ class TestEditorFrame(ctk.CTkFrame):
 
             for i, entry in enumerate(self.option_entries):
                 entry.delete(0, "end")
+                self._editing_option_ids[i] = None
 
             for i, opt in enumerate(question.options):
                 if i < len(self.option_entries):
                     self.option_entries[i].insert(0, opt.text)
+                    self._editing_option_ids[i] = opt.id
                     if opt.is_correct:
                         self.correct_var.set(i)
         else:
@@ -548,6 +612,7 @@ class TestEditorFrame(ctk.CTkFrame):
         self.correct_var.set(0)
         for entry in self.option_entries:
             entry.delete(0, "end")
+        self._editing_option_ids = [None] * len(self.option_entries)
         self.essay_answer.delete("1.0", "end")
         self.category_entry.delete(0, "end")
         self._editing_question_id = None
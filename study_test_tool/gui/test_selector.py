@@ -1,6 +1,5 @@
 """Home screen — test selector with import, create, and test list."""
 
-import json
 import tkinter.filedialog as filedialog
 import tkinter.messagebox as messagebox
 
@@ -9,22 +8,26 @@ import customtkinter as ctk
 from config.settings import (
     COLOR_DANGER,
     COLOR_PRIMARY,
+    COLOR_WARNING,
     FONT_FAMILY,
     FONT_SIZE_BODY,
     FONT_SIZE_HEADING,
     FONT_SIZE_SMALL,
     FONT_SIZE_TITLE,
 )
+from gui.components.import_preview_dialog import ImportPreviewDialog
 from gui.components.mix_test_dialog import MixTestDialog
 from gui.components.mode_dialog import ModeSelectionDialog
 from services.export_service import ExportService
 from services.import_service import ImportService
 from services.mix_service import MixService
-from services.question_service import QuestionService
+from services.randomizer_service import RandomizerService
 from services.test_service import TestService
+from services.validation_service import ValidationService
 from utils.constants import (
     EXPORT_FILE_TYPES,
     IMPORT_FILE_TYPES,
+    MIX_UNIFORM,
     SCREEN_ANALYTICS,
     SCREEN_EDITOR,
     SCREEN_HISTORY,
@@ -40,7 +43,7 @@ class TestSelectorFrame(ctk.CTkFrame):
         super().__init__(parent)
         self.controller = controller
         self.test_service = TestService()
-        self.question_service = QuestionService()
+        self.validation_service = ValidationService()
         self.import_service = ImportService()
         self.export_service = ExportService()
         self.mix_service = MixService()
@@ -188,6 +191,8 @@ class TestSelectorFrame(ctk.CTkFrame):
         self.empty_label.pack_forget()
 
         tests = self._sort_tests(tests)
+        question_counts = self.test_service.get_question_counts()
+        warnings = self.validation_service.validate_library()
 
         if self._sort_by == "Group":
             current_group = None
@@ -203,12 +208,16 @@ class TestSelectorFrame(ctk.CTkFrame):
                         text_color=COLOR_PRIMARY,
                     )
                     header.pack(fill="x", padx=5, pady=(12, 4))
-                self._create_test_card(test)
+                self._create_test_card(
+                    test, question_counts.get(test.id, 0), warnings.get(test.id, [])
+                )
         else:
             for test in tests:
-                self._create_test_card(test)
+                self._create_test_card(
+                    test, question_counts.get(test.id, 0), warnings.get(test.id, [])
+                )
 
-    def _create_test_card(self, test) -> None:
+    def _create_test_card(self, test, q_count: int, warnings) -> None:
         """Create a card widget for a single test."""
         card = ctk.CTkFrame(self.test_list_frame, corner_radius=8)
         card.pack(fill="x", pady=5, padx=5)
@@ -234,7 +243,6 @@ class TestSelectorFrame(ctk.CTkFrame):
         ).pack(fill="x")
 
         # Question count and group
-        q_count = self.test_service.get_question_count(test.id)
         detail_parts = [f"{q_count} question{'s' if q_count != 1 else ''}"]
         if test.group_name:
             detail_parts.append(test.group_name)
@@ -246,6 +254,16 @@ class TestSelectorFrame(ctk.CTkFrame):
             anchor="w",
         ).pack(fill="x")
 
+        if warnings:
+            ctk.CTkLabel(
+                info_frame,
+                text=f"⚠ {len(warnings)} issue{'s' if len(warnings) != 1 else ''}"
+                " to fix",
+                font=(FONT_FAMILY, FONT_SIZE_SMALL, "bold"),
+                text_color=COLOR_WARNING,
+                anchor="w",
+            ).pack(fill="x")
+
         # Action buttons
         btn_frame = ctk.CTkFrame(card, fg_color="transparent")
         btn_frame.pack(side="right", padx=15, pady=10)
@@ -295,17 +313,12 @@ class TestSelectorFrame(ctk.CTkFrame):
         if not file_path:
             return
 
-        try:
-            if file_path.endswith(".json"):
-                test_id = self.import_service.import_from_json(file_path)
-            else:
-                test_id = self.import_service.import_from_text(file_path)
+        dialog = ImportPreviewDialog(
+            self.winfo_toplevel(), self.import_service, file_path
+        )
+        if dialog.get_result() is not None:
             messagebox.showinfo("Success", "Test imported successfully!")
             self._refresh_test_list()
-        except (ValueError, FileNotFoundError, json.JSONDecodeError) as e:
-            messagebox.showerror("Import Error", str(e))
-        except Exception as e:
-            messagebox.showerror("Import Error", f"Unexpected error: {e}")
 
     def _on_new_test(self) -> None:
         """Navigate to editor for a new test."""
@@ -339,12 +352,18 @@ class TestSelectorFrame(ctk.CTkFrame):
             )
             return
 
-        dialog = MixTestDialog(self.winfo_toplevel(), tests_with_counts)
+        dialog = MixTestDialog(
+            self.winfo_toplevel(),
+            tests_with_counts,
+            strata=self.mix_service.stratum_counts(
+                [t.id for t, _ in tests_with_counts]
+            ),
+        )
         result = dialog.get_result()
         if result is None:
             return
 
-        test_ids, count = result
+        test_ids, count, strategy, test_quotas = result
 
         # Show mode selection
         mode_dialog = ModeSelectionDialog(self.winfo_toplevel())
@@ -352,7 +371,14 @@ class TestSelectorFrame(ctk.CTkFrame):
         if mode is None:
             return
 
-        questions = self.mix_service.select_questions(test_ids, count)
+        seed = RandomizerService.new_seed()
+        questions = self.mix_service.select_questions(
+            test_ids, count, seed=seed, strategy=strategy, test_quotas=test_quotas
+        )
+        if strategy != MIX_UNIFORM:
+            # Weighted and balanced picks are not a plain sample, so the
+            # seed alone cannot reproduce this layout later
+            seed = None
         if not questions:
             messagebox.showwarning(
                 "No Questions", "Could not load questions from selected tests."
@@ -369,17 +395,19 @@ class TestSelectorFrame(ctk.CTkFrame):
             mode=mode,
             questions=questions,
             mix_test_name=mix_name,
+            seed=seed,
+            mix_test_ids=test_ids,
+            adaptive=mode_dialog.adaptive,
         )
 
     def _on_take_test(self, test) -> None:
         """Show mode dialog, then navigate to test-taking."""
-        # Check for questions with no correct answer set
-        questions = self.question_service.get_questions_for_test(test.id)
-        missing = [q for q in questions if not q.correct_answer]
-        if missing:
+        # Check for questions with missing or ambiguous answers
+        warnings = self.validation_service.validate_tests([test.id]).get(test.id, [])
+        if warnings:
             proceed = messagebox.askyesno(
                 "Missing Answers",
-                f"{len(missing)} question(s) have no correct answer set. "
+                f"{len(warnings)} problem(s) found with this test's answers. "
                 "Scoring may not work correctly for those questions.\n\n"
                 "Do you want to continue anyway?",
             )
@@ -390,7 +418,12 @@ class TestSelectorFrame(ctk.CTkFrame):
         mode = dialog.get_mode()
         if mode is None:
             return
-        self.controller.show_frame(SCREEN_TEST_TAKING, test_id=test.id, mode=mode)
+        self.controller.show_frame(
+            SCREEN_TEST_TAKING,
+            test_id=test.id,
+            mode=mode,
+            adaptive=dialog.adaptive,
+        )
 
     def _on_edit_test(self, test) -> None:
         """Navigate to editor for an existing test."""
@@ -15,12 +15,18 @@ from config.settings import (
     FONT_SIZE_HEADING,
     FONT_SIZE_SMALL,
     FONT_SIZE_TITLE,
+    ESSAY_AUTO_GRADE,
+    JOURNAL_PATH,
 )
 from gui.components.progress_bar import ProgressBar
 from gui.components.question_widget import QuestionWidget
 from gui.components.timer_widget import TimerWidget
+from services.essay_grader import EssayGrader
 from services.question_service import QuestionService
+from services.randomizer_service import RandomizerService
+from services.rating_service import RatingEngine
 from services.scoring_service import ScoringService
+from services.session_journal import JournalState, SessionJournal
 from services.test_service import TestService
 from services.test_session import TestSession
 from utils.constants import MODE_PRACTICE, MODE_TEST, SCREEN_HOME, SCREEN_RESULTS
@@ -34,7 +40,10 @@ class TestTakingFrame(ctk.CTkFrame):
         self.controller = controller
         self.test_service = TestService()
         self.question_service = QuestionService()
-        self.scoring_service = ScoringService()
+        self.scoring_service = ScoringService(
+            essay_grader=EssayGrader() if ESSAY_AUTO_GRADE else None
+        )
+        self.rating_engine = RatingEngine()
 
         self._session: Optional[TestSession] = None
         self._question_widget: Optional[QuestionWidget] = None
@@ -137,6 +146,10 @@ class TestTakingFrame(ctk.CTkFrame):
         review_question_ids: Optional[List[int]] = None,
         questions: Optional[List] = None,
         mix_test_name: Optional[str] = None,
+        resume: Optional[JournalState] = None,
+        seed: Optional[int] = None,
+        mix_test_ids: Optional[List[int]] = None,
+        adaptive: bool = False,
         **kwargs,
     ) -> None:
         """Initialize the test-taking session.
@@ -147,7 +160,17 @@ class TestTakingFrame(ctk.CTkFrame):
             review_question_ids: Specific question IDs for review sessions.
             questions: Pre-selected questions (for mix tests).
             mix_test_name: Display name for mix tests.
+            resume: Journal state of an interrupted session to restore.
+            seed: Shuffle seed. For a single test, passing a past
+                attempt's seed retakes it in the identical order; a new
+                seed is drawn otherwise. For mix tests, the seed the
+                questions were selected with.
+            mix_test_ids: Tests a mix was drawn from (stored for retakes).
+            adaptive: In practice mode, serve questions matched to the
+                current ability estimate instead of in shuffled order.
         """
+        if resume is not None:
+            mode = resume.mode
         self._mode = mode
 
         # Configure UI for mode
@@ -158,13 +181,30 @@ class TestTakingFrame(ctk.CTkFrame):
             self.check_btn.pack_forget()
             self.finish_btn.configure(text="Finish Test")
 
+        # Interrupted session: same questions, option order, and answers
+        if resume is not None:
+            restored = self._load_journal_questions(resume)
+            if not restored:
+                JOURNAL_PATH.unlink(missing_ok=True)
+                messagebox.showwarning(
+                    "No Questions",
+                    "The questions of the interrupted session no longer exist.",
+                )
+                self.controller.show_frame(SCREEN_HOME)
+                return
+            self._is_mix_test = resume.test_id is None
+            self.test_name_label.configure(text=resume.title)
+            self._session = TestSession.from_journal(resume, restored)
+            self._session.journal = SessionJournal(str(JOURNAL_PATH))
         # Mix test: questions already provided
-        if questions is not None:
+        elif questions is not None:
             self._is_mix_test = True
             self.test_name_label.configure(
                 text=mix_test_name if mix_test_name else "Mix Test"
             )
             self._session = TestSession(None, questions, mode=mode)
+            self._session.seed = seed
+            self._session.source_test_ids = list(mix_test_ids or [])
         elif review_question_ids:
             self._is_mix_test = False
             loaded = self._load_review_questions(review_question_ids)
@@ -190,8 +230,10 @@ class TestTakingFrame(ctk.CTkFrame):
                 self.controller.show_frame(SCREEN_HOME)
                 return
 
+            if seed is None:
+                seed = RandomizerService.new_seed()
             loaded = self.question_service.get_questions_for_test(
-                test_id, randomize=True
+                test_id, randomize=True, seed=seed
             )
             if not loaded:
                 messagebox.showwarning(
@@ -202,8 +244,32 @@ class TestTakingFrame(ctk.CTkFrame):
 
             self.test_name_label.configure(text=test.name)
             self._session = TestSession(test_id, loaded, mode=mode)
+            self._session.seed = seed
 
-        self._session.start()
+        # Practice answers refine difficulty and ability ratings
+        if mode == MODE_PRACTICE:
+            if adaptive and resume is None:
+                self._session.enable_adaptive(self.rating_engine)
+                # Adaptive serving reorders the questions, so the seed
+                # alone cannot reproduce this layout later
+                self._session.seed = None
+            else:
+                self.rating_engine.load(self._session.questions)
+                self._session.ratings = self.rating_engine
+
+        if resume is None:
+            self._session.start()
+            self._session.journal = SessionJournal(
+                str(JOURNAL_PATH),
+                header={
+                    "test_id": self._session.test_id,
+                    "mode": mode,
+                    "title": self.test_name_label.cget("text"),
+                    "questions": self._session.layout(),
+                    "seed": self._session.seed,
+                    "source_test_ids": self._session.source_test_ids,
+                },
+            )
 
         # Rebuild progress bar
         for widget in self.progress_container.winfo_children():
@@ -215,22 +281,49 @@ class TestTakingFrame(ctk.CTkFrame):
             on_click=self._on_progress_click,
         )
         self._progress_bar.pack()
+        self._session.take_dirty_indices()
+        self._refresh_progress(range(self._session.total_questions))
 
-        self.timer_widget.start()
+        self.timer_widget.start(self._session.get_elapsed_time())
         self._display_question()
 
     def _load_review_questions(self, question_ids: List[int]):
         """Load specific questions by ID for review sessions."""
         from database.db_manager import DatabaseManager
 
-        db = DatabaseManager()
+        return DatabaseManager().get_questions_by_ids(question_ids)
+
+    def _load_journal_questions(self, state: JournalState):
+        """Load a journaled session's questions in their original order.
+
+        Options are put back in the order they were shown; questions that
+        have since been deleted are skipped.
+        """
+        question_ids = [question_id for question_id, _ in state.question_order]
+        by_id = {q.id: q for q in self._load_review_questions(question_ids)}
         questions = []
-        for qid in question_ids:
-            q = db.get_question_by_id(qid)
-            if q:
-                questions.append(q)
+        for question_id, option_ids in state.question_order:
+            question = by_id.get(question_id)
+            if question is None:
+                continue
+            rank = {option_id: i for i, option_id in enumerate(option_ids)}
+            question.options.sort(key=lambda o: rank.get(o.id, len(rank)))
+            questions.append(question)
         return questions
 
+    def close_journal(self) -> None:
+        """Flush and close the session journal, keeping it for recovery."""
+        self.rating_engine.flush()
+        if self._session is not None and self._session.journal is not None:
+            self._session.journal.close()
+            self._session.journal = None
+
+    def _discard_journal(self) -> None:
+        """Delete the session journal once the attempt is saved."""
+        if self._session is not None and self._session.journal is not None:
+            self._session.journal.discard()
+            self._session.journal = None
+
     def _display_question(self) -> None:
         """Show the current question."""
         if self._session is None:
@@ -293,17 +386,19 @@ class TestTakingFrame(ctk.CTkFrame):
         self._session.save_response(question.id, answer if answer else "")
 
     def _update_progress_bar(self) -> None:
-        """Update progress bar colors."""
+        """Recolor the progress bar buttons whose state changed."""
         if self._progress_bar is None or self._session is None:
             return
+        self._refresh_progress(self._session.take_dirty_indices())
 
-        question_ids = [q.id for q in self._session.questions]
-        answered_ids = set(self._session.responses.keys())
-        self._progress_bar.update_status(
+    def _refresh_progress(self, indices) -> None:
+        """Recolor the given progress bar buttons from the session state."""
+        state = self._session.state
+        self._progress_bar.update_indices(
+            indices,
             self._session.current_index,
-            answered_ids,
-            self._session.flagged,
-            question_ids,
+            lambda i: i in state.answered,
+            lambda i: i in state.flagged,
         )
 
     def _on_check_answer(self) -> None:
@@ -430,11 +525,13 @@ class TestTakingFrame(ctk.CTkFrame):
         self._session.finish_test()
 
         score_data = self.scoring_service.score_test(self._session)
+        self.rating_engine.flush()
 
         if self._is_mix_test:
             self.scoring_service.save_mixed_attempt(
                 score_data, self._session.questions, mode=self._mode
             )
+            self._discard_journal()
             self.controller.show_frame(
                 SCREEN_RESULTS,
                 attempt_id=None,
@@ -445,6 +542,7 @@ class TestTakingFrame(ctk.CTkFrame):
             attempt_id = self.scoring_service.save_attempt(
                 self._session.test_id, score_data, mode=self._mode
             )
+            self._discard_journal()
             self.controller.show_frame(
                 SCREEN_RESULTS,
                 attempt_id=attempt_id,
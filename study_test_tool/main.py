@@ -1,5 +1,6 @@
 """Entry point for the Study Testing Tool application."""
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -7,16 +8,38 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from config.database import initialize_database
-from config.settings import ensure_directories
+from config.settings import APP_NAME, ensure_directories
 from database.migrations import run_migrations
-from gui.main_window import App
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument(
+        "--merge",
+        metavar="DB_PATH",
+        help="merge another study_tool.db into the local database and exit",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
     """Initialize and launch the application."""
+    args = _parse_args()
     ensure_directories()
     initialize_database()
     run_migrations()
+
+    if args.merge:
+        from services.merge_service import MergeService
+
+        counts = MergeService().merge_database(args.merge)
+        for key, value in counts.items():
+            print(f"{key.replace('_', ' ')}: {value}")
+        return
+
+    from gui.main_window import App
+
     app = App()
     app.mainloop()
 
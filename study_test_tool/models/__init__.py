@@ -1,5 +1,6 @@
 """Data models for Study Testing Tool."""
 
 from models.question import Question, QuestionOption
+from models.review_card import ReviewCard
 from models.test import Test
 from models.test_result import QuestionResponse, TestAttempt
@@ -0,0 +1,17 @@
+"""Review card data model."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ReviewCard:
+    """Spaced-repetition state of one question."""
+
+    question_id: int
+    ease: float = 2.5
+    interval_days: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    due_at: float = 0.0  # unix seconds
+    last_reviewed: Optional[float] = None
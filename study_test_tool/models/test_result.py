@@ -30,4 +30,25 @@ class TestAttempt:
     completed_at: Optional[str] = None
     id: Optional[int] = None
     test_name: Optional[str] = None  # populated via JOIN for display
+    session_id: Optional[int] = None  # set when part of a mix session
+    timeline: Optional[bytes] = None  # packed utils.timeline.Timeline
+    seed: Optional[int] = None  # shuffle seed; None if not randomized
+    shuffle_version: Optional[int] = None  # RandomizerService.GENERATOR_VERSION
     responses: List[QuestionResponse] = field(default_factory=list)
+
+
+@dataclass
+class StudySession:
+    """A mix test sitting that links one attempt per source test."""
+
+    score: int = 0
+    total_questions: int = 0
+    percentage: float = 0.0
+    time_taken: Optional[int] = None  # seconds
+    mode: str = "test"
+    completed_at: Optional[str] = None
+    id: Optional[int] = None
+    seed: Optional[int] = None  # selection/shuffle seed
+    shuffle_version: Optional[int] = None  # RandomizerService.GENERATOR_VERSION
+    source_test_ids: List[int] = field(default_factory=list)  # tests drawn from
+    attempts: List[TestAttempt] = field(default_factory=list)
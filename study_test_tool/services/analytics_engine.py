@@ -0,0 +1,464 @@
+"""In-memory analytics over column arrays of the attempt and response history."""
+
+import math
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from database.db_manager import DatabaseManager
+from services.learning_curves import CurveStats
+
+
+class _Column:
+    """A growable NumPy column; appends reallocate only when capacity runs out."""
+
+    def __init__(self, dtype) -> None:
+        self._data = np.empty(0, dtype=dtype)
+        self._size = 0
+
+    def append(self, values) -> None:
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, 2 * len(self._data), 64), dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : end] = values
+        self._size = end
+
+    @property
+    def values(self) -> np.ndarray:
+        """The filled part of the column (a view, not a copy)."""
+        return self._data[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _Encoding:
+    """Dictionary encoding of values (category names, modes) as small ints."""
+
+    def __init__(self) -> None:
+        self.codes: Dict = {}
+        self.values: List = []
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class AnalyticsEngine:
+    """Computes the analytics dashboards from history held in NumPy arrays.
+
+    Questions, attempts and responses are loaded once into column arrays,
+    with tests, categories and modes dictionary-encoded as ints. Each
+    dashboard is then a mask plus a vectorised group-by (``bincount``,
+    ``np.add.reduceat``) instead of an SQL aggregation.
+
+    ``refresh`` keeps the arrays current: rows added since the last load
+    are appended, and any other change (an edit, a rescore, a delete)
+    seen through the change_seq counters triggers a full reload.
+    """
+
+    def __init__(self, db: DatabaseManager) -> None:
+        self._db = db
+        self._loaded = False
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all loaded history."""
+        self._change_seq = -1
+        self._test_names: Dict[int, str] = {}
+        self._categories = _Encoding()
+        self._modes = _Encoding()
+        # Questions (sorted by id)
+        self._q_id = _Column(np.int64)
+        self._q_test = _Column(np.int32)
+        self._q_category = _Column(np.int32)
+        # Attempts (sorted by id)
+        self._a_id = _Column(np.int64)
+        self._a_test = _Column(np.int64)
+        self._a_mode = _Column(np.int16)
+        self._a_pct = _Column(np.float64)
+        self._a_ts = _Column(np.int64)
+        self._a_completed: List[str] = []
+        self._chronological: Optional[np.ndarray] = None
+        # Responses (sorted by id). ``cell`` packs the question's category
+        # and the outcome as category * 3 + (ungraded 0, wrong 1, right 2),
+        # so one bincount tallies every category at once.
+        self._r_id = _Column(np.int64)
+        self._r_attempt = _Column(np.int64)  # row in the attempt columns
+        self._r_question = _Column(np.int32)  # row in the question columns
+        self._r_test = _Column(np.int32)  # the question's test
+        self._r_cell = _Column(np.int32)
+        self._r_time = _Column(np.int32)  # seconds, -1 if not recorded
+        # Learning curves, grouped by test id and by category code, and
+        # how many attempt/response rows have been folded into them
+        self._test_curves = CurveStats()
+        self._category_curves = CurveStats()
+        self._curve_attempts = 0
+        self._curve_responses = 0
+        self._curve_last_ts = 0
+
+    # ── Loading ───────────────────────────────────────────────
+
+    def refresh(self) -> None:
+        """Bring the arrays up to date with the database."""
+        if self._loaded:
+            if self._db.get_change_cursor() == self._change_seq:
+                return
+            if self._db.has_history_rewrites(
+                self._change_seq,
+                self._last(self._q_id),
+                self._last(self._a_id),
+                self._last(self._r_id),
+            ):
+                self._reset()
+        self._append(
+            self._db.get_analytics_snapshot(
+                self._last(self._q_id), self._last(self._a_id), self._last(self._r_id)
+            )
+        )
+        self._loaded = True
+
+    @staticmethod
+    def _last(column: _Column) -> int:
+        """Largest id loaded into a column, or 0."""
+        return int(column.values[-1]) if len(column) else 0
+
+    def _append(self, snapshot: Dict) -> None:
+        """Add the rows of a snapshot to the arrays."""
+        self._change_seq = snapshot["change_seq"]
+        self._test_names = dict(snapshot["tests"])
+
+        questions = snapshot["questions"]
+        if questions:
+            q_id, q_test, q_category = zip(*questions)
+            self._q_id.append(q_id)
+            self._q_test.append(q_test)
+            self._q_category.append([self._categories.encode(c) for c in q_category])
+
+        attempts = snapshot["attempts"]
+        if attempts:
+            a_id, a_test, a_mode, a_pct, a_completed, a_ts = zip(*attempts)
+            self._a_id.append(a_id)
+            self._a_test.append(a_test)
+            self._a_mode.append([self._modes.encode(m) for m in a_mode])
+            self._a_pct.append(a_pct)
+            self._a_ts.append(a_ts)
+            self._a_completed.extend(a_completed)
+            self._chronological = None
+
+        responses = snapshot["responses"]
+        if responses:
+            rows = np.array(responses, dtype=np.int64)
+            question_rows = np.searchsorted(self._q_id.values, rows[:, 2])
+            self._r_id.append(rows[:, 0])
+            self._r_attempt.append(np.searchsorted(self._a_id.values, rows[:, 1]))
+            self._r_question.append(question_rows)
+            self._r_test.append(self._q_test.values[question_rows])
+            self._r_cell.append(
+                self._q_category.values[question_rows].astype(np.int64) * 3
+                + rows[:, 3]
+                + 1
+            )
+            self._r_time.append(rows[:, 4])
+
+    def _chronological_rows(self) -> np.ndarray:
+        """Attempt rows ordered by completion time, then id."""
+        if self._chronological is None:
+            self._chronological = np.lexsort((self._a_id.values, self._a_ts.values))
+        return self._chronological
+
+    # ── Dashboards ────────────────────────────────────────────
+
+    def scores_over_time(
+        self, test_id: Optional[int] = None, mode: str = "test"
+    ) -> List[Dict]:
+        """Chronological scores, as AnalyticsService.get_scores_over_time."""
+        mode_code = self._modes.codes.get(mode)
+        if mode_code is None:
+            return []
+        rows = self._chronological_rows()
+        mask = self._a_mode.values[rows] == mode_code
+        if test_id is not None:
+            mask &= self._a_test.values[rows] == test_id
+        rows = rows[mask]
+        ids = self._a_id.values[rows].tolist()
+        pcts = self._a_pct.values[rows].tolist()
+        tests = self._a_test.values[rows].tolist()
+        return [
+            {
+                "id": attempt_id,
+                "percentage": pct,
+                "completed_at": self._a_completed[row],
+                "test_name": self._test_names.get(test, ""),
+            }
+            for attempt_id, pct, test, row in zip(ids, pcts, tests, rows.tolist())
+        ]
+
+    def average_scores_by_test(self, mode: str = "test") -> List[Dict]:
+        """Average/best/count per test, sorted by test name."""
+        mode_code = self._modes.codes.get(mode)
+        if mode_code is None:
+            return []
+        mask = self._a_mode.values == mode_code
+        tests = self._a_test.values[mask]
+        if not len(tests):
+            return []
+        order = np.argsort(tests, kind="stable")
+        tests, pcts = tests[order], self._a_pct.values[mask][order]
+        starts = np.flatnonzero(np.r_[True, tests[1:] != tests[:-1]])
+        sums = np.add.reduceat(pcts, starts)
+        best = np.maximum.reduceat(pcts, starts)
+        counts = np.diff(np.r_[starts, len(tests)])
+
+        result = [
+            {
+                "test_name": self._test_names.get(test, ""),
+                "avg_score": round(total / count, 1),
+                "best_score": round(top, 1),
+                "attempt_count": count,
+            }
+            for test, total, top, count in zip(
+                tests[starts].tolist(), sums.tolist(), best.tolist(), counts.tolist()
+            )
+        ]
+        result.sort(key=lambda r: r["test_name"])
+        return result
+
+    def attempt_frequency(
+        self, days: int = 30, today: Optional[date] = None
+    ) -> List[Dict]:
+        """Daily attempt counts since ``days`` days before today, by local day."""
+        today = today or date.today()
+        start = datetime.combine(today - timedelta(days=days), time()).timestamp()
+        ts = self._a_ts.values
+        # The local day depends on the UTC offset at each moment, so only
+        # the attempts inside the window are converted one by one
+        counts = Counter(date.fromtimestamp(t) for t in ts[ts >= start].tolist())
+        return [
+            {"day": day.isoformat(), "count": count}
+            for day, count in sorted(counts.items())
+        ]
+
+    def category_performance(self, test_id: Optional[int] = None) -> List[Dict]:
+        """Correct/total/percentage per category, sorted by category."""
+        cells = self._r_cell.values
+        if test_id is not None:
+            cells = cells[self._r_test.values == test_id]
+        size = len(self._categories.values)
+        tally = np.bincount(cells, minlength=3 * size).reshape(-1, 3)
+        rights = tally[:, 2]
+        totals = tally[:, 1] + rights
+        blank = self._categories.codes.get("")
+        if blank is not None:
+            totals[blank] = 0
+
+        result = [
+            {
+                "category": self._categories.values[code],
+                "total": int(totals[code]),
+                "correct": int(rights[code]),
+                "percentage": round(int(rights[code]) / int(totals[code]) * 100, 1),
+            }
+            for code in np.flatnonzero(totals).tolist()
+        ]
+        result.sort(key=lambda r: r["category"])
+        return result
+
+    def response_times(self, test_id: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Answer-time percentiles and accuracy per question and per category.
+
+        Only responses with a recorded time_spent count. Percentiles
+        interpolate linearly between ranks, as ``np.percentile`` does.
+
+        Returns:
+            Dict with ``questions`` (question_id, category, ...) and
+            ``categories`` (category, ...) lists, each row also holding
+            answers, p50, p90 (seconds), graded and correct.
+        """
+        times = self._r_time.values
+        mask = times >= 0
+        if test_id is not None:
+            mask &= self._r_test.values == test_id
+        times = times[mask]
+        rows = self._r_question.values[mask]
+        cells = self._r_cell.values[mask]
+        outcomes = cells % 3
+
+        rows, q_stats = _time_summary(rows, rows * 3 + outcomes, times, len(self._q_id))
+        q_categories = self._q_category.values[rows].tolist()
+        questions = [
+            {
+                "question_id": question_id,
+                "category": self._categories.values[category],
+                **stats,
+            }
+            for question_id, category, stats in zip(
+                self._q_id.values[rows].tolist(), q_categories, q_stats
+            )
+        ]
+        codes, c_stats = _time_summary(
+            cells // 3, cells, times, len(self._categories.values)
+        )
+        by_category = [
+            {"category": self._categories.values[code], **stats}
+            for code, stats in zip(codes.tolist(), c_stats)
+        ]
+        by_category.sort(key=lambda r: r["category"])
+        return {"questions": questions, "categories": by_category}
+
+    # ── Learning curves ───────────────────────────────────────
+
+    def _update_curves(self) -> None:
+        """Fold attempts loaded since the last call into the curve sums.
+
+        Attempts are added in completion order. If a new attempt predates
+        one already folded in, or new responses belong to an old attempt,
+        the sums are rebuilt from the whole history instead.
+        """
+        start, end = self._curve_attempts, len(self._a_id)
+        r_start, r_end = self._curve_responses, len(self._r_id)
+        if start == end and r_start == r_end:
+            return
+        ts = self._a_ts.values
+        if start and (
+            (end > start and ts[start:].min() < self._curve_last_ts)
+            or (self._r_attempt.values[r_start:] < start).any()
+        ):
+            self._test_curves = CurveStats()
+            self._category_curves = CurveStats()
+            start = r_start = 0
+
+        rows = _chronological(np.arange(start, end), ts, self._a_id.values)
+        self._test_curves.add(
+            self._a_test.values[rows], self._a_pct.values[rows], ts[rows]
+        )
+
+        # One observation per (attempt, category): the share of its graded
+        # answers in that category that were correct. Sorting the packed
+        # key (attempt, category, correct) groups them without an argsort.
+        size = len(self._categories.values)
+        cells = self._r_cell.values[r_start:]
+        graded = cells % 3 > 0
+        blank = self._categories.codes.get("")
+        if blank is not None:
+            graded &= cells // 3 != blank
+        cells = cells[graded]
+        packed = np.sort(
+            (self._r_attempt.values[r_start:][graded] * size + cells // 3) * 2
+            + (cells % 3 == 2)
+        )
+        keys = packed >> 1
+        if len(keys):
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            right = np.add.reduceat(packed & 1, starts)
+            scores = right / np.diff(np.r_[starts, len(keys)]) * 100
+            attempts, categories = keys[starts] // size, keys[starts] % size
+            order = _chronological(np.arange(len(starts)), ts[attempts], attempts)
+            self._category_curves.add(
+                categories[order], scores[order], ts[attempts][order]
+            )
+
+        self._curve_attempts, self._curve_responses = end, r_end
+        if end:
+            self._curve_last_ts = max(self._curve_last_ts, int(ts[start:end].max()))
+
+    def readiness(self, at_ts: float) -> Dict[str, List[Dict]]:
+        """Learning-curve forecasts for every test and category at a moment.
+
+        Returns:
+            Dict with ``tests`` (test_id, test_name, ...) and ``categories``
+            (category, ...) lists, each row also holding attempts,
+            projected, lower, upper, next_attempt and learning_rate (None
+            where a curve has too few points), sorted by name.
+        """
+        self._update_curves()
+        tests = [
+            {"test_id": group, "test_name": self._test_names[group], **forecast}
+            for group, forecast in _forecast_rows(self._test_curves, at_ts)
+            if group in self._test_names
+        ]
+        tests.sort(key=lambda r: r["test_name"])
+        by_category = [
+            {"category": self._categories.values[group], **forecast}
+            for group, forecast in _forecast_rows(self._category_curves, at_ts)
+        ]
+        by_category.sort(key=lambda r: r["category"])
+        return {"tests": tests, "categories": by_category}
+
+
+def _chronological(rows: np.ndarray, ts: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """``rows`` ordered by (ts, id); usually already in order, so checked first."""
+    row_ts = ts[rows]
+    if np.all(row_ts[1:] >= row_ts[:-1]):
+        return rows
+    return rows[np.lexsort((ids[rows], row_ts))]
+
+
+def _forecast_rows(curves: CurveStats, at_ts: float) -> List:
+    """(group, forecast dict) for every group with observations."""
+    present = np.flatnonzero(curves.count)
+    forecast = curves.forecast(at_ts)
+    columns = {}
+    for key, values in forecast.items():
+        rounded = np.round(values[present], 3 if key == "learning_rate" else 1)
+        columns[key] = [None if math.isnan(v) else v for v in rounded.tolist()]
+    return [
+        (group, {"attempts": attempts, **{key: col[i] for key, col in columns.items()}})
+        for i, (group, attempts) in enumerate(
+            zip(present.tolist(), curves.count[present].tolist())
+        )
+    ]
+
+
+def _time_summary(
+    groups: np.ndarray, cells: np.ndarray, times: np.ndarray, size: int
+) -> Tuple[np.ndarray, List[Dict]]:
+    """Answer-time stats for every group with at least one timed answer.
+
+    ``cells`` is ``group * 3 + outcome`` (ungraded 0, wrong 1, right 2),
+    so one bincount gives the answer and outcome counts. One sort of the
+    packed key ``group * base + time`` orders the times within every
+    group at once; each percentile is then an index into that sorted run.
+
+    Returns:
+        The present group codes and, in the same order, dicts with
+        answers, p50, p90, graded and correct.
+    """
+    if not len(times):
+        return np.empty(0, dtype=np.int64), []
+    base = int(times.max()) + 1
+    key_type = np.int32 if size * base < 2**31 else np.int64
+    ordered = np.sort(groups.astype(key_type) * base + times)
+    tally = np.bincount(cells, minlength=3 * size).reshape(-1, 3)
+    counts = tally.sum(axis=1)
+
+    present = np.flatnonzero(counts)
+    last = counts[present] - 1
+    start = (np.cumsum(counts) - counts)[present]
+    percentiles = []
+    for q in (0.5, 0.9):
+        position = q * last
+        low = np.floor(position).astype(np.int64)
+        below = ordered[start + low] % base
+        above = ordered[start + np.minimum(low + 1, last)] % base
+        percentiles.append(np.round(below + (above - below) * (position - low), 1))
+
+    wrong, right = tally[present, 1], tally[present, 2]
+    return present, [
+        {"answers": n, "p50": p50, "p90": p90, "graded": g, "correct": c}
+        for n, p50, p90, g, c in zip(
+            counts[present].tolist(),
+            percentiles[0].tolist(),
+            percentiles[1].tolist(),
+            (wrong + right).tolist(),
+            right.tolist(),
+        )
+    ]
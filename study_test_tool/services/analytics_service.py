@@ -1,15 +1,63 @@
 """Analytics service for performance tracking and visualization data."""
 
-from typing import Dict, List, Optional
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
 
+from config.settings import ANALYTICS_CACHE_SIZE
 from database.db_manager import DatabaseManager
+from services.analytics_engine import AnalyticsEngine
+from utils.result_cache import ResultCache
+from utils.timeline import merge_durations
+
+# A question is flagged when its median answer time is this far from its
+# category's median, once it has enough graded answers
+SLOW_TIME_FACTOR = 1.5
+FAST_TIME_FACTOR = 0.5
+TIME_FLAG_MIN_ANSWERS = 3
+FLAG_SLOW_CORRECT = "slow_correct"
+FLAG_FAST_WRONG = "fast_wrong"
+
+# Heatmap rows run Monday to Sunday; SQLite numbers weekdays from Sunday
+WEEKDAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+# Fewest attempts for an hour slot to be named the best or worst time
+HEATMAP_MIN_ATTEMPTS = 3
 
 
 class AnalyticsService:
-    """Business logic for analytics, graphs, and weak topic identification."""
+    """Business logic for analytics, graphs, and weak topic identification.
+
+    Dashboards are computed by an AnalyticsEngine holding the history in
+    memory; each call first appends whatever was saved since the last one.
+    Results are memoised until the database's change token moves, so
+    repeating a query between writes costs one PRAGMA read.
+    """
 
     def __init__(self, db_path: Optional[str] = None) -> None:
         self._db = DatabaseManager(db_path)
+        self._engine = AnalyticsEngine(self._db)
+        self._cache = ResultCache(ANALYTICS_CACHE_SIZE)
+
+    def _cached(self, key: tuple, compute: Callable):
+        """Return a cached result for ``key``, computing it if stale."""
+        return self._cache.get(key, self._db.get_change_token(), compute)
+
+    def close(self) -> None:
+        """Release the database connection held for change detection.
+
+        Cached results are dropped too: a reopened connection restarts
+        its data_version, so old tokens could match again.
+        """
+        self._db.close()
+        self._cache.clear()
+
+    def cache_stats(self) -> Dict:
+        """Return hit/miss counts, hit rate and size of the result cache."""
+        return self._cache.stats()
+
+    def _current_engine(self) -> AnalyticsEngine:
+        """The engine, refreshed against the database."""
+        self._engine.refresh()
+        return self._engine
 
     def get_scores_over_time(
         self,
@@ -25,7 +73,10 @@ class AnalyticsService:
         Returns:
             List of dicts with id, percentage, completed_at, test_name.
         """
-        return self._db.get_scores_over_time(test_id, mode)
+        return self._cached(
+            ("scores_over_time", test_id, mode),
+            lambda: self._current_engine().scores_over_time(test_id, mode),
+        )
 
     def get_average_scores_by_test(self, mode: str = "test") -> List[Dict]:
         """Get average/best/count per test for bar chart.
@@ -36,10 +87,13 @@ class AnalyticsService:
         Returns:
             List of dicts with test_name, avg_score, best_score, attempt_count.
         """
-        return self._db.get_average_scores_by_test(mode)
+        return self._cached(
+            ("average_scores_by_test", mode),
+            lambda: self._current_engine().average_scores_by_test(mode),
+        )
 
     def get_attempt_frequency(self, days: int = 30) -> List[Dict]:
-        """Get daily attempt counts for activity chart.
+        """Get daily attempt counts for activity chart, by local day.
 
         Args:
             days: Number of days to look back.
@@ -47,7 +101,13 @@ class AnalyticsService:
         Returns:
             List of dicts with day and count.
         """
-        return self._db.get_attempt_frequency(days)
+        # The window ends today (local time, like the heatmap), so a new
+        # day is a new key
+        today = date.today()
+        return self._cached(
+            ("attempt_frequency", days, today),
+            lambda: self._current_engine().attempt_frequency(days, today),
+        )
 
     def get_category_performance(
         self, test_id: Optional[int] = None
@@ -60,7 +120,169 @@ class AnalyticsService:
         Returns:
             List of dicts with category, total, correct, percentage.
         """
-        return self._db.get_category_performance(test_id)
+        return self._cached(
+            ("category_performance", test_id),
+            lambda: self._current_engine().category_performance(test_id),
+        )
+
+    def get_time_per_question(
+        self, test_id: Optional[int] = None, mode: Optional[str] = None
+    ) -> Dict[int, Dict]:
+        """Get millisecond-accurate viewing time per question.
+
+        Durations come from the packed event timelines stored with each
+        attempt, so no per-event rows are read.
+
+        Args:
+            test_id: Optional filter by test.
+            mode: Optional filter by mode.
+
+        Returns:
+            Dict of question_id → dict with views, total_ms, avg_ms.
+        """
+        return self._cached(
+            ("time_per_question", test_id, mode),
+            lambda: self._compute_time_per_question(test_id, mode),
+        )
+
+    def _compute_time_per_question(
+        self, test_id: Optional[int], mode: Optional[str]
+    ) -> Dict[int, Dict]:
+        durations = merge_durations(self._db.get_attempt_timelines(test_id, mode))
+        return {
+            question_id: {
+                "views": len(values),
+                "total_ms": sum(values),
+                "avg_ms": round(sum(values) / len(values)),
+            }
+            for question_id, values in durations.items()
+        }
+
+    def get_response_times(
+        self, test_id: Optional[int] = None, threshold: float = 70.0
+    ) -> Dict[str, List[Dict]]:
+        """Get answer-time percentiles and accuracy from saved time_spent.
+
+        Questions whose median time is well above their category's median
+        while mostly answered correctly are flagged "slow_correct" (known,
+        but not yet fluent); those well below it while mostly missed are
+        flagged "fast_wrong" (likely rushed or guessed).
+
+        Args:
+            test_id: Optional filter by test.
+            threshold: Accuracy (%) at or above which a question counts as
+                mostly correct; below 50% it counts as mostly missed.
+
+        Returns:
+            Dict with ``questions`` and ``categories`` lists. Each row has
+            answers, p50 and p90 (seconds), graded, correct and accuracy
+            (percentage, None if nothing was graded); question rows also
+            have question_id, category and flag (None if unflagged).
+        """
+        times = self._cached(
+            ("response_times", test_id),
+            lambda: self._current_engine().response_times(test_id),
+        )
+        categories = [
+            {**row, "accuracy": _accuracy(row)} for row in times["categories"]
+        ]
+        category_p50 = {row["category"]: row["p50"] for row in categories}
+        questions = []
+        for row in times["questions"]:
+            accuracy = _accuracy(row)
+            median = category_p50[row["category"]]
+            flag = None
+            # A zero median would make every question "slow"
+            if row["graded"] >= TIME_FLAG_MIN_ANSWERS and median > 0:
+                if accuracy >= threshold and row["p50"] >= SLOW_TIME_FACTOR * median:
+                    flag = FLAG_SLOW_CORRECT
+                elif accuracy < 50.0 and row["p50"] <= FAST_TIME_FACTOR * median:
+                    flag = FLAG_FAST_WRONG
+            questions.append({**row, "accuracy": accuracy, "flag": flag})
+        return {"questions": questions, "categories": categories}
+
+    def get_study_heatmap(
+        self, test_id: Optional[int] = None, mode: Optional[str] = None
+    ) -> Dict:
+        """Get attempt volume and accuracy by local day of week and hour.
+
+        Built from the pre-aggregated hour-of-week buckets, so the cost
+        does not grow with history.
+
+        Args:
+            test_id: Optional filter by test.
+            mode: Optional filter by mode.
+
+        Returns:
+            Dict with ``attempts`` and ``accuracy`` as 7×24 grids (rows
+            Monday first, as WEEKDAY_LABELS; accuracy None where nothing
+            was answered), and ``best``/``worst`` dicts (day, hour,
+            accuracy, attempts) for the slots with at least
+            HEATMAP_MIN_ATTEMPTS attempts, or None.
+        """
+        return self._cached(
+            ("study_heatmap", test_id, mode),
+            lambda: self._compute_study_heatmap(test_id, mode),
+        )
+
+    def _compute_study_heatmap(
+        self, test_id: Optional[int], mode: Optional[str]
+    ) -> Dict:
+        attempts = [[0] * 24 for _ in WEEKDAY_LABELS]
+        accuracy: List[List[Optional[float]]] = [[None] * 24 for _ in WEEKDAY_LABELS]
+        slots = []
+        for weekday, hour, count, questions, correct in (
+            self._db.get_hour_of_week_buckets(test_id, mode)
+        ):
+            row = (weekday + 6) % 7
+            attempts[row][hour] = count
+            if questions:
+                pct = round(correct / questions * 100, 1)
+                accuracy[row][hour] = pct
+                if count >= HEATMAP_MIN_ATTEMPTS:
+                    slots.append(
+                        {
+                            "day": WEEKDAY_LABELS[row],
+                            "hour": hour,
+                            "accuracy": pct,
+                            "attempts": count,
+                        }
+                    )
+        ranked = sorted(slots, key=lambda slot: slot["accuracy"])
+        return {
+            "attempts": attempts,
+            "accuracy": accuracy,
+            "best": ranked[-1] if ranked else None,
+            "worst": ranked[0] if ranked else None,
+        }
+
+    def get_readiness_forecast(
+        self, on: Optional[date] = None
+    ) -> Dict[str, List[Dict]]:
+        """Project scores per test and per category on a given date.
+
+        Each test and category has a power-law learning curve (error rate
+        against attempt number and against days since its first attempt),
+        kept as running least-squares sums that new attempts update in
+        place; all curves are refitted together in one vectorised pass.
+
+        Args:
+            on: Date to project to (local noon); defaults to today.
+
+        Returns:
+            Dict with ``tests`` (test_id, test_name, ...) and ``categories``
+            (category, ...) lists. Each row has attempts, projected, lower
+            and upper (95% prediction band), next_attempt (projected score
+            of the next attempt) and learning_rate (power-law exponent);
+            these are None until a curve has three attempts spread over
+            time.
+        """
+        on = on or date.today()
+        at_ts = datetime(on.year, on.month, on.day, 12).timestamp()
+        return self._cached(
+            ("readiness", on),
+            lambda: self._current_engine().readiness(at_ts),
+        )
 
     def get_weak_topics(
         self,
@@ -78,7 +300,7 @@ class AnalyticsService:
             Status is "weak" (<threshold), "moderate" (threshold-85%), or
             "strong" (>85%).
         """
-        categories = self._db.get_category_performance(test_id)
+        categories = self.get_category_performance(test_id)
         result = []
         for cat in categories:
             pct = cat["percentage"]
@@ -90,3 +312,10 @@ class AnalyticsService:
                 status = "strong"
             result.append({**cat, "status": status})
         return result
+
+
+def _accuracy(row: Dict) -> Optional[float]:
+    """Percentage of a stats row's graded answers that were correct."""
+    if not row["graded"]:
+        return None
+    return round(row["correct"] / row["graded"] * 100, 1)
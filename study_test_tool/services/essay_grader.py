@@ -0,0 +1,224 @@
+"""Essay grader — TF-IDF cosine similarity against the expected answer."""
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import (
+    ESSAY_MODEL_DIR,
+    ESSAY_SIMILARITY_THRESHOLD,
+    QUESTION_TYPE_ESSAY,
+)
+from database.db_manager import DatabaseManager
+from models.question import Question
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-case word tokens of a text."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class EssayModel:
+    """TF-IDF vectors of one test's expected essay answers.
+
+    ``references`` has one L2-normalised row per question in
+    ``question_ids``; columns follow ``vocabulary``.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        question_ids: np.ndarray,
+        vocabulary: List[str],
+        idf: np.ndarray,
+        references: np.ndarray,
+    ) -> None:
+        self.key = key
+        self.question_ids = question_ids
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.references = references
+        self.term_index: Dict[str, int] = {t: i for i, t in enumerate(vocabulary)}
+        self.row_index: Dict[int, int] = {
+            int(qid): i for i, qid in enumerate(question_ids)
+        }
+        # Weight for words no expected answer uses (df = 0)
+        self.unseen_idf = float(np.log(1 + len(question_ids)) + 1)
+
+    @classmethod
+    def build(cls, key: str, references: Sequence) -> "EssayModel":
+        """Fit vocabulary and IDF weights on (question_id, answer) pairs."""
+        docs = [tokenize(text) for _, text in references]
+        vocabulary = sorted({token for doc in docs for token in doc})
+        model = cls(
+            key,
+            np.array([qid for qid, _ in references], dtype=np.int64),
+            vocabulary,
+            np.zeros(len(vocabulary)),
+            np.zeros((len(references), len(vocabulary))),
+        )
+        counts = model._count_matrix(docs)
+        df = np.count_nonzero(counts, axis=0)
+        model.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        weighted = counts * model.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        model.references = np.divide(
+            weighted, norms, out=np.zeros_like(weighted), where=norms > 0
+        )
+        return model
+
+    def _count_matrix(self, docs: List[List[str]]):
+        """Term counts of tokenised documents, one row per document."""
+        rows, cols = [], []
+        for row, doc in enumerate(docs):
+            for token in doc:
+                col = self.term_index.get(token)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        counts = np.zeros((len(docs), len(self.vocabulary)))
+        np.add.at(
+            counts,
+            (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)),
+            1,
+        )
+        return counts
+
+    def similarities(
+        self, question_ids: Sequence[int], answers: Sequence[str]
+    ) -> np.ndarray:
+        """Cosine similarity of each answer to its question's expected answer.
+
+        All answers are vectorised into one matrix and compared in a single
+        row-wise product. Words outside the vocabulary count toward an
+        answer's length, so padding an answer does not raise its score.
+        """
+        docs = [tokenize(answer) for answer in answers]
+        weighted = self._count_matrix(docs) * self.idf
+        unseen = np.array(
+            [sum(1 for t in doc if t not in self.term_index) for doc in docs],
+            dtype=float,
+        )
+        norms = np.sqrt((weighted**2).sum(axis=1) + (unseen * self.unseen_idf) ** 2)
+        refs = self.references[[self.row_index[qid] for qid in question_ids]]
+        dots = (weighted * refs).sum(axis=1)
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    def save(self, path: Path) -> None:
+        """Write the model to an ``.npz`` file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                key=np.array(self.key),
+                question_ids=self.question_ids,
+                vocabulary=np.array(self.vocabulary, dtype=str),
+                idf=self.idf,
+                references=self.references,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "EssayModel":
+        """Read a model written by ``save``."""
+        with np.load(path) as data:
+            return cls(
+                str(data["key"]),
+                data["question_ids"],
+                [str(t) for t in data["vocabulary"]],
+                data["idf"],
+                data["references"],
+            )
+
+
+class EssayGrader:
+    """Grades essay answers by similarity to the expected answer (opt-in).
+
+    One model is built per test and cached in memory and on disk; the disk
+    copy is reused until the test or its essay questions change.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        threshold: float = ESSAY_SIMILARITY_THRESHOLD,
+    ) -> None:
+        self._db = DatabaseManager(db_path)
+        self._cache_dir = Path(cache_dir) if cache_dir else ESSAY_MODEL_DIR
+        self.threshold = threshold
+        self._models: Dict[int, EssayModel] = {}
+
+    def get_model(self, test_id: int) -> Optional[EssayModel]:
+        """Get the current model for a test, rebuilding it if stale.
+
+        Returns:
+            The model, or None if the test has no gradable essays.
+        """
+        key = self._db.get_essay_model_key(test_id)
+        if key is None:
+            return None
+
+        model = self._models.get(test_id)
+        if model is not None and model.key == key:
+            return model
+
+        path = self._cache_dir / f"test_{test_id}.npz"
+        model = None
+        if path.exists():
+            try:
+                model = EssayModel.load(path)
+            except (OSError, ValueError, KeyError):
+                model = None
+        if model is None or model.key != key:
+            model = EssayModel.build(key, self._db.get_essay_references(test_id))
+            model.save(path)
+        self._models[test_id] = model
+        return model if len(model.question_ids) else None
+
+    def similarities(
+        self, questions: Sequence[Question], answers: Dict[int, str]
+    ) -> Dict[int, float]:
+        """Score every gradable essay in a session.
+
+        Essays are grouped by test and each group is compared in one batch.
+
+        Args:
+            questions: The session's questions (non-essays are ignored).
+            answers: question_id → answer text.
+
+        Returns:
+            question_id → cosine similarity in [0, 1]. Essays without an
+            expected answer are left out.
+        """
+        by_test: Dict[int, List[int]] = defaultdict(list)
+        for question in questions:
+            if question.type == QUESTION_TYPE_ESSAY and question.test_id is not None:
+                by_test[question.test_id].append(question.id)
+
+        scores: Dict[int, float] = {}
+        for test_id, question_ids in by_test.items():
+            model = self.get_model(test_id)
+            if model is None:
+                continue
+            gradable = [qid for qid in question_ids if qid in model.row_index]
+            if not gradable:
+                continue
+            sims = model.similarities(
+                gradable, [answers.get(qid, "") for qid in gradable]
+            )
+            scores.update(zip(gradable, (round(float(s), 4) for s in sims)))
+        return scores
+
+    def grade(
+        self, questions: Sequence[Question], answers: Dict[int, str]
+    ) -> Dict[int, bool]:
+        """Mark essays correct when their similarity reaches the threshold."""
+        return {
+            qid: similarity >= self.threshold
+            for qid, similarity in self.similarities(questions, answers).items()
+        }
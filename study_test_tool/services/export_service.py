@@ -8,6 +8,7 @@ from config.settings import QUESTION_TYPE_ESSAY, QUESTION_TYPE_MC
 from database.db_manager import DatabaseManager
 from models.question import Question
 from models.test import Test
+from services.validation_service import ValidationService
 
 
 class ExportService:
@@ -15,6 +16,7 @@ class ExportService:
 
     def __init__(self, db_path: Optional[str] = None) -> None:
         self._db = DatabaseManager(db_path)
+        self._validation = ValidationService(db_path)
 
     def export_to_json(self, test_id: int, file_path: str) -> None:
         """Export a test to a JSON file.
@@ -44,25 +46,10 @@ class ExportService:
         Returns:
             A list of warning messages. Empty list means no issues.
         """
-        test = self._db.get_test_by_id(test_id)
-        if test is None:
+        if not self._db.test_exists(test_id):
             raise ValueError(f"Test with id {test_id} not found.")
 
-        warnings: List[str] = []
-        for i, question in enumerate(test.questions, start=1):
-            if question.type == QUESTION_TYPE_MC:
-                if not question.correct_answer:
-                    warnings.append(
-                        f"Q{i} has no correct answer set."
-                    )
-                if not question.options:
-                    warnings.append(f"Q{i} has no answer options.")
-            elif question.type == QUESTION_TYPE_ESSAY:
-                if not question.correct_answer:
-                    warnings.append(
-                        f"Q{i} (essay) has no expected answer set."
-                    )
-        return warnings
+        return self._validation.validate_tests([test_id]).get(test_id, [])
 
     @staticmethod
     def _test_to_dict(test: Test) -> Dict:
@@ -0,0 +1,155 @@
+"""History export service — columnar dumps of response history for notebooks."""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from database.db_manager import DatabaseManager
+
+# (column, numpy dtype) for numeric columns; NULLs are written as -1
+NUMERIC_COLUMNS = [
+    ("response_id", np.int64),
+    ("attempt_id", np.int64),
+    ("completed_ts", np.int64),
+    ("test_id", np.int64),
+    ("question_id", np.int64),
+    ("is_correct", np.int8),
+    ("was_flagged", np.int8),
+    ("time_spent", np.int32),
+]
+
+# String columns stored as int32 codes into a per-column dictionary
+DICTIONARY_COLUMNS = ["mode", "test_name", "question_type", "category"]
+
+CSV_COLUMNS = [
+    "response_id",
+    "attempt_id",
+    "completed_at",
+    "mode",
+    "test_id",
+    "test_name",
+    "question_id",
+    "question_type",
+    "category",
+    "is_correct",
+    "was_flagged",
+    "time_spent",
+]
+
+
+class HistoryExportService:
+    """Streams question-response history to CSV and NumPy column files."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+
+    def export_response_history(
+        self,
+        out_dir: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        test_ids: Optional[Sequence[int]] = None,
+        chunk_size: int = 100_000,
+    ) -> Dict:
+        """Export response history as chunked CSV and ``.npz`` column files.
+
+        Each chunk is written as ``responses_NNNNN.csv`` and
+        ``responses_NNNNN.npz``; string columns in the ``.npz`` files are
+        int32 codes into ``dictionaries.npz``. Only one chunk is held in
+        memory at a time.
+
+        Args:
+            out_dir: Directory to write the files into (created if needed).
+            start_date: Optional inclusive local start date (YYYY-MM-DD).
+            end_date: Optional inclusive local end date (YYYY-MM-DD).
+            test_ids: Optional filter by test.
+            chunk_size: Rows per chunk file.
+
+        Returns:
+            Dict with rows, chunks, and the list of files written.
+        """
+        out = Path(out_dir)
+        out.mkdir(parents=True, exist_ok=True)
+
+        dictionaries: Dict[str, Dict[str, int]] = {
+            column: {} for column in DICTIONARY_COLUMNS
+        }
+        files: List[str] = []
+        total_rows = 0
+        chunk_index = 0
+
+        for rows in self._db.iter_response_history(
+            start_date, end_date, test_ids, chunk_size
+        ):
+            stem = f"responses_{chunk_index:05d}"
+            csv_path = out / f"{stem}.csv"
+            with open(csv_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(CSV_COLUMNS)
+                writer.writerows(
+                    [row[column] for column in CSV_COLUMNS] for row in rows
+                )
+
+            npz_path = out / f"{stem}.npz"
+            np.savez(npz_path, **self._chunk_to_columns(rows, dictionaries))
+
+            files.extend([str(csv_path), str(npz_path)])
+            total_rows += len(rows)
+            chunk_index += 1
+
+        dict_path = out / "dictionaries.npz"
+        np.savez(
+            dict_path,
+            **{
+                column: np.array(list(codes), dtype=str)
+                for column, codes in dictionaries.items()
+            },
+        )
+        files.append(str(dict_path))
+
+        manifest = {
+            "rows": total_rows,
+            "chunks": chunk_index,
+            "filters": {
+                "start_date": start_date,
+                "end_date": end_date,
+                "test_ids": list(test_ids) if test_ids else None,
+            },
+            "numeric_columns": [name for name, _ in NUMERIC_COLUMNS],
+            "dictionary_columns": DICTIONARY_COLUMNS,
+        }
+        manifest_path = out / "manifest.json"
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        files.append(str(manifest_path))
+
+        return {"rows": total_rows, "chunks": chunk_index, "files": files}
+
+    @staticmethod
+    def _chunk_to_columns(
+        rows: list, dictionaries: Dict[str, Dict[str, int]]
+    ) -> Dict[str, np.ndarray]:
+        """Turn one chunk of rows into typed column arrays.
+
+        Dictionary codes are assigned in first-seen order and shared across
+        chunks, so a code means the same string in every file.
+        """
+        count = len(rows)
+        columns: Dict[str, np.ndarray] = {}
+        for name, dtype in NUMERIC_COLUMNS:
+            columns[name] = np.fromiter(
+                (-1 if row[name] is None else row[name] for row in rows),
+                dtype=dtype,
+                count=count,
+            )
+        for name in DICTIONARY_COLUMNS:
+            codes = dictionaries[name]
+            columns[name] = np.fromiter(
+                (codes.setdefault(row[name], len(codes)) for row in rows),
+                dtype=np.int32,
+                count=count,
+            )
+        return columns
@@ -1,21 +1,180 @@
-"""Import service for loading tests from JSON and text files."""
+"""Import service for loading tests from JSON, text, and PDF files."""
 
 import json
+import multiprocessing
+import os
+import queue
 import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from config.settings import QUESTION_TYPE_ESSAY, QUESTION_TYPE_MC
 from database.db_manager import DatabaseManager
 from models.question import Question, QuestionOption
 from models.test import Test
+from services.validation_service import ValidationService
+
+# Pages handed to each worker at a time; large enough that opening the
+# PDF in the worker is amortised. Progress is still reported per page.
+PDF_PAGES_PER_TASK = 8
+
+# How often the importing thread checks for finished pages, in seconds
+PDF_PROGRESS_POLL = 0.1
+
+# Below this many pages the process pool costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 16
+
+# Lone page numbers ("12", "Page 3", "3 of 40") printed at a page edge
+_PAGE_NUMBER_LINE = re.compile(
+    r"^\s*(?:page\s+)?\d+(?:\s*(?:of|/)\s*\d+)?\s*$", re.IGNORECASE
+)
+
+
+def _require_pypdf():
+    """Import pypdf, which is only needed for PDF import."""
+    try:
+        import pypdf
+    except ImportError as e:
+        raise ImportError(
+            "PDF import requires the 'pypdf' package (pip install pypdf)."
+        ) from e
+    return pypdf
+
+
+# Set in each pool worker; finished page indices are posted here
+_page_queue = None
+
+
+def _init_pdf_worker(page_queue) -> None:
+    """Pool initializer: remember the queue for per-page progress."""
+    global _page_queue
+    _page_queue = page_queue
+
+
+def _extract_pdf_pages(
+    file_path: str,
+    start: int,
+    end: int,
+    on_page: Optional[Callable[[int], None]] = None,
+) -> List[Tuple[int, str]]:
+    """Extract text for pages ``start``..``end - 1``.
+
+    Each finished page index goes to ``on_page`` or, in a pool worker,
+    to the progress queue.
+    """
+    reader = _require_pypdf().PdfReader(file_path)
+    pages = []
+    for index in range(start, end):
+        pages.append((index, reader.pages[index].extract_text() or ""))
+        if on_page:
+            on_page(index)
+        elif _page_queue is not None:
+            _page_queue.put(index)
+    return pages
+
+
+def _stitch_pages(pages: List[str]) -> str:
+    """Join page texts, dropping page-number lines and mending split words."""
+    stitched = ""
+    for page in pages:
+        lines = page.splitlines()
+        while lines and (not lines[0].strip() or _PAGE_NUMBER_LINE.match(lines[0])):
+            lines.pop(0)
+        while lines and (not lines[-1].strip() or _PAGE_NUMBER_LINE.match(lines[-1])):
+            lines.pop()
+        if not lines:
+            continue
+
+        text = "\n".join(lines)
+        if stitched.endswith("-") and text[0].islower():
+            # A word hyphenated across the page break
+            stitched = stitched[:-1] + text
+        elif stitched:
+            stitched += "\n" + text
+        else:
+            stitched = text
+    return stitched
 
 
 class ImportService:
-    """Handles importing tests from JSON and plain-text files."""
+    """Handles importing tests from JSON, plain-text, and PDF files."""
 
     def __init__(self, db_path: Optional[str] = None) -> None:
         self._db = DatabaseManager(db_path)
+        self._validation = ValidationService(db_path)
+
+    # ── Preview & Commit ───────────────────────────────────────
+
+    def parse_file(
+        self,
+        file_path: str,
+        on_question: Optional[Callable[[Question], None]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> Test:
+        """Parse any supported file into an unsaved test (dry run).
+
+        Nothing is written to the database; pass the result to
+        ``commit_import`` once the user confirms.
+
+        Args:
+            file_path: Path to a .json, .pdf, or text file.
+            on_question: Called with each question as soon as it is parsed.
+            progress_callback: PDF page progress, see ``import_from_pdf``.
+
+        Returns:
+            A Test (id None) holding the parsed questions.
+        """
+        suffix = Path(file_path).suffix.lower()
+        if suffix == ".json":
+            return self.parse_json(file_path, on_question)
+        if suffix == ".pdf":
+            return self.parse_pdf(
+                file_path, on_question=on_question, progress_callback=progress_callback
+            )
+        return self.parse_text(file_path, on_question=on_question)
+
+    def analyze_import(self, test: Test) -> Dict:
+        """Summarise a parsed test before it is committed.
+
+        Returns:
+            Dict with question_count, type counts, validation warnings,
+            duplicates_in_file (repeats of an earlier question in the same
+            file), and duplicates_in_library (questions already saved in
+            any test).
+        """
+        seen = set()
+        duplicates_in_file = 0
+        for question in test.questions:
+            key = (question.type, " ".join(question.text.split()).casefold())
+            if key in seen:
+                duplicates_in_file += 1
+            seen.add(key)
+
+        return {
+            "question_count": len(test.questions),
+            "mc_count": sum(q.type == QUESTION_TYPE_MC for q in test.questions),
+            "essay_count": sum(q.type == QUESTION_TYPE_ESSAY for q in test.questions),
+            "warnings": self._validation.validate_questions(test.questions),
+            "duplicates_in_file": duplicates_in_file,
+            "duplicates_in_library": self._db.count_known_questions(
+                [(q.text, q.type) for q in test.questions]
+            ),
+        }
+
+    def commit_import(self, test: Test) -> int:
+        """Save a parsed test and its questions in one transaction.
+
+        Returns:
+            The id of the created test.
+
+        Raises:
+            ValueError: If the test has already been saved.
+        """
+        if test.id is not None:
+            raise ValueError("This import has already been saved.")
+        test.id = self._db.create_test_with_questions(test, test.questions)
+        return test.id
 
     # ── JSON Import ────────────────────────────────────────────
 
@@ -28,6 +187,26 @@ class ImportService:
         Returns:
             The id of the created test.
 
+        Raises:
+            ValueError: If the JSON format is invalid.
+            FileNotFoundError: If the file doesn't exist.
+        """
+        return self.commit_import(self.parse_json(file_path))
+
+    def parse_json(
+        self,
+        file_path: str,
+        on_question: Optional[Callable[[Question], None]] = None,
+    ) -> Test:
+        """Parse a JSON file into an unsaved test without touching the DB.
+
+        Args:
+            file_path: Path to the JSON file.
+            on_question: Called with each question as soon as it is parsed.
+
+        Returns:
+            A Test (id None) holding the parsed questions.
+
         Raises:
             ValueError: If the JSON format is invalid.
             FileNotFoundError: If the file doesn't exist.
@@ -45,13 +224,13 @@ class ImportService:
             name=data.get("name", path.stem),
             description=data.get("description", ""),
         )
-        test_id = self._db.create_test(test)
-
         for q_data in data.get("questions", []):
-            question = self._parse_json_question(q_data, test_id)
-            self._db.add_question(question)
+            question = self._parse_json_question(q_data, None)
+            test.questions.append(question)
+            if on_question:
+                on_question(question)
 
-        return test_id
+        return test
 
     @staticmethod
     def _validate_json_format(data: Dict) -> None:
@@ -66,7 +245,7 @@ class ImportService:
             raise ValueError("Test must contain at least one question.")
 
     @staticmethod
-    def _parse_json_question(q_data: Dict, test_id: int) -> Question:
+    def _parse_json_question(q_data: Dict, test_id: Optional[int]) -> Question:
         """Parse a single question from JSON data."""
         q_type = q_data.get("type", QUESTION_TYPE_MC)
         text = q_data.get("text", "").strip()
@@ -115,6 +294,28 @@ class ImportService:
         Returns:
             The id of the created test.
         """
+        return self.commit_import(self.parse_text(file_path, test_name))
+
+    def parse_text(
+        self,
+        file_path: str,
+        test_name: Optional[str] = None,
+        on_question: Optional[Callable[[Question], None]] = None,
+    ) -> Test:
+        """Parse a plain-text file into an unsaved test without touching the DB.
+
+        Args:
+            file_path: Path to the text file.
+            test_name: Optional name for the test. Defaults to filename.
+            on_question: Called with each question as soon as it is parsed.
+
+        Returns:
+            A Test (id None) holding the parsed questions.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If no questions are found.
+        """
         path = Path(file_path)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -123,32 +324,169 @@ class ImportService:
         name = test_name if test_name else path.stem
 
         test = Test(name=name, description=f"Imported from {path.name}")
-        test_id = self._db.create_test(test)
+        for question in self._iter_text_questions(content):
+            test.questions.append(question)
+            if on_question:
+                on_question(question)
 
-        questions = self._parse_text_questions(content)
-        if not questions:
+        if not test.questions:
             raise ValueError("No questions found in the text file.")
+        return test
 
-        for question in questions:
-            question.test_id = test_id
-            self._db.add_question(question)
+    # ── PDF Import ─────────────────────────────────────────────
+
+    def import_from_pdf(
+        self,
+        file_path: str,
+        test_name: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """Import a test from a PDF laid out like the text format.
+
+        Pages are extracted in parallel worker processes, stitched back
+        together, parsed with the text-format parser, and written in a
+        single transaction.
+
+        Args:
+            file_path: Path to the PDF file.
+            test_name: Optional name for the test. Defaults to filename.
+            progress_callback: Called as ``(pages_done, total_pages)`` while
+                pages are extracted (from the calling thread).
+            max_workers: Worker process count; defaults to the CPU count.
+                ``1`` extracts in-process.
+
+        Returns:
+            The id of the created test.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the PDF is unreadable or contains no questions.
+            ImportError: If pypdf is not installed.
+        """
+        return self.commit_import(
+            self.parse_pdf(
+                file_path,
+                test_name,
+                progress_callback=progress_callback,
+                max_workers=max_workers,
+            )
+        )
 
-        return test_id
+    def parse_pdf(
+        self,
+        file_path: str,
+        test_name: Optional[str] = None,
+        on_question: Optional[Callable[[Question], None]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Test:
+        """Parse a PDF into an unsaved test without touching the DB.
 
-    def _parse_text_questions(self, content: str) -> List[Question]:
-        """Parse questions from plain-text content."""
+        See ``import_from_pdf`` for the extraction pipeline and arguments;
+        ``on_question`` is called with each question as soon as it is parsed.
+
+        Returns:
+            A Test (id None) holding the parsed questions.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        pypdf = _require_pypdf()
+        try:
+            page_count = len(pypdf.PdfReader(str(path)).pages)
+        except pypdf.errors.PdfReadError as e:
+            raise ValueError(f"Could not read PDF: {e}") from e
+
+        pages = self._extract_pdf_text(
+            str(path), page_count, progress_callback, max_workers
+        )
+
+        name = test_name if test_name else path.stem
+        test = Test(name=name, description=f"Imported from {path.name}")
+        for question in self._iter_text_questions(_stitch_pages(pages)):
+            test.questions.append(question)
+            if on_question:
+                on_question(question)
+
+        if not test.questions:
+            raise ValueError("No questions found in the PDF file.")
+        return test
+
+    @staticmethod
+    def _extract_pdf_text(
+        file_path: str,
+        page_count: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        max_workers: Optional[int],
+    ) -> List[str]:
+        """Extract every page's text, in page order.
+
+        Large documents are split across worker processes started with
+        "spawn", since forking from a GUI thread is unsafe. Workers post
+        each finished page to a queue, so progress moves page by page.
+        """
+        pages = [""] * page_count
+        finished = set()
+
+        def page_done(index: int) -> None:
+            # Queue messages can trail their task's result; count each once
+            if index in finished:
+                return
+            finished.add(index)
+            if progress_callback:
+                progress_callback(len(finished), page_count)
+
+        workers = max_workers or os.cpu_count() or 1
+        if workers == 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            for index, text in _extract_pdf_pages(file_path, 0, page_count, page_done):
+                pages[index] = text
+            return pages
+
+        ranges = [
+            (start, min(start + PDF_PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        context = multiprocessing.get_context("spawn")
+        page_queue = context.Queue()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            mp_context=context,
+            initializer=_init_pdf_worker,
+            initargs=(page_queue,),
+        ) as pool:
+            pending = {
+                pool.submit(_extract_pdf_pages, file_path, start, end)
+                for start, end in ranges
+            }
+            while pending:
+                done, pending = wait(
+                    pending, timeout=PDF_PROGRESS_POLL, return_when=FIRST_COMPLETED
+                )
+                while True:
+                    try:
+                        page_done(page_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for future in done:
+                    for index, text in future.result():
+                        pages[index] = text
+                        page_done(index)
+        page_queue.close()
+        return pages
+
+    def _iter_text_questions(self, content: str) -> Iterator[Question]:
+        """Yield questions from plain-text content one block at a time."""
         # Split into question blocks by number prefix: "1." or "1)"
         # Handle case where number may start after blank lines
         blocks = re.split(r"(?:^|\n)(?=\d+\s*[.)]\s)", content.strip())
-        blocks = [b.strip() for b in blocks if b.strip()]
 
-        questions = []
         for block in blocks:
-            question = self._parse_text_question_block(block)
+            block = block.strip()
+            question = self._parse_text_question_block(block) if block else None
             if question:
-                questions.append(question)
-
-        return questions
+                yield question
 
     def _parse_text_question_block(self, block: str) -> Optional[Question]:
         """Parse a single question block from text."""
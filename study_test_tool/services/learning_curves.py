@@ -0,0 +1,185 @@
+"""Power-law learning curves fitted from running least-squares sums."""
+
+from typing import Dict
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+
+# Scores are modelled through their error rate, floored so a perfect
+# score does not send log(error) to -inf
+ERROR_FLOOR = 1.0
+
+# Fewest observations for a fit with a confidence band (n - 2 > 0)
+MIN_CURVE_POINTS = 3
+
+# Two-sided 95% band: exact t quantiles for 1-10 degrees of freedom
+Z_95 = 1.959964
+_T_95 = np.array(
+    [np.nan, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228]
+)
+
+# Regressors: attempt number and days since the first attempt
+_BY_ATTEMPT = 0
+_BY_TIME = 1
+
+
+def t_quantile_95(dof: np.ndarray) -> np.ndarray:
+    """97.5% quantile of Student's t for each degree-of-freedom count.
+
+    Small counts use a table; above 10 the Cornish-Fisher expansion
+    around the normal quantile is within 0.2% of the exact value.
+    """
+    dof = np.asarray(dof, dtype=float)
+    z = Z_95
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = (
+            z + (z**3 + z) / (4 * dof) + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * dof**2)
+        )
+    small = (dof >= 1) & (dof < len(_T_95))
+    table = _T_95[np.where(small, dof, 0).astype(np.int64)]
+    return np.where(small, table, np.where(dof >= 1, series, np.nan))
+
+
+class CurveStats:
+    """Per-group sums for fitting ``error = A * x ** -k`` by least squares.
+
+    The power law of practice is linear in log-log space, so each group
+    needs only six running sums per regressor (n, Σx, Σy, Σx², Σxy, Σy²)
+    with ``y = log(100 - score)``. Adding observations updates the sums
+    with a few ``bincount`` calls, and refitting every group is a handful
+    of array operations, so new attempts never require a pass over the
+    history.
+
+    Two regressors are kept: ``log(attempt number)`` and
+    ``log(1 + days since the group's first attempt)``. The second one
+    drives date forecasts.
+    """
+
+    def __init__(self) -> None:
+        self.count = np.zeros(0, dtype=np.int64)
+        self.first_ts = np.zeros(0, dtype=np.int64)
+        self.last_ts = np.zeros(0, dtype=np.int64)
+        # [group, regressor, (Σx, Σy, Σx², Σxy, Σy²)]
+        self.sums = np.zeros((0, 2, 5))
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def _grow(self, size: int) -> None:
+        extra = size - len(self.count)
+        if extra <= 0:
+            return
+        self.count = np.r_[self.count, np.zeros(extra, dtype=np.int64)]
+        self.first_ts = np.r_[self.first_ts, np.zeros(extra, dtype=np.int64)]
+        self.last_ts = np.r_[self.last_ts, np.zeros(extra, dtype=np.int64)]
+        self.sums = np.concatenate([self.sums, np.zeros((extra, 2, 5))])
+
+    def add(self, groups: np.ndarray, scores: np.ndarray, ts: np.ndarray) -> None:
+        """Add observations given in chronological order.
+
+        Args:
+            groups: Group code (>= 0) of each observation.
+            scores: Percentage score of each observation.
+            ts: Unix time of each observation; must not precede the
+                group's last observation already added.
+        """
+        if not len(groups):
+            return
+        size = int(groups.max()) + 1
+        self._grow(size)
+
+        # A stable sort keeps each group's observations in time order;
+        # 16-bit keys let NumPy use its linear-time radix sort
+        keys = groups.astype(np.int16) if size <= np.iinfo(np.int16).max else groups
+        order = np.argsort(keys, kind="stable")
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        seen = sorted_groups[starts]
+        fresh = self.count[seen] == 0
+        self.first_ts[seen[fresh]] = ts[order[starts[fresh]]]
+        self.last_ts[seen] = ts[order[np.r_[starts[1:], len(groups)] - 1]]
+
+        # Attempt number: previous count + rank within this batch
+        run_lengths = np.diff(np.r_[starts, len(groups)])
+        rank = np.empty(len(groups), dtype=np.int64)
+        rank[order] = np.arange(len(groups)) - np.repeat(starts, run_lengths)
+        number = self.count[groups] + rank + 1
+
+        y = np.log(np.maximum(100.0 - scores, ERROR_FLOOR))
+        days = np.maximum(ts - self.first_ts[groups], 0) / SECONDS_PER_DAY
+        regressors = ((_BY_ATTEMPT, np.log(number)), (_BY_TIME, np.log1p(days)))
+        for regressor, x in regressors:
+            for column, weights in enumerate((x, y, x * x, x * y, y * y)):
+                self.sums[:, regressor, column] += np.bincount(
+                    groups, weights=weights, minlength=len(self.count)
+                )
+        self.count += np.bincount(groups, minlength=len(self.count))
+
+    def fit(self, regressor: int) -> Dict[str, np.ndarray]:
+        """Least-squares line through (x, y) for every group at once.
+
+        Returns:
+            Dict of per-group arrays: n, slope, intercept, mean_x, sxx
+            (centred Σx²) and sigma (residual standard deviation). Groups
+            without enough spread in x get NaN parameters.
+        """
+        n = self.count.astype(float)
+        sx, sy, sxx, sxy, syy = np.moveaxis(self.sums[:, regressor], -1, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_x, mean_y = sx / n, sy / n
+            cxx = sxx - sx * mean_x
+            cxy = sxy - sx * mean_y
+            cyy = syy - sy * mean_y
+            valid = (n >= 2) & (cxx > 1e-12)
+            slope = np.where(valid, cxy / cxx, np.nan)
+            intercept = mean_y - slope * mean_x
+            residual = np.maximum(cyy - slope * cxy, 0.0)
+            sigma = np.where(n > 2, np.sqrt(residual / (n - 2)), np.nan)
+        return {
+            "n": n,
+            "slope": slope,
+            "intercept": intercept,
+            "mean_x": mean_x,
+            "sxx": cxx,
+            "sigma": sigma,
+        }
+
+    def forecast(self, at_ts: float) -> Dict[str, np.ndarray]:
+        """Projected score of every group at a moment, with a 95% band.
+
+        The band is the least-squares prediction interval in log-error
+        space, mapped back to a percentage.
+
+        Returns:
+            Dict of per-group arrays: projected, lower, upper (NaN where
+            the group has too few attempts), and next_attempt, the
+            attempt-number model's score for the group's next attempt.
+        """
+        by_time = self.fit(_BY_TIME)
+        days = np.maximum(at_ts - self.first_ts, 0) / SECONDS_PER_DAY
+        x = np.log1p(days)
+        y = by_time["intercept"] + by_time["slope"] * x
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = by_time["n"]
+            spread = by_time["sigma"] * np.sqrt(
+                1 + 1 / n + (x - by_time["mean_x"]) ** 2 / by_time["sxx"]
+            )
+            margin = t_quantile_95(n - 2) * spread
+        enough = n >= MIN_CURVE_POINTS
+
+        by_attempt = self.fit(_BY_ATTEMPT)
+        next_y = by_attempt["intercept"] + by_attempt["slope"] * np.log(n + 1)
+
+        def score(log_error: np.ndarray) -> np.ndarray:
+            return np.where(
+                enough, np.clip(100.0 - np.exp(log_error), 0.0, 100.0), np.nan
+            )
+
+        return {
+            "projected": score(y),
+            "lower": score(y + margin),
+            "upper": score(y - margin),
+            "next_attempt": score(next_y),
+            "learning_rate": np.where(enough, -by_attempt["slope"], np.nan),
+        }
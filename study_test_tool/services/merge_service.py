@@ -0,0 +1,34 @@
+"""Merge service — combines another study database into this one."""
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from database.db_manager import DatabaseManager
+
+
+class MergeService:
+    """Merges question banks and attempt history from another database."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+
+    def merge_database(self, source_path: str) -> Dict[str, int]:
+        """Merge another study_tool.db into the current database.
+
+        Existing tests and questions are reused when they match, so merging
+        the same file twice adds no duplicate questions.
+
+        Args:
+            source_path: Path to the database file to merge in.
+
+        Returns:
+            Dict of added/matched counts per table.
+
+        Raises:
+            FileNotFoundError: If the source file doesn't exist.
+            ValueError: If the source is not a study database.
+        """
+        path = Path(source_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {source_path}")
+        return self._db.merge_database(str(path))
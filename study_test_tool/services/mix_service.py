@@ -1,24 +1,111 @@
 """Mix test service — selects random questions from multiple tests."""
 
+import math
 import random
-from typing import List, Optional
+from typing import Dict, Hashable, List, Mapping, Optional, TypeVar
 
+from database.db_manager import DatabaseManager
 from models.question import Question
-from services.question_service import QuestionService
 from services.randomizer_service import RandomizerService
+from utils.constants import MIX_STRATIFIED, MIX_UNIFORM, MIX_WEIGHTED
+
+K = TypeVar("K", bound=Hashable)
+
+# Adaptive weighting: a question's score is its smoothed miss rate, plus
+# a bonus if never answered, plus up to STALENESS_WEIGHT as the time
+# since it was last seen approaches STALE_DAYS
+UNSEEN_BONUS = 1.0
+STALENESS_WEIGHT = 0.5
+STALE_DAYS = 30.0
+
+
+def largest_remainder(
+    total: int, weights: Mapping[K, float], caps: Mapping[K, int]
+) -> Dict[K, int]:
+    """Split ``total`` into whole shares proportional to ``weights``.
+
+    Each key gets the floor of its exact share and the leftover units go
+    to the largest fractional parts (ties to the earlier key). No key gets
+    more than its cap; a capped key's excess is re-split among the rest.
+
+    Args:
+        total: Units to allocate.
+        weights: Relative weight per key, in priority order.
+        caps: Maximum units per key.
+
+    Returns:
+        Dict of key → units, summing to ``min(total, sum of caps)``.
+    """
+    alloc = {key: 0 for key in weights}
+    remaining = min(total, sum(caps.get(key, 0) for key in weights))
+    open_keys = [k for k in weights if weights[k] > 0 and caps.get(k, 0) > 0]
+    while remaining > 0 and open_keys:
+        weight_sum = sum(weights[k] for k in open_keys)
+        shares = {k: remaining * weights[k] / weight_sum for k in open_keys}
+        full = [k for k in open_keys if shares[k] >= caps[k] - alloc[k]]
+        if full:
+            for k in full:
+                remaining -= caps[k] - alloc[k]
+                alloc[k] = caps[k]
+            open_keys = [k for k in open_keys if k not in full]
+            continue
+        floors = {k: math.floor(shares[k]) for k in open_keys}
+        for k in open_keys:
+            alloc[k] += floors[k]
+        leftover = remaining - sum(floors.values())
+        by_remainder = sorted(
+            range(len(open_keys)),
+            key=lambda i: (-(shares[open_keys[i]] - floors[open_keys[i]]), i),
+        )
+        for i in by_remainder[:leftover]:
+            alloc[open_keys[i]] += 1
+        remaining = 0
+    return alloc
+
+
+def proportional_with_floor(total: int, sizes: Mapping[K, int]) -> Dict[K, int]:
+    """Split ``total`` in proportion to ``sizes``, giving each key at least one.
+
+    When ``total`` covers every non-empty key, each gets one unit first
+    and the rest is split by largest remainder, so a small key is not
+    rounded away next to a large one. Otherwise the split is purely
+    proportional.
+
+    Args:
+        total: Units to allocate.
+        sizes: Available units per key, in priority order.
+
+    Returns:
+        Dict of key → units, never exceeding a key's size.
+    """
+    present = [key for key in sizes if sizes[key] > 0]
+    if not present or total < len(present):
+        return largest_remainder(total, sizes, sizes)
+    rest = largest_remainder(
+        total - len(present), sizes, {key: sizes[key] - 1 for key in present}
+    )
+    return {key: rest[key] + (1 if key in present else 0) for key in sizes}
 
 
 class MixService:
-    """Loads questions from multiple tests and randomly selects a subset."""
+    """Randomly selects a subset of questions from multiple tests.
+
+    Selection works on question ids; full questions and their options are
+    loaded only for the ids that were picked.
+    """
 
     def __init__(self, db_path: Optional[str] = None) -> None:
-        self._question_service = QuestionService(db_path)
+        self._db = DatabaseManager(db_path)
 
     def select_questions(
         self,
         test_ids: List[int],
         count: int,
         randomize: bool = True,
+        seed: Optional[int] = None,
+        strategy: str = MIX_UNIFORM,
+        temperature: float = 1.0,
+        test_quotas: Optional[Dict[int, int]] = None,
     ) -> List[Question]:
         """Select a random subset of questions from multiple tests.
 
@@ -26,6 +113,18 @@ class MixService:
             test_ids: IDs of the tests to draw questions from.
             count: Number of questions to select.
             randomize: If True, shuffle question and option order.
+            seed: Seed for the selection and shuffle; the same seed, tests
+                and count give the same questions in the same layout.
+            strategy: MIX_UNIFORM for a plain random sample, or
+                MIX_WEIGHTED to favour often-missed, never-seen and
+                long-unseen questions.
+                MIX_STRATIFIED draws a fixed number from every source
+                test and, within each test, from every category.
+            temperature: For MIX_WEIGHTED, how strongly weights count;
+                lower is greedier, higher approaches uniform.
+            test_quotas: For MIX_STRATIFIED, a fixed number of questions
+                per test (``count`` is then ignored). If omitted, ``count``
+                is split in proportion to each test's size.
 
         Returns:
             List of Question objects, each retaining its original test_id.
@@ -33,19 +132,129 @@ class MixService:
         if not test_ids or count <= 0:
             return []
 
-        all_questions: List[Question] = []
-        for test_id in test_ids:
-            questions = self._question_service.get_questions_for_test(
-                test_id, randomize=False
+        rng = RandomizerService.rng_for(seed) if seed is not None else None
+        if strategy == MIX_STRATIFIED:
+            selected = self._db.get_questions_by_ids(
+                self._sample_stratified(test_ids, count, test_quotas, rng)
             )
-            all_questions.extend(questions)
+            if randomize:
+                selected = RandomizerService.shuffle_all(selected, rng)
+            return selected
 
-        if not all_questions:
+        # Sample ids first; only the chosen questions are loaded
+        question_ids = self._db.get_question_ids(test_ids)
+        if not question_ids:
             return []
 
-        selected = random.sample(all_questions, min(count, len(all_questions)))
+        k = min(count, len(question_ids))
+        if strategy == MIX_WEIGHTED:
+            weights = self.adaptive_weights(test_ids, temperature)
+            chosen = RandomizerService.weighted_sample(
+                question_ids, [weights[qid] for qid in question_ids], k, rng
+            )
+        else:
+            chosen = (rng or random).sample(question_ids, k)
+        selected = self._db.get_questions_by_ids(chosen)
 
         if randomize:
-            selected = RandomizerService.shuffle_all(selected)
+            selected = RandomizerService.shuffle_all(selected, rng)
 
         return selected
+
+    def adaptive_weights(
+        self, test_ids: List[int], temperature: float = 1.0
+    ) -> Dict[int, float]:
+        """Selection weight for every question in the given tests.
+
+        Args:
+            test_ids: Tests whose questions to weigh.
+            temperature: Weights are raised to ``1 / temperature``.
+
+        Returns:
+            Dict of question_id → weight.
+
+        Raises:
+            ValueError: If temperature is not positive.
+        """
+        if temperature <= 0:
+            raise ValueError("Temperature must be positive.")
+        weights = {}
+        for stat in self._db.get_question_stats(test_ids):
+            answered = stat["answered"]
+            score = (stat["missed"] + 1) / (answered + 2)
+            days = stat["days_since_seen"]
+            if answered == 0:
+                score += UNSEEN_BONUS
+            if days is None:
+                score += STALENESS_WEIGHT
+            else:
+                score += STALENESS_WEIGHT * min(max(days, 0.0) / STALE_DAYS, 1.0)
+            weights[stat["question_id"]] = score ** (1.0 / temperature)
+        return weights
+
+    # ── Stratified mixes ───────────────────────────────────────
+
+    def stratum_counts(
+        self, test_ids: Optional[List[int]] = None
+    ) -> Dict[int, Dict[str, int]]:
+        """Question counts per test and category, for planning a mix."""
+        return self._db.get_stratum_counts(test_ids)
+
+    @staticmethod
+    def plan_stratified(
+        count: int,
+        strata: Mapping[int, Mapping[str, int]],
+        test_quotas: Optional[Mapping[int, int]] = None,
+    ) -> Dict[int, Dict[str, int]]:
+        """Decide how many questions to draw from each test and category.
+
+        Tests get their fixed quota (capped at what they hold) or, without
+        quotas, a share of ``count`` proportional to their size. Each
+        test's share is then split across its categories by size. Both
+        steps use largest-remainder rounding after giving every test and
+        category one question, when the budget covers them all.
+
+        Args:
+            count: Total questions wanted (ignored with ``test_quotas``).
+            strata: test_id → {category: available questions}, in the
+                order tests should be considered.
+            test_quotas: Optional fixed number of questions per test.
+
+        Returns:
+            Dict of test_id → {category: questions to draw}.
+        """
+        sizes = {tid: sum(cats.values()) for tid, cats in strata.items()}
+        if test_quotas is not None:
+            per_test = {
+                tid: min(max(test_quotas.get(tid, 0), 0), sizes[tid]) for tid in strata
+            }
+        else:
+            per_test = proportional_with_floor(count, sizes)
+        return {
+            tid: proportional_with_floor(per_test[tid], cats)
+            for tid, cats in strata.items()
+        }
+
+    def _sample_stratified(
+        self,
+        test_ids: List[int],
+        count: int,
+        test_quotas: Optional[Dict[int, int]],
+        rng: Optional[random.Random],
+    ) -> List[int]:
+        """Sample question ids per the stratified plan, test by test."""
+        ids_by_stratum = self._db.get_question_ids_by_stratum(test_ids)
+        plan = self.plan_stratified(
+            count,
+            {
+                tid: {cat: len(ids) for cat, ids in cats.items()}
+                for tid, cats in ids_by_stratum.items()
+            },
+            test_quotas,
+        )
+        sampler = rng or random
+        chosen: List[int] = []
+        for tid, cats in ids_by_stratum.items():
+            for category, ids in cats.items():
+                chosen.extend(sampler.sample(ids, plan[tid][category]))
+        return chosen
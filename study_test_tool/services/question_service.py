@@ -14,36 +14,41 @@ class QuestionService:
         self._db = DatabaseManager(db_path)
 
     def get_questions_for_test(
-        self, test_id: int, randomize: bool = False
+        self, test_id: int, randomize: bool = False, seed: Optional[int] = None
     ) -> List[Question]:
         """Get all questions for a test, optionally randomized.
 
         Args:
             test_id: The test to fetch questions for.
             randomize: If True, shuffle question order and option order.
+            seed: Seed for the shuffle; the same seed gives the same layout
+                while the test's questions are unchanged.
 
         Returns:
-            List of Question objects with options loaded.
+            List of Question objects with options loaded. When randomized,
+            these are views that show the options in shuffled order.
         """
         questions = self._db.get_questions_for_test(test_id)
         if randomize:
-            questions = RandomizerService.shuffle_all(questions)
+            rng = RandomizerService.rng_for(seed) if seed is not None else None
+            questions = RandomizerService.shuffle_all(questions, rng)
         return questions
 
     def add_question(self, question: Question) -> int:
         """Add a question with its options and return its id."""
         return self._db.add_question(question)
 
-    def update_question(self, question: Question) -> None:
-        """Update a question's text, type, correct_answer, and category.
+    def update_question(self, question: Question) -> bool:
+        """Update a question's text, type, correct_answer, category, and options.
 
-        Also replaces all options: deletes existing, inserts new ones.
+        Options are diffed against the stored ones in a single transaction:
+        options carrying an id keep it, and only changed rows are written.
+
+        Returns:
+            True if the answer key or question type changed, meaning past
+            responses should be rescored (see ScoringService.rescore_questions).
         """
-        self._db.update_question(question)
-        self._db.delete_options_for_question(question.id)
-        for option in question.options:
-            option.question_id = question.id
-            self._db.add_question_option(option)
+        return self._db.update_question_with_options(question)
 
     def delete_question(self, question_id: int) -> None:
         """Delete a question and its options."""
@@ -1,40 +1,178 @@
 """Randomization service for shuffling questions and options."""
 
-import copy
+import heapq
+import math
 import random
-from typing import List
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import List, Optional, Sequence, Tuple, TypeVar
 
-from models.question import Question
+from models.question import Question, QuestionOption
+
+T = TypeVar("T")
+
+# Bump whenever the way a seed maps to a layout changes, so layouts
+# stored as (seed, version) are never silently regenerated differently
+GENERATOR_VERSION = 1
+
+
+class OptionsView(SequenceABC):
+    """Read-only view of a question's options in a permuted order."""
+
+    __slots__ = ("_options", "_order")
+
+    def __init__(self, options: List[QuestionOption], order: Sequence[int]) -> None:
+        self._options = options
+        self._order = order
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._options[i] for i in self._order[index]]
+        return self._options[self._order[index]]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class QuestionView:
+    """A shared Question seen with its options in a permuted order.
+
+    Every attribute other than ``options`` reads through to the underlying
+    question, so shuffling never copies question or option objects.
+    """
+
+    __slots__ = ("question", "option_order")
+
+    def __init__(self, question: Question, option_order: Sequence[int]) -> None:
+        self.question = question
+        self.option_order = option_order
+
+    @property
+    def options(self) -> OptionsView:
+        """The question's options in shuffled order."""
+        return OptionsView(self.question.options, self.option_order)
+
+    def __getattr__(self, name: str):
+        if name in QuestionView.__slots__:  # not yet set (e.g. during copy)
+            raise AttributeError(name)
+        return getattr(self.question, name)
+
+    def __repr__(self) -> str:
+        return f"QuestionView({self.question!r}, order={list(self.option_order)})"
 
 
 class RandomizerService:
-    """Provides shuffling for questions and their options."""
+    """Provides shuffling for questions and their options.
+
+    A shuffle is a permutation: an index array for the question order and
+    one per question for its options. Applying it wraps the original
+    questions in QuestionView objects instead of copying them.
+
+    Every method takes an optional ``random.Random``; passing one seeded
+    with the same value reproduces the same layout. Without one, the
+    global ``random`` module is used.
+    """
+
+    @staticmethod
+    def new_seed() -> int:
+        """Draw a fresh seed that fits in an SQLite integer."""
+        return random.SystemRandom().getrandbits(62)
+
+    @staticmethod
+    def rng_for(seed: int) -> random.Random:
+        """The generator for a stored seed."""
+        return random.Random(seed)
+
+    @staticmethod
+    def weighted_sample(
+        items: Sequence[T],
+        weights: Sequence[float],
+        k: int,
+        rng: Optional[random.Random] = None,
+    ) -> List[T]:
+        """Pick ``k`` items without replacement, biased by weight.
+
+        Efraimidis–Spirakis: each item gets the key ``log(u) / w`` for a
+        uniform ``u``, and the ``k`` largest keys win (O(n log k) with a
+        heap). Items with zero weight are only picked once every
+        positive-weight item has been.
+        """
+        rand = (rng or random).random
+        keyed = []
+        for item, weight in zip(items, weights):
+            u = rand() or 5e-324  # avoid log(0)
+            key = math.log(u) / weight if weight > 0 else -math.inf
+            keyed.append((key, item))
+        return [item for _, item in heapq.nlargest(k, keyed, key=lambda p: p[0])]
 
     @staticmethod
-    def shuffle_questions(questions: List[Question]) -> List[Question]:
+    def shuffle_questions(
+        questions: List[Question], rng: Optional[random.Random] = None
+    ) -> List[Question]:
         """Return a new list of questions in random order.
 
         Does not mutate the original list.
         """
         shuffled = list(questions)
-        random.shuffle(shuffled)
+        (rng or random).shuffle(shuffled)
         return shuffled
 
     @staticmethod
-    def shuffle_options(question: Question) -> Question:
-        """Return a deep copy of the question with shuffled options.
+    def option_permutation(
+        question: Question, rng: Optional[random.Random] = None
+    ) -> array:
+        """Random order for a question's options, as an index array."""
+        order = array("H", range(len(question.options)))
+        (rng or random).shuffle(order)
+        return order
 
-        Does not mutate the original question.
+    @staticmethod
+    def shuffle_options(
+        question: Question, rng: Optional[random.Random] = None
+    ) -> QuestionView:
+        """Return a view of the question with shuffled options.
+
+        Does not mutate or copy the original question.
+        """
+        return QuestionView(
+            question, RandomizerService.option_permutation(question, rng)
+        )
+
+    @staticmethod
+    def permutation(
+        questions: Sequence[Question], rng: Optional[random.Random] = None
+    ) -> Tuple[array, List[array]]:
+        """Draw a random question order and option order for each question.
+
+        Returns:
+            (question_order, option_orders): indices into ``questions``,
+            and for each question (in original order) indices into its
+            options.
         """
-        new_question = copy.deepcopy(question)
-        random.shuffle(new_question.options)
-        return new_question
+        order = array("I", range(len(questions)))
+        (rng or random).shuffle(order)
+        return order, [RandomizerService.option_permutation(q, rng) for q in questions]
+
+    @staticmethod
+    def apply_permutation(
+        questions: Sequence[Question],
+        question_order: Sequence[int],
+        option_orders: Sequence[Sequence[int]],
+    ) -> List[QuestionView]:
+        """Lay out questions by a stored permutation, without copying them."""
+        return [QuestionView(questions[i], option_orders[i]) for i in question_order]
 
     @staticmethod
-    def shuffle_all(questions: List[Question]) -> List[Question]:
+    def shuffle_all(
+        questions: List[Question], rng: Optional[random.Random] = None
+    ) -> List[QuestionView]:
         """Shuffle question order and option order within each question.
 
-        Returns new objects; originals are not mutated.
+        Returns views over the original questions; they are not mutated.
         """
-        shuffled = RandomizerService.shuffle_questions(questions)
-        return [RandomizerService.shuffle_options(q) for q in shuffled]
+        return RandomizerService.apply_permutation(
+            questions, *RandomizerService.permutation(questions, rng)
+        )
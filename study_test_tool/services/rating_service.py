@@ -0,0 +1,172 @@
+"""Online difficulty estimation (Elo / 1PL IRT) and adaptive question order."""
+
+import bisect
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database.db_manager import DatabaseManager
+from models.question import Question
+
+# Step size of a rating update; it shrinks as a rating collects answers
+K_BASE = 0.4
+K_DECAY = 0.05
+
+# Adaptive practice aims for questions answered correctly this often
+TARGET_SUCCESS = 0.7
+
+
+def expected_score(ability: float, difficulty: float) -> float:
+    """Probability of a correct answer under the 1PL (Rasch) model."""
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+def step_size(answers: int) -> float:
+    """Update weight for a rating backed by ``answers`` previous answers."""
+    return K_BASE / (1.0 + K_DECAY * answers)
+
+
+def _category(question: Question) -> str:
+    return question.category or ""
+
+
+class RatingEngine:
+    """Keeps question difficulties and per-category abilities in memory.
+
+    Both live on one logit scale: a user whose ability in a category
+    equals a question's difficulty answers it correctly half the time.
+    Each graded answer moves the ability up and the difficulty down (or
+    the reverse) by the surprise ``outcome - expected``, an O(1) Elo-style
+    update. Changed ratings are written back in one batch by ``flush``.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+        self._difficulty: Dict[int, Tuple[float, int]] = {}
+        self._ability: Optional[Dict[str, Tuple[float, int]]] = None
+        self._dirty_questions: set = set()
+        self._dirty_categories: set = set()
+
+    def load(self, questions: Sequence[Question]) -> None:
+        """Read the stored ratings of questions not yet in memory."""
+        if self._ability is None:
+            self._ability = self._db.get_category_ratings()
+        missing = [q.id for q in questions if q.id not in self._difficulty]
+        if missing:
+            stored = self._db.get_question_ratings(missing)
+            for question_id in missing:
+                self._difficulty[question_id] = stored.get(question_id, (0.0, 0))
+
+    def difficulty(self, question_id: int) -> float:
+        """Current difficulty estimate of a loaded question (0 if unrated)."""
+        return self._difficulty.get(question_id, (0.0, 0))[0]
+
+    def ability(self, category: str) -> float:
+        """Current ability estimate in a category (0 if unrated)."""
+        return (self._ability or {}).get(category, (0.0, 0))[0]
+
+    def record(self, question: Question, correct: bool) -> float:
+        """Update the ratings after one graded answer.
+
+        Args:
+            question: The answered question (must have been loaded).
+            correct: Whether the answer was correct.
+
+        Returns:
+            The probability of a correct answer before the update.
+        """
+        if self._ability is None:
+            self.load([question])
+        category = _category(question)
+        difficulty, q_answers = self._difficulty.get(question.id, (0.0, 0))
+        ability, c_answers = self._ability.get(category, (0.0, 0))
+
+        expected = expected_score(ability, difficulty)
+        surprise = (1.0 if correct else 0.0) - expected
+        self._difficulty[question.id] = (
+            difficulty - step_size(q_answers) * surprise,
+            q_answers + 1,
+        )
+        self._ability[category] = (
+            ability + step_size(c_answers) * surprise,
+            c_answers + 1,
+        )
+        self._dirty_questions.add(question.id)
+        self._dirty_categories.add(category)
+        return expected
+
+    def flush(self) -> int:
+        """Write every changed rating to the database.
+
+        Returns:
+            Number of question ratings written.
+        """
+        if not self._dirty_questions and not self._dirty_categories:
+            return 0
+        questions = [
+            (qid, *self._difficulty[qid]) for qid in sorted(self._dirty_questions)
+        ]
+        categories = [
+            (cat, *self._ability[cat]) for cat in sorted(self._dirty_categories)
+        ]
+        self._db.save_ratings(questions, categories)
+        self._dirty_questions.clear()
+        self._dirty_categories.clear()
+        return len(questions)
+
+
+class AdaptiveSelector:
+    """Serves the unseen question whose difficulty best matches ability.
+
+    Questions are kept per category in lists sorted by difficulty, so
+    finding the closest match to the target difficulty is a bisect per
+    category (O(C log n)) rather than a scan of the pool. A question's
+    position is fixed when it joins the pool; it leaves before it is
+    answered, so later rating changes never need re-sorting.
+    """
+
+    def __init__(self, engine: RatingEngine, questions: Sequence[Question]) -> None:
+        self._engine = engine
+        self._pools: Dict[str, List[Tuple[float, int]]] = {}
+        self._entries: Dict[int, Tuple[str, float]] = {}
+        for question in questions:
+            category = _category(question)
+            difficulty = engine.difficulty(question.id)
+            self._pools.setdefault(category, []).append((difficulty, question.id))
+            self._entries[question.id] = (category, difficulty)
+        for pool in self._pools.values():
+            pool.sort()
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def discard(self, question_id: int) -> None:
+        """Remove a question from the pool (e.g. once it has been shown)."""
+        entry = self._entries.pop(question_id, None)
+        if entry is None:
+            return
+        category, difficulty = entry
+        pool = self._pools[category]
+        del pool[bisect.bisect_left(pool, (difficulty, question_id))]
+
+    def target_difficulty(self, category: str) -> float:
+        """Difficulty answered correctly with probability TARGET_SUCCESS."""
+        return self._engine.ability(category) - math.log(
+            TARGET_SUCCESS / (1.0 - TARGET_SUCCESS)
+        )
+
+    def best(self) -> Optional[int]:
+        """Id of the pooled question closest to its category's target."""
+        best_id, best_gap = None, math.inf
+        for category, pool in self._pools.items():
+            if not pool:
+                continue
+            target = self.target_difficulty(category)
+            i = bisect.bisect_left(pool, (target, -math.inf))
+            for difficulty, question_id in pool[max(i - 1, 0) : i + 1]:
+                gap = abs(difficulty - target)
+                if gap < best_gap:
+                    best_id, best_gap = question_id, gap
+        return best_id
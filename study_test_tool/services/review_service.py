@@ -56,9 +56,4 @@ class ReviewService:
         Returns:
             List of Question objects with options.
         """
-        questions = []
-        for qid in question_ids:
-            question = self._db.get_question_by_id(qid)
-            if question:
-                questions.append(question)
-        return questions
+        return self._db.get_questions_by_ids(question_ids)
@@ -1,19 +1,34 @@
 """Scoring service for evaluating test attempts."""
 
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from config.settings import QUESTION_TYPE_ESSAY, QUESTION_TYPE_MC
 from database.db_manager import DatabaseManager
 from models.question import Question
-from models.test_result import QuestionResponse, TestAttempt
+from models.test_result import QuestionResponse, StudySession, TestAttempt
+from services.essay_grader import EssayGrader
+from services.randomizer_service import GENERATOR_VERSION
+from services.spaced_repetition_service import reschedule
 
 
 class ScoringService:
     """Scores test attempts and persists results."""
 
-    def __init__(self, db_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        essay_grader: Optional[EssayGrader] = None,
+    ) -> None:
+        """Create the service.
+
+        Args:
+            db_path: Optional database path.
+            essay_grader: If given, essays with an expected answer are
+                auto-graded by similarity instead of left for self-evaluation.
+        """
         self._db = DatabaseManager(db_path)
+        self._essay_grader = essay_grader
 
     @staticmethod
     def score_question(question: Question, user_answer: Optional[str]) -> Optional[bool]:
@@ -40,16 +55,27 @@ class ScoringService:
 
         Returns:
             Dict with score, total, percentage, correct_questions,
-            incorrect_questions, essay_questions, time_taken.
+            incorrect_questions, essay_questions (left for self-evaluation),
+            essay_scores (auto-graded similarities), time_taken, responses,
+            timeline.
         """
         correct = 0
         incorrect = 0
         essays = 0
         scored_responses = []
 
+        essay_scores: Dict[int, float] = {}
+        if self._essay_grader is not None:
+            essay_scores = self._essay_grader.similarities(
+                session.questions, session.responses
+            )
+        threshold = self._essay_grader.threshold if essay_scores else 0.0
+
         for question in session.questions:
             user_answer = session.responses.get(question.id)
             is_correct = self.score_question(question, user_answer)
+            if question.id in essay_scores:
+                is_correct = essay_scores[question.id] >= threshold
 
             if is_correct is None:
                 essays += 1
@@ -80,8 +106,12 @@ class ScoringService:
             "correct_questions": correct,
             "incorrect_questions": incorrect,
             "essay_questions": essays,
+            "essay_scores": essay_scores,
             "time_taken": time_taken,
             "responses": scored_responses,
+            "timeline": session.timeline,
+            "seed": session.seed,
+            "source_test_ids": list(session.source_test_ids),
         }
 
     def save_attempt(
@@ -89,6 +119,9 @@ class ScoringService:
     ) -> int:
         """Persist a test attempt and its responses to the database.
 
+        The attempt and all responses are written in one transaction, then
+        the answered questions are rescheduled for spaced repetition.
+
         Args:
             test_id: The test that was taken.
             score_data: The dict returned by score_test().
@@ -104,13 +137,14 @@ class ScoringService:
             percentage=score_data["percentage"],
             time_taken=score_data["time_taken"],
             mode=mode,
+            responses=list(score_data["responses"]),
         )
-        attempt_id = self._db.save_attempt(attempt)
-
-        for response in score_data["responses"]:
-            response.attempt_id = attempt_id
-            self._db.save_response(response)
-
+        timeline = score_data.get("timeline")
+        if timeline is not None:
+            attempt.timeline = timeline.to_bytes()
+        attempt.seed, attempt.shuffle_version = self._seed_fields(score_data)
+        attempt_id = self._db.save_attempt_with_responses(attempt)
+        reschedule(self._db, attempt.responses)
         return attempt_id
 
     def save_mixed_attempt(
@@ -122,7 +156,9 @@ class ScoringService:
         """Save a mix test as separate per-source-test attempts.
 
         Groups responses by their originating test_id and saves one attempt
-        per source test so analytics track back to each original test.
+        per source test so analytics track back to each original test. The
+        attempts are linked by a parent session row and everything is saved
+        in a single transaction.
 
         Args:
             score_data: The dict returned by score_test().
@@ -138,44 +174,104 @@ class ScoringService:
             if q.test_id is not None:
                 qid_to_test[q.id] = q.test_id
 
-        # Group responses by source test
-        grouped: Dict[int, List[QuestionResponse]] = defaultdict(list)
+        seed, shuffle_version = self._seed_fields(score_data)
+
+        # One pass: group responses by source test and tally outcomes
+        grouped: Dict[int, TestAttempt] = {}
+        scored: Dict[int, int] = defaultdict(int)
         for response in score_data["responses"]:
             source_test_id = qid_to_test.get(response.question_id)
-            if source_test_id is not None:
-                grouped[source_test_id].append(response)
+            if source_test_id is None:
+                continue
+            attempt = grouped.get(source_test_id)
+            if attempt is None:
+                attempt = grouped[source_test_id] = TestAttempt(
+                    test_id=source_test_id,
+                    mode=mode,
+                    seed=seed,
+                    shuffle_version=shuffle_version,
+                )
+            attempt.responses.append(response)
+            if response.is_correct is not None:
+                scored[source_test_id] += 1
+                if response.is_correct:
+                    attempt.score += 1
 
         total_time = score_data.get("time_taken", 0)
+        timeline = score_data.get("timeline")
         total_questions = len(score_data["responses"])
 
-        attempt_ids: List[int] = []
-        for test_id, responses in grouped.items():
-            correct = sum(1 for r in responses if r.is_correct is True)
-            incorrect = sum(1 for r in responses if r.is_correct is False)
-            essays = sum(1 for r in responses if r.is_correct is None)
-            mc_total = correct + incorrect
-            percentage = (correct / mc_total * 100) if mc_total > 0 else 0.0
-
+        for test_id, attempt in grouped.items():
+            mc_total = scored[test_id]
+            attempt.total_questions = len(attempt.responses)
+            attempt.percentage = round(
+                (attempt.score / mc_total * 100) if mc_total > 0 else 0.0, 1
+            )
             # Proportional time allocation
-            proportion = len(responses) / total_questions if total_questions > 0 else 0
-            proportional_time = int(total_time * proportion)
-
-            per_test_score_data = {
-                "score": correct,
-                "total": mc_total,
-                "total_questions": len(responses),
-                "percentage": round(percentage, 1),
-                "correct_questions": correct,
-                "incorrect_questions": incorrect,
-                "essay_questions": essays,
-                "time_taken": proportional_time,
-                "responses": responses,
-            }
-
-            attempt_id = self.save_attempt(test_id, per_test_score_data, mode)
-            attempt_ids.append(attempt_id)
-
-        return attempt_ids
+            proportion = (
+                attempt.total_questions / total_questions if total_questions > 0 else 0
+            )
+            attempt.time_taken = int(total_time * proportion)
+            if timeline is not None:
+                attempt.timeline = timeline.to_bytes(
+                    r.question_id for r in attempt.responses
+                )
+
+        session = StudySession(
+            score=score_data["score"],
+            total_questions=score_data["total_questions"],
+            percentage=score_data["percentage"],
+            time_taken=total_time,
+            mode=mode,
+            seed=seed,
+            shuffle_version=shuffle_version,
+            source_test_ids=list(score_data.get("source_test_ids") or []),
+            attempts=list(grouped.values()),
+        )
+        self._db.save_session(session)
+        reschedule(
+            self._db, (r for attempt in session.attempts for r in attempt.responses)
+        )
+        return [attempt.id for attempt in session.attempts]
+
+    @staticmethod
+    def _seed_fields(score_data: Dict):
+        """(seed, generator version) to store for a scored session."""
+        seed = score_data.get("seed")
+        return seed, GENERATOR_VERSION if seed is not None else None
+
+    def override_response(
+        self, attempt_id: int, question_id: int, is_correct: Optional[bool]
+    ) -> None:
+        """Manually mark a saved response (e.g. to correct an essay grade).
+
+        The attempt's score and percentage are recomputed.
+        """
+        self._db.set_response_correct(attempt_id, question_id, is_correct)
+
+    def get_session_details(self, session_id: int) -> Optional[StudySession]:
+        """Load a saved mix session with its attempts and responses."""
+        return self._db.get_session_details(session_id)
+
+    def get_all_sessions(self) -> Dict[int, StudySession]:
+        """Get all mix sessions keyed by id."""
+        return self._db.get_all_sessions()
+
+    def rescore_questions(
+        self, question_ids: List[int], retyped_ids: Sequence[int] = ()
+    ) -> Dict[str, int]:
+        """Re-mark history after answer keys change.
+
+        Every saved response to the given questions is re-marked against
+        the current correct answer, and the scores and percentages of the
+        affected attempts are recomputed. Essay marks are kept unless the
+        question was just turned into an essay (listed in ``retyped_ids``),
+        which clears them. Safe to call from a background thread.
+
+        Returns:
+            Dict with responses_changed and attempts_changed.
+        """
+        return self._db.rescore_questions(question_ids, retyped_ids)
 
     def get_attempt_details(self, attempt_id: int) -> Optional[TestAttempt]:
         """Load a saved attempt with all responses."""
@@ -0,0 +1,201 @@
+"""Session journal — crash-safe, append-only log of an in-progress test."""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+JOURNAL_VERSION = 1
+
+# Seconds between group fsyncs of buffered events
+FLUSH_INTERVAL = 0.25
+
+# Event kinds (first element of each event record)
+EVENT_RESPONSE = "r"
+EVENT_FLAG = "f"
+EVENT_NAVIGATE = "n"
+EVENT_SWAP = "s"
+
+
+@dataclass
+class JournalState:
+    """An interrupted session rebuilt by replaying its journal.
+
+    ``question_order`` holds ``[question_id, [option_id, ...]]`` pairs in
+    the order the questions and options were shown.
+    """
+
+    test_id: Optional[int]
+    mode: str
+    title: str
+    question_order: List[list]
+    seed: Optional[int] = None
+    source_test_ids: List[int] = field(default_factory=list)
+    current_index: int = 0
+    responses: Dict[int, str] = field(default_factory=dict)
+    flagged: Set[int] = field(default_factory=set)
+    question_times: Dict[int, int] = field(default_factory=dict)
+    elapsed: int = 0
+
+
+class SessionJournal:
+    """Appends session events to a JSON-lines file in the data directory.
+
+    The first line is a header describing the session layout; every later
+    line is one compact event. Events are buffered in memory and a
+    background thread writes and fsyncs them every ``FLUSH_INTERVAL``
+    seconds, so answering questions never waits on the disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        header: Optional[Dict] = None,
+        flush_interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        """Open a journal.
+
+        Args:
+            path: Journal file path.
+            header: Session header for a new journal. If omitted, an
+                existing journal is reopened for appending.
+            flush_interval: Seconds between group fsyncs.
+        """
+        self.path = Path(path)
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        if header is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write_lines([_encode(dict(header, v=JOURNAL_VERSION))])
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, args=(flush_interval,), daemon=True
+        )
+        self._flusher.start()
+
+    def append(self, event: list) -> None:
+        """Buffer one event; it reaches the disk at the next group flush."""
+        if self._closed:
+            return
+        with self._buffer_lock:
+            self._buffer.append(_encode(event))
+
+    def flush(self) -> None:
+        """Write and fsync all buffered events now."""
+        with self._buffer_lock:
+            lines, self._buffer = self._buffer, []
+        if lines:
+            self._write_lines(lines)
+
+    def close(self) -> None:
+        """Flush remaining events and stop the background writer."""
+        if self._closed:
+            return
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        self._closed = True
+        self._file.close()
+
+    def discard(self) -> None:
+        """Close the journal and delete its file."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _flush_loop(self, interval: float) -> None:
+        """Group-commit buffered events until closed."""
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """Append lines to the file and force them to disk."""
+        with self._write_lock:
+            self._file.write("".join(line + "\n" for line in lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    # ── Recovery ───────────────────────────────────────────────
+
+    @staticmethod
+    def replay(path: str) -> Optional[JournalState]:
+        """Rebuild the session state recorded in a journal file.
+
+        A torn final line from a crash mid-write is ignored.
+
+        Args:
+            path: Journal file path.
+
+        Returns:
+            The recovered state, or None if there is no usable journal.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return None
+
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if header.get("v") != JOURNAL_VERSION:
+            return None
+
+        state = JournalState(
+            test_id=header.get("test_id"),
+            mode=header.get("mode", "test"),
+            title=header.get("title", ""),
+            question_order=header.get("questions", []),
+            seed=header.get("seed"),
+            source_test_ids=header.get("source_test_ids", []),
+        )
+        for line in lines[1:]:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break
+            _apply_event(state, event)
+        return state
+
+
+def _encode(record) -> str:
+    """Serialize a record as one compact JSON line."""
+    return json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+
+
+def _apply_event(state: JournalState, event: list) -> None:
+    """Apply one journal event to the recovered state."""
+    kind = event[0]
+    if kind == EVENT_RESPONSE:
+        _, question_id, answer, elapsed = event
+        if answer:
+            state.responses[question_id] = answer
+        else:
+            state.responses.pop(question_id, None)
+    elif kind == EVENT_FLAG:
+        _, question_id, flagged, elapsed = event
+        if flagged:
+            state.flagged.add(question_id)
+        else:
+            state.flagged.discard(question_id)
+    elif kind == EVENT_SWAP:
+        _, i, j, elapsed = event
+        order = state.question_order
+        order[i], order[j] = order[j], order[i]
+    elif kind == EVENT_NAVIGATE:
+        _, index, question_id, seconds, elapsed = event
+        state.current_index = index
+        if question_id is not None:
+            state.question_times[question_id] = seconds
+    else:
+        return
+    state.elapsed = elapsed
@@ -0,0 +1,229 @@
+"""Compact, index-based state for a test session."""
+
+from array import array
+from collections.abc import MutableMapping, MutableSet
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+
+class Bitset:
+    """Fixed-size set of positions stored one bit per position."""
+
+    def __init__(self, size: int) -> None:
+        self._bits = bytearray((size + 7) // 8)
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def set(self, index: int, value: bool) -> bool:
+        """Set or clear a bit. Returns True if it changed."""
+        mask = 1 << (index & 7)
+        byte = self._bits[index >> 3]
+        if bool(byte & mask) == value:
+            return False
+        self._bits[index >> 3] = byte | mask if value else byte & ~mask
+        return True
+
+    def clear(self) -> None:
+        """Clear every bit."""
+        self._bits[:] = bytes(len(self._bits))
+
+
+class SessionState:
+    """Answers, flags and times of a session, stored by question position.
+
+    Answers live in a positional list, times in an ``array('q')`` of
+    nanoseconds, and answered/flagged/timed status in bitsets, so a
+    session of thousands of questions stays small. Answered and flagged
+    counts are kept up to date on every change, and every changed
+    position is added to ``dirty`` until the UI collects it.
+    """
+
+    def __init__(self, question_ids: Sequence[int]) -> None:
+        size = len(question_ids)
+        self.question_ids: List[int] = list(question_ids)
+        self.index_of: Dict[int, int] = {
+            qid: i for i, qid in enumerate(self.question_ids)
+        }
+        self.answers: List[Optional[str]] = [None] * size
+        self.times_ns = array("q", bytes(8 * size))
+        self.answered = Bitset(size)
+        self.flagged = Bitset(size)
+        self.timed = Bitset(size)
+        self.answered_count = 0
+        self.flagged_count = 0
+        self.dirty: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def set_answer(self, index: int, answer: Optional[str]) -> bool:
+        """Store (or clear, if empty) the answer at a position.
+
+        Returns:
+            True if the answer changed.
+        """
+        answer = answer or None
+        if self.answers[index] == answer:
+            return False
+        self.answers[index] = answer
+        if self.answered.set(index, answer is not None):
+            self.answered_count += 1 if answer is not None else -1
+        self.dirty.add(index)
+        return True
+
+    def set_flag(self, index: int, flagged: bool) -> bool:
+        """Flag or unflag a position. Returns True if it changed."""
+        if not self.flagged.set(index, flagged):
+            return False
+        self.flagged_count += 1 if flagged else -1
+        self.dirty.add(index)
+        return True
+
+    def add_time(self, index: int, ns: int) -> int:
+        """Add viewing time to a position and return its new total (ns)."""
+        self.times_ns[index] += ns
+        self.timed.set(index, True)
+        return self.times_ns[index]
+
+    def set_time(self, index: int, ns: int) -> None:
+        """Overwrite the viewing time of a position."""
+        self.times_ns[index] = ns
+        self.timed.set(index, True)
+
+    def clear_answers(self) -> None:
+        """Remove every answer."""
+        for index in range(len(self)):
+            self.set_answer(index, None)
+
+    def clear_flags(self) -> None:
+        """Remove every flag."""
+        for index in range(len(self)):
+            self.set_flag(index, False)
+
+    def clear_times(self) -> None:
+        """Forget all recorded times."""
+        self.times_ns = array("q", bytes(8 * len(self)))
+        self.timed.clear()
+
+    def swap(self, i: int, j: int) -> None:
+        """Exchange the questions (and all their state) at two positions."""
+        if i == j:
+            return
+        ids = self.question_ids
+        ids[i], ids[j] = ids[j], ids[i]
+        self.index_of[ids[i]], self.index_of[ids[j]] = i, j
+        self.answers[i], self.answers[j] = self.answers[j], self.answers[i]
+        self.times_ns[i], self.times_ns[j] = self.times_ns[j], self.times_ns[i]
+        for bits in (self.answered, self.flagged, self.timed):
+            at_i, at_j = i in bits, j in bits
+            bits.set(i, at_j)
+            bits.set(j, at_i)
+        self.dirty.update((i, j))
+
+    def take_dirty(self) -> List[int]:
+        """Return the positions changed since the last call, in order."""
+        dirty = sorted(self.dirty)
+        self.dirty.clear()
+        return dirty
+
+    def mark_dirty(self, *indices: int) -> None:
+        """Mark positions as needing a UI refresh (e.g. on navigation)."""
+        self.dirty.update(i for i in indices if 0 <= i < len(self))
+
+
+# ── Question-id views ──────────────────────────────────────────
+# Keep the dict/set interface of the old session attributes working on
+# top of the positional storage.
+
+
+class ResponsesView(MutableMapping):
+    """question_id → answer text, for answered questions only."""
+
+    def __init__(self, state: SessionState) -> None:
+        self._state = state
+
+    def __getitem__(self, question_id: int) -> str:
+        index = self._state.index_of.get(question_id)
+        if index is None or index not in self._state.answered:
+            raise KeyError(question_id)
+        return self._state.answers[index]
+
+    def __setitem__(self, question_id: int, answer: str) -> None:
+        self._state.set_answer(self._state.index_of[question_id], answer)
+
+    def __delitem__(self, question_id: int) -> None:
+        self[question_id]  # KeyError if not answered
+        self._state.set_answer(self._state.index_of[question_id], None)
+
+    def __contains__(self, question_id) -> bool:
+        index = self._state.index_of.get(question_id)
+        return index is not None and index in self._state.answered
+
+    def __iter__(self) -> Iterator[int]:
+        state = self._state
+        return (qid for i, qid in enumerate(state.question_ids) if i in state.answered)
+
+    def __len__(self) -> int:
+        return self._state.answered_count
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class FlaggedView(MutableSet):
+    """Set of flagged question ids."""
+
+    def __init__(self, state: SessionState) -> None:
+        self._state = state
+
+    def __contains__(self, question_id) -> bool:
+        index = self._state.index_of.get(question_id)
+        return index is not None and index in self._state.flagged
+
+    def __iter__(self) -> Iterator[int]:
+        state = self._state
+        return (qid for i, qid in enumerate(state.question_ids) if i in state.flagged)
+
+    def __len__(self) -> int:
+        return self._state.flagged_count
+
+    def add(self, question_id: int) -> None:
+        self._state.set_flag(self._state.index_of[question_id], True)
+
+    def discard(self, question_id: int) -> None:
+        index = self._state.index_of.get(question_id)
+        if index is not None:
+            self._state.set_flag(index, False)
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+
+class QuestionTimesView(MutableMapping):
+    """question_id → seconds spent, rounded, for questions that were timed."""
+
+    def __init__(self, state: SessionState) -> None:
+        self._state = state
+
+    def __getitem__(self, question_id: int) -> int:
+        index = self._state.index_of.get(question_id)
+        if index is None or index not in self._state.timed:
+            raise KeyError(question_id)
+        # Round rather than truncate so quick answers are not all 0 s
+        return (self._state.times_ns[index] + 500_000_000) // 1_000_000_000
+
+    def __setitem__(self, question_id: int, seconds: int) -> None:
+        self._state.set_time(self._state.index_of[question_id], seconds * 1_000_000_000)
+
+    def __delitem__(self, question_id: int) -> None:
+        raise TypeError("Question times cannot be removed individually.")
+
+    def __iter__(self) -> Iterator[int]:
+        state = self._state
+        return (qid for i, qid in enumerate(state.question_ids) if i in state.timed)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
@@ -0,0 +1,129 @@
+"""Spaced-repetition scheduling (SM-2) for individual questions."""
+
+import time
+from typing import Iterable, List, Optional
+
+from database.db_manager import DatabaseManager
+from models.question import Question
+from models.review_card import ReviewCard
+from models.test_result import QuestionResponse
+
+SECONDS_PER_DAY = 86400
+MIN_EASE = 1.3
+
+# SM-2 recall quality (0-5) given to a response
+QUALITY_CORRECT = 4
+QUALITY_UNSURE = 3  # correct but flagged
+QUALITY_INCORRECT = 1
+
+
+def response_quality(response: QuestionResponse) -> Optional[int]:
+    """SM-2 quality of a scored response, or None if it was not scored."""
+    if response.is_correct is None:
+        return None
+    if not response.is_correct:
+        return QUALITY_INCORRECT
+    return QUALITY_UNSURE if response.was_flagged else QUALITY_CORRECT
+
+
+def schedule(card: ReviewCard, quality: int, now: float) -> ReviewCard:
+    """Apply one SM-2 review to a card in place.
+
+    A recalled card (quality 3+) moves to the next interval: 1 day, then
+    6 days, then the previous interval times the ease. A lapse resets the
+    card to a 1-day interval. The ease moves with the quality either way
+    and never drops below MIN_EASE.
+
+    Args:
+        card: The card to update.
+        quality: Recall quality from 0 (blackout) to 5 (perfect).
+        now: Review time in unix seconds.
+
+    Returns:
+        The same card.
+    """
+    if quality >= 3:
+        if card.repetitions == 0:
+            card.interval_days = 1.0
+        elif card.repetitions == 1:
+            card.interval_days = 6.0
+        else:
+            card.interval_days = round(card.interval_days * card.ease, 1)
+        card.repetitions += 1
+    else:
+        card.repetitions = 0
+        card.interval_days = 1.0
+        card.lapses += 1
+
+    miss = 5 - quality
+    card.ease = max(MIN_EASE, card.ease + 0.1 - miss * (0.08 + miss * 0.02))
+    card.last_reviewed = now
+    card.due_at = now + card.interval_days * SECONDS_PER_DAY
+    return card
+
+
+def reschedule(
+    db: DatabaseManager,
+    responses: Iterable[QuestionResponse],
+    now: Optional[float] = None,
+) -> int:
+    """Apply a batch of saved responses to the review schedule.
+
+    Existing cards are read with one query and every updated card is
+    written in one transaction. Essay responses that were not graded are
+    skipped.
+
+    Args:
+        db: Database to update.
+        responses: Responses from a saved attempt.
+        now: Review time in unix seconds (defaults to now).
+
+    Returns:
+        Number of cards updated.
+    """
+    graded = []
+    for response in responses:
+        quality = response_quality(response)
+        if quality is not None:
+            graded.append((response.question_id, quality))
+    if not graded:
+        return 0
+    now = time.time() if now is None else now
+
+    cards = db.get_review_cards([qid for qid, _ in graded])
+    for question_id, quality in graded:
+        card = cards.setdefault(question_id, ReviewCard(question_id))
+        schedule(card, quality, now)
+    db.save_review_cards(list(cards.values()))
+    return len(cards)
+
+
+class SpacedRepetitionService:
+    """Reads and updates the review schedule of answered questions.
+
+    The schedule is indexed by due time, so the due queue is read as a
+    range scan however many cards are scheduled.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+
+    def record_responses(
+        self, responses: Iterable[QuestionResponse], now: Optional[float] = None
+    ) -> int:
+        """Reschedule every question answered in a batch of responses."""
+        return reschedule(self._db, responses, now)
+
+    def get_due(self, limit: int = 50, now: Optional[float] = None) -> List[int]:
+        """Ids of up to ``limit`` due questions, most overdue first."""
+        return self._db.get_due_question_ids(time.time() if now is None else now, limit)
+
+    def count_due(self, now: Optional[float] = None) -> int:
+        """Number of questions due for review."""
+        return self._db.count_due_reviews(time.time() if now is None else now)
+
+    def get_due_questions(
+        self, limit: int = 50, now: Optional[float] = None
+    ) -> List[Question]:
+        """Load the due questions, most overdue first, in one batch."""
+        return self._db.get_questions_by_ids(self.get_due(limit, now))
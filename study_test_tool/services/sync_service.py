@@ -0,0 +1,86 @@
+"""Sync service — delta export/import of changes between machines."""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from database.db_manager import SYNC_TABLES, DatabaseManager
+
+SYNC_FORMAT = "study_tool_changes"
+SYNC_FORMAT_VERSION = 1
+
+
+class SyncService:
+    """Exports and applies change sets so two databases stay in step.
+
+    Every row carries a uuid and a change counter, so a sync only moves
+    the rows touched since the other machine last pulled.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+
+    def get_current_cursor(self) -> int:
+        """Return the cursor that covers every change made so far."""
+        return self._db.get_change_cursor()
+
+    def export_changes_since(self, cursor: int, file_path: str) -> int:
+        """Write every change made after ``cursor`` to a change file.
+
+        Args:
+            cursor: The cursor returned by the previous export (0 for all).
+            file_path: Destination path for the change file.
+
+        Returns:
+            The new cursor to pass to the next export.
+        """
+        changes = self._db.get_changes_since(cursor)
+        data = {
+            "format": SYNC_FORMAT,
+            "version": SYNC_FORMAT_VERSION,
+            **changes,
+        }
+
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+
+        return changes["cursor"]
+
+    def apply_changes(self, file_path: str) -> Dict[str, int]:
+        """Apply a change file exported on another machine.
+
+        Args:
+            file_path: Path to the change file.
+
+        Returns:
+            Dict with inserted, updated, deleted, and skipped row counts.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the file is not a change file.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self._validate_change_format(data)
+        return self._db.apply_changes(data)
+
+    @staticmethod
+    def _validate_change_format(data: Dict) -> None:
+        """Validate the structure of a change file."""
+        if not isinstance(data, dict) or data.get("format") != SYNC_FORMAT:
+            raise ValueError("Not a Study Testing Tool change file.")
+        if data.get("version") != SYNC_FORMAT_VERSION:
+            raise ValueError(f"Unsupported change file version: {data.get('version')}")
+        for table, _, _ in SYNC_TABLES:
+            if not isinstance(data.get(table, []), list):
+                raise ValueError(f"'{table}' must be an array.")
+        if not isinstance(data.get("deleted", []), list):
+            raise ValueError("'deleted' must be an array.")
@@ -39,6 +39,10 @@ class TestService:
         """Get the number of questions in a test."""
         return self._db.get_question_count(test_id)
 
+    def get_question_counts(self) -> Dict[int, int]:
+        """Get question counts for every test, keyed by test id."""
+        return self._db.get_question_counts()
+
     def get_group_names(self) -> List[str]:
         """Get all distinct group names."""
         return self._db.get_distinct_group_names()
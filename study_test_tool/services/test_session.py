@@ -1,13 +1,37 @@
 """Test session — tracks state during test-taking."""
 
 import time
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Mapping, Optional, Set
 
 from models.question import Question
+from services.rating_service import AdaptiveSelector, RatingEngine
+from services.scoring_service import ScoringService
+from services.session_journal import (
+    EVENT_FLAG,
+    EVENT_NAVIGATE,
+    EVENT_RESPONSE,
+    EVENT_SWAP,
+    JournalState,
+    SessionJournal,
+)
+from services.session_state import (
+    FlaggedView,
+    QuestionTimesView,
+    ResponsesView,
+    SessionState,
+)
+from utils import timeline as events
+from utils.constants import MODE_PRACTICE
+from utils.timeline import Timeline
 
 
 class TestSession:
-    """Manages the state of an active test-taking session."""
+    """Manages the state of an active test-taking session.
+
+    Per-question state is kept by position in a SessionState;
+    ``responses``, ``flagged`` and ``question_times`` are id-keyed views
+    over it and can also be assigned a whole dict or set.
+    """
 
     def __init__(
         self,
@@ -18,17 +42,117 @@ class TestSession:
         self.test_id: Optional[int] = test_id
         self.questions: List[Question] = questions
         self.mode: str = mode
-        self.current_index: int = 0
-        self.responses: Dict[int, str] = {}  # question_id → answer text
-        self.flagged: Set[int] = set()  # question_ids
-        self.question_times: Dict[int, int] = {}  # question_id → seconds
-        self._start_time: float = 0.0
-        self._question_start_time: float = 0.0
+        self.state = SessionState([q.id for q in questions])
+        self._current_index: int = 0
+        self._responses = ResponsesView(self.state)
+        self._flagged = FlaggedView(self.state)
+        self._question_times = QuestionTimesView(self.state)
+        self.timeline: Timeline = Timeline()
+        self.seed: Optional[int] = None  # layout seed, if shuffled
+        self.source_test_ids: List[int] = []  # tests a mix was drawn from
+        self._start_ns: Optional[int] = None  # perf_counter_ns at start
+        self._question_start_ns: Optional[int] = None
+        self.journal: Optional[SessionJournal] = None
+        self.ratings: Optional[RatingEngine] = None  # practice-mode ratings
+        self.selector: Optional[AdaptiveSelector] = None  # adaptive order
+        self._rated: Set[int] = set()
+
+    @classmethod
+    def from_journal(
+        cls, state: JournalState, questions: List[Question]
+    ) -> "TestSession":
+        """Rebuild an interrupted session from its replayed journal.
+
+        Args:
+            state: The state returned by SessionJournal.replay().
+            questions: The session's questions, already in journal order.
+
+        Returns:
+            A started session positioned where the journal left off.
+        """
+        session = cls(state.test_id, questions, mode=state.mode)
+        session.seed = state.seed
+        session.source_test_ids = list(state.source_test_ids)
+        session.current_index = min(state.current_index, len(questions) - 1)
+        session.responses = dict(state.responses)
+        session.flagged = set(state.flagged)
+        session.question_times = dict(state.question_times)
+        session.start()
+        session._start_ns -= state.elapsed * 1_000_000_000
+        return session
+
+    # ── Id-keyed views ──────────────────────────────────────────
+
+    @property
+    def responses(self) -> ResponsesView:
+        """question_id → answer text, for answered questions."""
+        return self._responses
+
+    @responses.setter
+    def responses(self, value: Mapping[int, str]) -> None:
+        self.state.clear_answers()
+        for question_id, answer in value.items():
+            self._responses[question_id] = answer
+
+    @property
+    def flagged(self) -> FlaggedView:
+        """Set of flagged question ids."""
+        return self._flagged
+
+    @flagged.setter
+    def flagged(self, value: Set[int]) -> None:
+        self.state.clear_flags()
+        for question_id in value:
+            self._flagged.add(question_id)
+
+    @property
+    def question_times(self) -> QuestionTimesView:
+        """question_id → seconds spent (rounded), for visited questions."""
+        return self._question_times
+
+    @question_times.setter
+    def question_times(self, value: Mapping[int, int]) -> None:
+        self.state.clear_times()
+        for question_id, seconds in value.items():
+            self._question_times[question_id] = seconds
+
+    @property
+    def current_index(self) -> int:
+        """Position of the question being shown."""
+        return self._current_index
+
+    @current_index.setter
+    def current_index(self, index: int) -> None:
+        if index != self._current_index:
+            self.state.mark_dirty(self._current_index, index)
+        self._current_index = index
+
+    def take_dirty_indices(self) -> List[int]:
+        """Positions whose status or current-ness changed since last asked."""
+        return self.state.take_dirty()
+
+    def layout(self) -> List[list]:
+        """Question and option ids in display order, for the journal header."""
+        return [[q.id, [o.id for o in q.options]] for q in self.questions]
+
+    def _log(self, event: list) -> None:
+        """Append an event to the journal, if one is attached."""
+        if self.journal is not None:
+            self.journal.append(event + [self.get_elapsed_time()])
 
     def start(self) -> None:
-        """Start the test session and begin timing."""
-        self._start_time = time.time()
-        self._question_start_time = time.time()
+        """Start the test session and begin timing.
+
+        Timing uses the monotonic ``perf_counter_ns`` clock, so durations
+        are unaffected by wall-clock changes.
+        """
+        now = time.perf_counter_ns()
+        self._start_ns = now
+        self._question_start_ns = now
+        self.timeline.start(now)
+        question = self.get_current_question()
+        if question:
+            self.timeline.record(events.VIEW_ENTER, question.id, now)
 
     def get_current_question(self) -> Optional[Question]:
         """Get the current question."""
@@ -38,10 +162,61 @@ class TestSession:
 
     def save_response(self, question_id: int, answer: str) -> None:
         """Save or update a response for a question."""
+        index = self.state.index_of[question_id]
+        previous = self.state.answers[index]
+        if not self.state.set_answer(index, answer):
+            return
         if answer:
-            self.responses[question_id] = answer
-        elif question_id in self.responses:
-            del self.responses[question_id]
+            kind = events.ANSWER_CHANGE if previous else events.ANSWER_SET
+        else:
+            kind = events.ANSWER_CLEAR
+        self.timeline.record(kind, question_id)
+        self._log([EVENT_RESPONSE, question_id, answer])
+        if answer and self.ratings is not None and self.mode == MODE_PRACTICE:
+            self._rate(self.questions[index], answer)
+
+    def _rate(self, question: Question, answer: str) -> None:
+        """Update difficulty ratings from a question's first graded answer."""
+        if question.id in self._rated:
+            return
+        correct = ScoringService.score_question(question, answer)
+        if correct is not None:
+            self._rated.add(question.id)
+            self.ratings.record(question, correct)
+
+    # ── Adaptive order ──────────────────────────────────────────
+
+    def enable_adaptive(self, ratings: RatingEngine) -> None:
+        """Serve unseen questions by how well they match current ability.
+
+        Whenever the session moves to a question that has not been shown
+        yet, the best-matching unseen question is swapped into that
+        position first. Call before ``start``.
+
+        Args:
+            ratings: Engine supplying difficulties and abilities; it is
+                also updated as questions are answered.
+        """
+        self.ratings = ratings
+        ratings.load(self.questions)
+        self.questions = list(self.questions)
+        self.selector = AdaptiveSelector(ratings, self.questions)
+        self._serve(self.current_index)
+
+    def _serve(self, index: int) -> None:
+        """Put the best unseen question at ``index`` and mark it seen."""
+        if self.selector is None or self.questions[index].id not in self.selector:
+            return
+        best = self.selector.best()
+        j = self.state.index_of[best]
+        if j != index:
+            self.questions[index], self.questions[j] = (
+                self.questions[j],
+                self.questions[index],
+            )
+            self.state.swap(index, j)
+            self._log([EVENT_SWAP, index, j])
+        self.selector.discard(best)
 
     def flag_question(self, question_id: int) -> bool:
         """Toggle the flagged status of a question.
@@ -49,63 +224,93 @@ class TestSession:
         Returns:
             True if now flagged, False if unflagged.
         """
-        if question_id in self.flagged:
-            self.flagged.discard(question_id)
-            return False
-        self.flagged.add(question_id)
-        return True
-
-    def _record_question_time(self) -> None:
-        """Record time spent on the current question."""
-        if self._question_start_time > 0:
+        index = self.state.index_of[question_id]
+        flagged = index not in self.state.flagged
+        self.state.set_flag(index, flagged)
+        self.timeline.record(events.FLAG if flagged else events.UNFLAG, question_id)
+        self._log([EVENT_FLAG, question_id, int(flagged)])
+        return flagged
+
+    def _record_question_time(self) -> Optional[int]:
+        """Record time spent on the current question.
+
+        Returns:
+            The id of the question the time was recorded for, if any.
+        """
+        recorded = None
+        now = time.perf_counter_ns()
+        if self._question_start_ns is not None:
             question = self.get_current_question()
             if question:
-                elapsed = int(time.time() - self._question_start_time)
-                existing = self.question_times.get(question.id, 0)
-                self.question_times[question.id] = existing + elapsed
-        self._question_start_time = time.time()
+                self.state.add_time(self.current_index, now - self._question_start_ns)
+                recorded = question.id
+        self._question_start_ns = now
+        return recorded
+
+    def _move_to(self, index: int) -> Optional[Question]:
+        """Record the current question's time and move to ``index``."""
+        left = self._record_question_time()
+        moved = 0 <= index < len(self.questions)
+        if moved and index != self.current_index:
+            self._serve(index)
+            now = self._question_start_ns
+            if left is not None:
+                self.timeline.record(events.VIEW_EXIT, left, now)
+            self.current_index = index
+            self.timeline.record(events.VIEW_ENTER, self.questions[index].id, now)
+        elif moved:
+            self.current_index = index
+        self._log(
+            [
+                EVENT_NAVIGATE,
+                self.current_index,
+                left,
+                self.question_times.get(left, 0) if left is not None else 0,
+            ]
+        )
+        return self.get_current_question() if moved else None
 
     def next_question(self) -> Optional[Question]:
         """Move to the next question. Returns it, or None if at the end."""
-        self._record_question_time()
-        if self.current_index < len(self.questions) - 1:
-            self.current_index += 1
-            return self.get_current_question()
-        return None
+        return self._move_to(self.current_index + 1)
 
     def previous_question(self) -> Optional[Question]:
         """Move to the previous question. Returns it, or None if at start."""
-        self._record_question_time()
-        if self.current_index > 0:
-            self.current_index -= 1
-            return self.get_current_question()
-        return None
+        return self._move_to(self.current_index - 1)
 
     def go_to_question(self, index: int) -> Optional[Question]:
         """Jump to a specific question by index."""
-        self._record_question_time()
-        if 0 <= index < len(self.questions):
-            self.current_index = index
-            return self.get_current_question()
-        return None
+        return self._move_to(index)
 
     def finish_test(self) -> None:
         """Finalize the session, recording the last question's time."""
-        self._record_question_time()
+        left = self._record_question_time()
+        if left is not None:
+            self.timeline.record(events.VIEW_EXIT, left, self._question_start_ns)
 
     def get_elapsed_time(self) -> int:
         """Get total elapsed time in seconds since start."""
-        if self._start_time > 0:
-            return int(time.time() - self._start_time)
+        if self._start_ns is not None:
+            return (time.perf_counter_ns() - self._start_ns) // 1_000_000_000
         return 0
 
+    @property
+    def question_times_ms(self) -> Dict[int, int]:
+        """Time spent per question in milliseconds."""
+        state = self.state
+        return {
+            qid: state.times_ns[i] // 1_000_000
+            for i, qid in enumerate(state.question_ids)
+            if i in state.timed
+        }
+
     def get_unanswered_count(self) -> int:
         """Get the number of unanswered questions."""
-        return len(self.questions) - len(self.responses)
+        return len(self.questions) - self.state.answered_count
 
     def get_flagged_count(self) -> int:
         """Get the number of flagged questions."""
-        return len(self.flagged)
+        return self.state.flagged_count
 
     @property
     def total_questions(self) -> int:
@@ -0,0 +1,89 @@
+"""Validation service — finds incomplete questions across the library."""
+
+from typing import Dict, List, Optional, Sequence
+
+from config.settings import QUESTION_TYPE_ESSAY, QUESTION_TYPE_MC
+from database.db_manager import DatabaseManager
+from models.question import Question
+
+
+class ValidationService:
+    """Checks tests for missing answers and malformed options.
+
+    All checks come from one aggregate query, so validating the whole
+    library never loads question or option objects.
+    """
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self._db = DatabaseManager(db_path)
+
+    def validate_library(self) -> Dict[int, List[str]]:
+        """Validate every test.
+
+        Returns:
+            Dict mapping test_id to its warning messages. Tests without
+            problems are omitted.
+        """
+        return self._collect(self._db.get_question_problems())
+
+    def validate_tests(self, test_ids: Sequence[int]) -> Dict[int, List[str]]:
+        """Validate the given tests.
+
+        Returns:
+            Dict mapping test_id to its warning messages. Tests without
+            problems are omitted.
+        """
+        return self._collect(self._db.get_question_problems(list(test_ids)))
+
+    def validate_questions(self, questions: Sequence[Question]) -> List[str]:
+        """Apply the same checks to unsaved questions, e.g. an import preview.
+
+        Returns:
+            Warning messages, numbered by position in ``questions``.
+        """
+        messages: List[str] = []
+        for position, question in enumerate(questions, start=1):
+            messages.extend(
+                self._describe(
+                    {
+                        "position": position,
+                        "question_type": question.type,
+                        "missing_answer": not (question.correct_answer or "").strip(),
+                        "option_count": len(question.options),
+                        "correct_count": sum(o.is_correct for o in question.options),
+                    }
+                )
+            )
+        return messages
+
+    def _collect(self, problems: List[Dict]) -> Dict[int, List[str]]:
+        """Group problem rows into warning messages per test."""
+        warnings: Dict[int, List[str]] = {}
+        for problem in problems:
+            messages = self._describe(problem)
+            if messages:
+                warnings.setdefault(problem["test_id"], []).extend(messages)
+        return warnings
+
+    @staticmethod
+    def _describe(problem: Dict) -> List[str]:
+        """Turn one problem row into warning messages."""
+        label = f"Q{problem['position']}"
+        q_type = problem["question_type"]
+        missing = bool(problem["missing_answer"])
+        option_count = problem["option_count"]
+        correct_count = problem["correct_count"]
+
+        if q_type == QUESTION_TYPE_ESSAY:
+            return [f"{label} (essay) has no expected answer set."] if missing else []
+        if q_type != QUESTION_TYPE_MC:
+            return []
+
+        messages = []
+        if missing or (option_count and correct_count == 0):
+            messages.append(f"{label} has no correct answer set.")
+        if option_count == 0:
+            messages.append(f"{label} has no answer options.")
+        elif correct_count > 1:
+            messages.append(f"{label} has {correct_count} options marked correct.")
+        return messages
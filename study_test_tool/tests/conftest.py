@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from config.database import initialize_database
 from database.db_manager import DatabaseManager
+from database.migrations import run_migrations
 
 
 @pytest.fixture
@@ -31,8 +32,9 @@ def db_path():
 
 @pytest.fixture
 def db(db_path):
-    """Provide a fresh database with schema applied."""
+    """Provide a fresh database with schema and migrations applied."""
     initialize_database(db_path)
+    run_migrations(db_path)
     return DatabaseManager(db_path)
 
 
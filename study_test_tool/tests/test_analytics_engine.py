@@ -0,0 +1,150 @@
+"""Tests for the in-memory analytics engine."""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from models.test_result import QuestionResponse, TestAttempt
+from services.analytics_engine import AnalyticsEngine
+
+
+def _dashboards(source, test_id):
+    """Every dashboard the engine replaces, from the engine or the database."""
+    if isinstance(source, AnalyticsEngine):
+        source.refresh()
+        return (
+            source.scores_over_time(None, "test"),
+            source.scores_over_time(test_id, "practice"),
+            source.average_scores_by_test("test"),
+            source.attempt_frequency(30),
+            source.category_performance(None),
+            source.category_performance(test_id),
+        )
+    return (
+        source.get_scores_over_time(None, "test"),
+        source.get_scores_over_time(test_id, "practice"),
+        source.get_average_scores_by_test("test"),
+        source.get_attempt_frequency(30),
+        source.get_category_performance(None),
+        source.get_category_performance(test_id),
+    )
+
+
+def _fail(*args):
+    raise AssertionError("unexpected call")
+
+
+def _save_attempt(db, test_id, correct, time_spent=None):
+    questions = [q for q in db.get_questions_for_test(test_id) if q.options]
+    attempt = TestAttempt(
+        test_id=test_id,
+        score=int(correct) * len(questions),
+        total_questions=len(questions),
+        percentage=100.0 if correct else 0.0,
+        responses=[
+            QuestionResponse(
+                question_id=q.id,
+                user_answer="x",
+                is_correct=correct,
+                time_spent=time_spent,
+            )
+            for q in questions
+        ],
+    )
+    return db.save_attempt_with_responses(attempt)
+
+
+@pytest.fixture
+def far_east_tz(monkeypatch):
+    """Run in UTC+14, where local and UTC days differ for half the day."""
+    monkeypatch.setenv("TZ", "LOC-14")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestAnalyticsEngine:
+    """The engine must agree with the SQL aggregations it replaces."""
+
+    def test_matches_sql(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        assert _dashboards(AnalyticsEngine(db), test_id) == _dashboards(db, test_id)
+
+    def test_empty_history(self, db):
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+        assert engine.scores_over_time() == []
+        assert engine.average_scores_by_test() == []
+        assert engine.attempt_frequency() == []
+        assert engine.category_performance() == []
+
+    def test_attempt_frequency_uses_local_days(self, db_with_attempts, far_east_tz):
+        db, test_id = db_with_attempts
+        noon = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0)
+        completed = (noon - timedelta(days=2)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = sqlite3.connect(db._db_path)
+        try:
+            conn.execute("UPDATE test_attempts SET completed_at = ?", (completed,))
+            conn.commit()
+        finally:
+            conn.close()
+
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+        local_day = (noon - timedelta(days=1)).date().isoformat()
+        assert engine.attempt_frequency(30) == [{"day": local_day, "count": 3}]
+        assert db.get_attempt_frequency(30) == engine.attempt_frequency(30)
+
+    def test_new_attempts_are_appended(self, db_with_attempts, monkeypatch):
+        db, test_id = db_with_attempts
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+        loaded = len(engine._r_id)
+
+        _save_attempt(db, test_id, correct=False)
+        monkeypatch.setattr(engine, "_reset", _fail)
+        assert _dashboards(engine, test_id) == _dashboards(db, test_id)
+        assert len(engine._r_id) == loaded + 2
+
+    def test_edits_trigger_a_reload(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+
+        attempt_id = _save_attempt(db, test_id, correct=False)
+        question_id = db.get_attempt_details(attempt_id).responses[0].question_id
+        db.set_response_correct(attempt_id, question_id, True)
+        assert _dashboards(engine, test_id) == _dashboards(db, test_id)
+
+        db.delete_test(test_id)
+        engine.refresh()
+        assert engine.scores_over_time() == []
+        assert engine.category_performance() == []
+
+    def test_unchanged_database_is_not_reread(self, db_with_attempts, monkeypatch):
+        db, _ = db_with_attempts
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+
+        monkeypatch.setattr(db, "get_analytics_snapshot", _fail)
+        engine.refresh()
+
+    def test_response_time_percentiles(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        times = [4, 30, 7, 12, 90]
+        for i, seconds in enumerate(times):
+            _save_attempt(db, test_id, correct=i % 2 == 0, time_spent=seconds)
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+
+        result = engine.response_times(test_id)
+        assert [row["answers"] for row in result["questions"]] == [5, 5]
+        for row in result["questions"] + result["categories"]:
+            assert row["p50"] == round(float(np.percentile(times, 50)), 1)
+            assert row["p90"] == round(float(np.percentile(times, 90)), 1)
+            assert (row["graded"], row["correct"]) == (5, 3)
+        assert engine.response_times(test_id + 1) == {"questions": [], "categories": []}
@@ -1,8 +1,19 @@
 """Tests for the analytics service and weak topic identification."""
 
+import sqlite3
+from datetime import datetime, timezone
+
 import pytest
 
-from services.analytics_service import AnalyticsService
+from models.question import Question, QuestionOption
+from models.test import Test
+from models.test_result import QuestionResponse, TestAttempt
+from services.analytics_service import (
+    FLAG_FAST_WRONG,
+    FLAG_SLOW_CORRECT,
+    WEEKDAY_LABELS,
+    AnalyticsService,
+)
 
 
 class TestScoresOverTime:
@@ -174,3 +185,201 @@ class TestWeakTopics:
 
         topics = service.get_weak_topics(test_id=test_id)
         assert len(topics) >= 1
+
+
+class TestResultCaching:
+    """Tests for memoised analytics results."""
+
+    def test_repeated_queries_hit_the_cache(self, db_with_attempts, monkeypatch):
+        db, test_id = db_with_attempts
+        service = AnalyticsService(db._db_path)
+        first = service.get_category_performance(test_id)
+
+        monkeypatch.setattr(service._engine, "refresh", _fail)
+        assert service.get_category_performance(test_id) == first
+        service.get_weak_topics(test_id)
+        assert service.cache_stats()["hits"] == 2
+
+    def test_write_in_process_invalidates(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        service = AnalyticsService(db._db_path)
+        before = len(service.get_scores_over_time(mode="practice"))
+
+        db.delete_test(test_id)
+        assert len(service.get_scores_over_time(mode="practice")) < before
+
+    def test_close_releases_the_probe_connection(self, db_with_attempts):
+        db, _ = db_with_attempts
+        service = AnalyticsService(db._db_path)
+        before = service.get_scores_over_time()
+        assert service._db._probe is not None
+
+        service.close()
+
+        assert service._db._probe is None
+        assert service.get_scores_over_time() == before
+
+    def test_write_from_another_connection_invalidates(self, db_with_attempts):
+        db, _ = db_with_attempts
+        service = AnalyticsService(db._db_path)
+        service.get_scores_over_time()
+        token = db.get_change_token()
+
+        conn = sqlite3.connect(db._db_path)
+        try:
+            conn.execute("UPDATE test_attempts SET percentage = 1")
+            conn.commit()
+        finally:
+            conn.close()
+        assert db.get_change_token() != token
+        assert {s["percentage"] for s in service.get_scores_over_time()} == {1}
+
+
+
+class TestResponseTimes:
+    """Tests for time-per-question analytics."""
+
+    def _save_timed(self, db, answers, attempts=4):
+        """Create a Math test and save attempts with (seconds, correct) per question."""
+        test_id = db.create_test(Test(name="Timed"))
+        ids = [
+            db.add_question(
+                Question(
+                    test_id=test_id,
+                    text=f"Q{i}",
+                    type="multiple_choice",
+                    correct_answer="A",
+                    category="Math",
+                    options=[QuestionOption(text="A", is_correct=True)],
+                )
+            )
+            for i in range(len(answers))
+        ]
+        for _ in range(attempts):
+            db.save_attempt_with_responses(
+                TestAttempt(
+                    test_id=test_id,
+                    score=sum(ok for _, ok in answers),
+                    total_questions=len(answers),
+                    percentage=0.0,
+                    responses=[
+                        QuestionResponse(
+                            question_id=qid,
+                            user_answer="A" if ok else "B",
+                            is_correct=ok,
+                            time_spent=seconds,
+                        )
+                        for qid, (seconds, ok) in zip(ids, answers)
+                    ],
+                )
+            )
+        return test_id, ids
+
+    def test_flags_slow_correct_and_fast_wrong(self, db):
+        # (seconds, correct) per question: slow and right, fast and
+        # wrong, and one at the category median
+        test_id, ids = self._save_timed(db, [(60, True), (5, False), (20, True)])
+
+        result = AnalyticsService(db._db_path).get_response_times(test_id)
+        flags = {row["question_id"]: row["flag"] for row in result["questions"]}
+        assert flags == {
+            ids[0]: FLAG_SLOW_CORRECT,
+            ids[1]: FLAG_FAST_WRONG,
+            ids[2]: None,
+        }
+        (math,) = result["categories"]
+        assert (math["p50"], math["accuracy"]) == (20.0, 66.7)
+
+    def test_zero_median_flags_nothing(self, db):
+        test_id, _ = self._save_timed(db, [(0, True), (0, True), (1, True)])
+        result = AnalyticsService(db._db_path).get_response_times(test_id)
+        assert [row["flag"] for row in result["questions"]] == [None, None, None]
+
+    def test_untimed_responses_are_ignored(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        result = AnalyticsService(db._db_path).get_response_times(test_id)
+        assert result == {"questions": [], "categories": []}
+
+
+
+def _attempt_at(db, test_id, completed_at, score, total=4):
+    """Save an attempt and backdate it to a UTC timestamp."""
+    attempt_id = db.save_attempt(
+        TestAttempt(
+            test_id=test_id,
+            score=score,
+            total_questions=total,
+            percentage=score / total * 100,
+        )
+    )
+    conn = sqlite3.connect(db._db_path)
+    try:
+        conn.execute(
+            "UPDATE test_attempts SET completed_at = ? WHERE id = ?",
+            (completed_at, attempt_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return attempt_id
+
+
+def _local_slot(completed_at):
+    """Heatmap (row, hour) of a UTC timestamp in the local time zone."""
+    local = datetime.fromisoformat(completed_at).replace(tzinfo=timezone.utc)
+    local = local.astimezone()
+    return local.weekday(), local.hour
+
+
+class TestStudyHeatmap:
+    """Tests for the hour-of-week heatmap and its bucket table."""
+
+    def test_buckets_track_inserts_updates_and_deletes(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        first = _attempt_at(db, test_id, "2024-03-04 09:15:00", 3)
+        _attempt_at(db, test_id, "2024-03-09 21:40:00", 1)
+        conn = sqlite3.connect(db._db_path)
+        try:
+            conn.execute("UPDATE test_attempts SET score = 4 WHERE id = ?", (first,))
+            conn.execute("DELETE FROM test_attempts WHERE mode = 'practice'")
+            conn.commit()
+            expected = conn.execute(
+                "SELECT CAST(strftime('%w', completed_at, 'localtime') AS INTEGER) w, "
+                "CAST(strftime('%H', completed_at, 'localtime') AS INTEGER) h, "
+                "COUNT(*), SUM(total_questions), SUM(score) "
+                "FROM test_attempts GROUP BY w, h"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert sorted(db.get_hour_of_week_buckets()) == sorted(expected)
+
+        db.delete_test(test_id)
+        assert db.get_hour_of_week_buckets() == []
+
+    def test_heatmap_grid_and_best_time(self, db):
+        test_id = db.create_test(Test(name="Timed"))
+        morning, evening = "2024-03-04 09:15:00", "2024-03-09 21:40:00"
+        for _ in range(3):
+            _attempt_at(db, test_id, morning, 4)
+            _attempt_at(db, test_id, evening, 1)
+
+        heatmap = AnalyticsService(db._db_path).get_study_heatmap(test_id)
+        row, hour = _local_slot(morning)
+        assert heatmap["attempts"][row][hour] == 3
+        assert heatmap["accuracy"][row][hour] == 100.0
+        assert sum(map(sum, heatmap["attempts"])) == 6
+        assert (heatmap["best"]["day"], heatmap["best"]["hour"]) == (
+            WEEKDAY_LABELS[row],
+            hour,
+        )
+        assert heatmap["worst"]["accuracy"] == 25.0
+
+    def test_sparse_slots_are_not_ranked(self, db):
+        test_id = db.create_test(Test(name="Timed"))
+        _attempt_at(db, test_id, "2024-03-04 09:15:00", 4)
+        heatmap = AnalyticsService(db._db_path).get_study_heatmap(test_id)
+        assert heatmap["best"] is None and heatmap["worst"] is None
+
+
+def _fail(*args):
+    raise AssertionError("unexpected call")
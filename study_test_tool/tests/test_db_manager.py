@@ -148,3 +148,23 @@ class TestDatabaseManagerTests:
         assert db.get_test_by_id(test_id) is None
         assert db.get_questions_for_test(test_id) == []
         assert db.get_attempts_for_test(test_id) == []
+
+    def test_get_question_ids_follows_test_order(self, populated_db):
+        db, test_id = populated_db
+        other_id = db.create_test(Test(name="Other"))
+        extra_id = db.add_question(
+            Question(test_id=other_id, text="Q?", type="essay", correct_answer="A")
+        )
+        own_ids = [q.id for q in db.get_questions_for_test(test_id)]
+
+        assert db.get_question_ids([other_id, test_id]) == [extra_id] + own_ids
+        assert db.get_question_ids([]) == []
+
+    def test_get_questions_by_ids_keeps_order_and_options(self, populated_db):
+        db, test_id = populated_db
+        expected = db.get_questions_for_test(test_id)
+        wanted = [expected[2].id, expected[0].id, 999_999]
+
+        loaded = db.get_questions_by_ids(wanted)
+        assert [q.id for q in loaded] == wanted[:2]
+        assert loaded[1].options == expected[0].options
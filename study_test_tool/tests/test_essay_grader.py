@@ -0,0 +1,176 @@
+"""Tests for the opt-in essay grader."""
+
+import time
+
+import pytest
+
+from models.question import Question
+from models.test import Test
+from services.essay_grader import EssayGrader, EssayModel
+from services.scoring_service import ScoringService
+from services.test_session import TestSession
+
+
+@pytest.fixture
+def essay_db(db):
+    """A test with two essays (one without an expected answer) and one MC."""
+    test_id = db.create_test(Test(name="Biology"))
+    ids = [
+        db.add_question(
+            Question(
+                test_id=test_id,
+                text="What does the mitochondria do?",
+                type="essay",
+                correct_answer="The mitochondria produces energy for the cell",
+            )
+        ),
+        db.add_question(
+            Question(
+                test_id=test_id,
+                text="Describe photosynthesis.",
+                type="essay",
+                correct_answer="Plants convert sunlight water and carbon dioxide into glucose",
+            )
+        ),
+        db.add_question(
+            Question(test_id=test_id, text="Reflect.", type="essay", correct_answer="")
+        ),
+    ]
+    return db, test_id, ids
+
+
+class TestEssayGrader:
+    """Similarity grading and model caching."""
+
+    def test_similar_answer_scores_higher(self, essay_db, db_path, tmp_path):
+        db, test_id, (q1, q2, q3) = essay_db
+        grader = EssayGrader(db_path, cache_dir=str(tmp_path))
+        questions = db.get_questions_for_test(test_id)
+
+        scores = grader.similarities(
+            questions,
+            {
+                q1: "mitochondria produce energy for the cell",
+                q2: "I do not know",
+            },
+        )
+        assert set(scores) == {q1, q2}  # q3 has no expected answer
+        assert scores[q1] > 0.7
+        assert scores[q2] < 0.2
+
+    def test_model_cached_on_disk_until_test_changes(self, essay_db, db_path, tmp_path):
+        db, test_id, (q1, _, _) = essay_db
+        EssayGrader(db_path, cache_dir=str(tmp_path)).get_model(test_id)
+        path = tmp_path / f"test_{test_id}.npz"
+        assert path.exists()
+
+        cached = EssayModel.load(path)
+        fresh = EssayGrader(db_path, cache_dir=str(tmp_path)).get_model(test_id)
+        assert fresh.key == cached.key
+
+        question = db.get_question_by_id(q1)
+        question.correct_answer = "Cellular respiration in the mitochondria"
+        db.update_question(question)
+        rebuilt = EssayGrader(db_path, cache_dir=str(tmp_path)).get_model(test_id)
+        assert rebuilt.key != cached.key
+        assert "respiration" in rebuilt.term_index
+
+    def test_batch_grading_is_fast_after_warm_up(self, essay_db, db_path, tmp_path):
+        db, test_id, (q1, q2, _) = essay_db
+        grader = EssayGrader(db_path, cache_dir=str(tmp_path))
+        model = grader.get_model(test_id)
+        answers = ["the cell gets energy from mitochondria"] * 250 + [
+            "plants turn sunlight into glucose"
+        ] * 250
+
+        start = time.perf_counter()
+        sims = model.similarities([q1] * 250 + [q2] * 250, answers)
+        assert time.perf_counter() - start < 0.5
+        assert len(sims) == 500
+
+
+class TestEssayScoring:
+    """Auto-graded essays count toward the score and can be overridden."""
+
+    def test_auto_graded_essays_are_scored(self, essay_db, db_path, tmp_path):
+        db, test_id, (q1, q2, q3) = essay_db
+        grader = EssayGrader(db_path, cache_dir=str(tmp_path), threshold=0.5)
+        scoring = ScoringService(db_path, essay_grader=grader)
+
+        session = TestSession(test_id, db.get_questions_for_test(test_id))
+        session.start()
+        session.responses = {
+            q1: "The mitochondria produces energy for the cell",
+            q2: "No idea",
+        }
+        result = scoring.score_test(session)
+
+        assert result["correct_questions"] == 1
+        assert result["incorrect_questions"] == 1
+        assert result["essay_questions"] == 1  # q3 left for self-evaluation
+        assert result["percentage"] == 50.0
+
+    def test_manual_override_rescores_attempt(self, essay_db, db_path):
+        db, test_id, (q1, q2, q3) = essay_db
+        scoring = ScoringService(db_path)
+
+        session = TestSession(test_id, db.get_questions_for_test(test_id))
+        session.start()
+        session.responses = {q1: "energy", q2: "glucose"}
+        attempt_id = scoring.save_attempt(test_id, scoring.score_test(session))
+
+        scoring.override_response(attempt_id, q1, True)
+        scoring.override_response(attempt_id, q2, False)
+
+        attempt = db.get_attempt_details(attempt_id)
+        assert attempt.score == 1
+        assert attempt.percentage == 50.0
+
+        with pytest.raises(ValueError):
+            scoring.override_response(attempt_id, 999999, True)
+
+    def test_override_survives_answer_key_edit(self, essay_db, db_path):
+        db, test_id, (q1, q2, q3) = essay_db
+        scoring = ScoringService(db_path)
+
+        session = TestSession(test_id, db.get_questions_for_test(test_id))
+        session.start()
+        session.responses = {q1: "energy"}
+        attempt_id = scoring.save_attempt(test_id, scoring.score_test(session))
+        scoring.override_response(attempt_id, q1, True)
+
+        question = next(q for q in db.get_questions_for_test(test_id) if q.id == q1)
+        question.correct_answer = "A rewritten model answer."
+        db.update_question(question)
+        scoring.rescore_questions([q1])
+
+        attempt = db.get_attempt_details(attempt_id)
+        response = next(r for r in attempt.responses if r.question_id == q1)
+        assert response.is_correct is True
+        assert attempt.score == 1
+
+    def test_turning_mc_into_essay_clears_key_marks(self, db, db_path):
+        test_id = db.create_test(Test(name="Chemistry"))
+        qid = db.add_question(
+            Question(
+                test_id=test_id,
+                text="Symbol for gold?",
+                type="multiple_choice",
+                correct_answer="Au",
+            )
+        )
+        scoring = ScoringService(db_path)
+        session = TestSession(test_id, db.get_questions_for_test(test_id))
+        session.start()
+        session.responses = {qid: "Au"}
+        attempt_id = scoring.save_attempt(test_id, scoring.score_test(session))
+
+        question = db.get_questions_for_test(test_id)[0]
+        question.type = "essay"
+        db.update_question(question)
+        result = scoring.rescore_questions([qid], retyped_ids=[qid])
+
+        assert result == {"responses_changed": 1, "attempts_changed": 1}
+        attempt = db.get_attempt_details(attempt_id)
+        assert attempt.responses[0].is_correct is None
+        assert (attempt.score, attempt.percentage) == (0, 0.0)
@@ -0,0 +1,107 @@
+"""Tests for HistoryExportService."""
+
+import csv
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from services.history_export_service import HistoryExportService
+
+
+@pytest.fixture
+def far_east_tz(monkeypatch):
+    """Run in UTC+14, where local and UTC days differ for half the day."""
+    monkeypatch.setenv("TZ", "LOC-14")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestExportResponseHistory:
+    """Tests for HistoryExportService.export_response_history."""
+
+    def test_exports_all_responses(self, db_with_attempts, tmp_path):
+        db, test_id = db_with_attempts
+        out = tmp_path / "export"
+
+        result = HistoryExportService(db._db_path).export_response_history(str(out))
+
+        assert result["rows"] == 6
+        assert result["chunks"] == 1
+        assert all(os.path.exists(f) for f in result["files"])
+        with open(out / "responses_00000.csv", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 6
+        assert {r["test_name"] for r in rows} == {"Sample Test"}
+
+    def test_npz_columns_are_dictionary_encoded(self, db_with_attempts, tmp_path):
+        db, test_id = db_with_attempts
+
+        HistoryExportService(db._db_path).export_response_history(str(tmp_path))
+
+        chunk = np.load(tmp_path / "responses_00000.npz")
+        dictionaries = np.load(tmp_path / "dictionaries.npz")
+        assert chunk["test_name"].dtype == np.int32
+        names = dictionaries["test_name"][chunk["test_name"]]
+        assert set(names) == {"Sample Test"}
+        assert chunk["question_id"].dtype == np.int64
+        assert len(chunk["is_correct"]) == 6
+
+    def test_chunks_share_dictionaries(self, db_with_attempts, tmp_path):
+        db, test_id = db_with_attempts
+
+        result = HistoryExportService(db._db_path).export_response_history(
+            str(tmp_path), chunk_size=4
+        )
+
+        assert result["chunks"] == 2
+        dictionaries = np.load(tmp_path / "dictionaries.npz")
+        first = np.load(tmp_path / "responses_00000.npz")
+        second = np.load(tmp_path / "responses_00001.npz")
+        assert len(first["response_id"]) == 4
+        assert len(second["response_id"]) == 2
+        assert len(dictionaries["test_name"]) == 1
+        assert second["test_name"].max() == 0
+
+    def test_filters_by_test_and_date(self, db_with_attempts, tmp_path):
+        db, test_id = db_with_attempts
+        service = HistoryExportService(db._db_path)
+
+        other_test = service.export_response_history(
+            str(tmp_path / "a"), test_ids=[test_id + 1]
+        )
+        old = service.export_response_history(
+            str(tmp_path / "b"), end_date="2000-01-01"
+        )
+
+        assert other_test["rows"] == 0
+        assert old["rows"] == 0
+        with open(tmp_path / "a" / "manifest.json", encoding="utf-8") as f:
+            assert json.load(f)["filters"]["test_ids"] == [test_id + 1]
+
+    def test_date_filter_uses_local_days(self, db_with_attempts, tmp_path, far_east_tz):
+        db, test_id = db_with_attempts
+        conn = sqlite3.connect(db._db_path)
+        try:
+            # 2026-10-17 20:00 UTC is 2026-10-18 10:00 in UTC+14
+            conn.execute(
+                "UPDATE test_attempts SET completed_at = '2026-10-17 20:00:00'"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        service = HistoryExportService(db._db_path)
+
+        local_day = service.export_response_history(
+            str(tmp_path / "a"), start_date="2026-10-18", end_date="2026-10-18"
+        )
+        utc_day = service.export_response_history(
+            str(tmp_path / "b"), start_date="2026-10-17", end_date="2026-10-17"
+        )
+
+        assert (local_day["rows"], utc_day["rows"]) == (6, 0)
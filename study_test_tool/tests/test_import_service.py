@@ -193,3 +193,160 @@ d. Standard D -- correct
     def test_import_text_file_not_found(self, import_svc):
         with pytest.raises(FileNotFoundError):
             import_svc.import_from_text("/nonexistent/file.txt")
+
+
+def _write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per list entry."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        ops = ["BT /F1 12 Tf 14 TL 72 720 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref,
+    )
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+
+class TestPdfImport:
+    """Test PDF import functionality."""
+
+    @pytest.fixture(autouse=True)
+    def _needs_pypdf(self):
+        pytest.importorskip("pypdf")
+
+    def test_import_pdf_across_page_break(self, import_svc, tmp_path):
+        path = str(tmp_path / "book.pdf")
+        _write_pdf(path, [
+            ["1. What is 2+2?", "a. 3", "b. 4 -- correct", "2. Which colour is", "1"],
+            ["the sky?", "a. Red", "b. Blue -- correct", "2"],
+        ])
+
+        test_id = import_svc.import_from_pdf(path, max_workers=1)
+
+        questions = import_svc._db.get_questions_for_test(test_id)
+        assert [q.text for q in questions] == ["What is 2+2?", "Which colour is\nthe sky?"]
+        assert questions[1].correct_answer == "Blue"
+        assert import_svc._db.get_test_by_id(test_id).name == "book"
+
+    def test_import_pdf_reports_page_progress(self, import_svc, tmp_path):
+        path = str(tmp_path / "progress.pdf")
+        _write_pdf(path, [
+            [f"{n}. Question {n}?", "a. Yes -- correct", "b. No"] for n in range(1, 21)
+        ])
+        progress = []
+
+        test_id = import_svc.import_from_pdf(
+            path, progress_callback=lambda done, total: progress.append((done, total)),
+            max_workers=2,
+        )
+
+        assert len(import_svc._db.get_questions_for_test(test_id)) == 20
+        assert progress == [(done, 20) for done in range(1, 21)]
+
+    def test_import_pdf_without_questions(self, import_svc, tmp_path):
+        path = str(tmp_path / "empty.pdf")
+        _write_pdf(path, [["Just some notes."]])
+
+        with pytest.raises(ValueError, match="No questions"):
+            import_svc.import_from_pdf(path, max_workers=1)
+        assert import_svc._db.get_all_tests() == []
+
+    def test_import_pdf_file_not_found(self, import_svc):
+        with pytest.raises(FileNotFoundError):
+            import_svc.import_from_pdf("/nonexistent/file.pdf")
+
+
+class TestImportPreview:
+    """Test dry-run parsing, analysis, and committing a parsed import."""
+
+    CONTENT = """1. What is 2+2?
+a. 3
+b. 4 -- correct
+
+2. Pick a colour
+a. Red
+b. Blue
+
+3. What is 2+2?
+a. 3
+b. 4 -- correct
+"""
+
+    def _write(self, tmp_path, content, name="quiz.txt"):
+        path = tmp_path / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def test_parse_file_writes_nothing(self, import_svc, tmp_path):
+        path = self._write(tmp_path, self.CONTENT)
+        streamed = []
+
+        parsed = import_svc.parse_file(path, on_question=streamed.append)
+
+        assert parsed.id is None
+        assert parsed.name == "quiz"
+        assert [q.text for q in streamed] == [q.text for q in parsed.questions]
+        assert import_svc._db.get_all_tests() == []
+
+    def test_analyze_reports_warnings_and_duplicates(self, import_svc, tmp_path):
+        existing = self._write(tmp_path, "1. Pick a colour\na. Red\nb. Blue -- correct\n",
+                               name="old.txt")
+        import_svc.import_from_text(existing)
+        parsed = import_svc.parse_file(self._write(tmp_path, self.CONTENT))
+
+        stats = import_svc.analyze_import(parsed)
+
+        assert stats["question_count"] == 3
+        assert stats["mc_count"] == 3
+        assert stats["warnings"] == ["Q2 has no correct answer set."]
+        assert stats["duplicates_in_file"] == 1
+        assert stats["duplicates_in_library"] == 1
+
+    def test_commit_saves_parsed_questions(self, import_svc, tmp_path):
+        parsed = import_svc.parse_file(self._write(tmp_path, self.CONTENT))
+        parsed.questions[0].text = "Edited in preview"
+
+        test_id = import_svc.commit_import(parsed)
+
+        questions = import_svc._db.get_questions_for_test(test_id)
+        assert questions[0].text == "Edited in preview"
+        assert len(questions) == 3
+        with pytest.raises(ValueError, match="already been saved"):
+            import_svc.commit_import(parsed)
+
+    def test_invalid_json_leaves_no_partial_test(self, import_svc, tmp_path):
+        data = {"name": "Half", "questions": [{"text": "Ok?", "type": "essay"},
+                                              {"text": ""}]}
+        path = self._write(tmp_path, json.dumps(data), name="half.json")
+
+        with pytest.raises(ValueError, match="Question text"):
+            import_svc.import_from_json(path)
+        assert import_svc._db.get_all_tests() == []
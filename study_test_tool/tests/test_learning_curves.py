@@ -0,0 +1,146 @@
+"""Tests for learning-curve fitting and readiness forecasts."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from models.test_result import QuestionResponse, TestAttempt
+from services.analytics_engine import AnalyticsEngine
+from services.learning_curves import (
+    SECONDS_PER_DAY,
+    CurveStats,
+    t_quantile_95,
+)
+
+START = 1_700_000_000
+
+
+def _power_law(attempts):
+    """Scores whose error rate falls as 50 * n ** -0.5."""
+    n = np.arange(1, attempts + 1)
+    return 100 - 50 * n**-0.5
+
+
+class TestCurveStats:
+    """Tests for the running least-squares fits."""
+
+    def test_recovers_an_exact_power_law(self):
+        curves = CurveStats()
+        scores = _power_law(10)
+        ts = START + np.arange(10) * SECONDS_PER_DAY
+        curves.add(np.zeros(10, dtype=np.int64), scores, ts)
+
+        forecast = curves.forecast(ts[-1])
+        assert forecast["learning_rate"][0] == pytest.approx(0.5)
+        assert forecast["next_attempt"][0] == pytest.approx(100 - 50 * 11**-0.5)
+        # A perfect fit has a zero-width band
+        assert forecast["lower"][0] == pytest.approx(forecast["upper"][0])
+
+    def test_batches_match_a_single_pass(self):
+        rng = np.random.default_rng(7)
+        groups = rng.integers(0, 5, 200)
+        scores = rng.uniform(0, 100, 200)
+        ts = START + np.sort(rng.integers(0, 90 * SECONDS_PER_DAY, 200))
+
+        whole = CurveStats()
+        whole.add(groups, scores, ts)
+        parts = CurveStats()
+        for chunk in np.array_split(np.arange(200), 7):
+            parts.add(groups[chunk], scores[chunk], ts[chunk])
+
+        assert np.allclose(whole.sums, parts.sums)
+        assert (whole.count == parts.count).all()
+        assert (whole.first_ts == parts.first_ts).all()
+
+    def test_too_few_points_have_no_forecast(self):
+        curves = CurveStats()
+        curves.add(np.array([2, 2]), np.array([40.0, 60.0]), np.array([0, 10]))
+        forecast = curves.forecast(20)
+        assert np.isnan(forecast["projected"]).all()
+        assert curves.count.tolist() == [0, 0, 2]
+
+    def test_t_quantiles(self):
+        assert t_quantile_95([1, 10])[0] == 12.706
+        assert t_quantile_95([30])[0] == pytest.approx(2.042, abs=0.005)
+        assert np.isnan(t_quantile_95([0])[0])
+
+
+def _save_scored(db, test_id, correct, completed_at):
+    """Save an attempt answering every MC question, backdated to a UTC time."""
+    questions = [q for q in db.get_questions_for_test(test_id) if q.options]
+    attempt_id = db.save_attempt_with_responses(
+        TestAttempt(
+            test_id=test_id,
+            score=correct,
+            total_questions=len(questions),
+            percentage=correct / len(questions) * 100,
+            responses=[
+                QuestionResponse(
+                    question_id=q.id, user_answer="x", is_correct=i < correct
+                )
+                for i, q in enumerate(questions)
+            ],
+        )
+    )
+    conn = sqlite3.connect(db._db_path)
+    try:
+        conn.execute(
+            "UPDATE test_attempts SET completed_at = ? WHERE id = ?",
+            (completed_at, attempt_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class TestReadiness:
+    """Tests for the engine's incremental learning curves."""
+
+    def test_forecasts_tests_and_categories(self, populated_db):
+        db, test_id = populated_db
+        for day, correct in enumerate([0, 1, 1, 2]):
+            _save_scored(db, test_id, correct, f"2024-01-0{day + 1} 10:00:00")
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+
+        result = engine.readiness(START)
+        (test,) = result["tests"]
+        assert test["test_name"] == "Sample Test" and test["attempts"] == 4
+        assert test["lower"] <= test["projected"] <= test["upper"]
+        assert test["learning_rate"] > 0
+        assert [c["category"] for c in result["categories"]] == ["Geography", "Math"]
+
+    def test_new_attempts_update_in_place(self, populated_db):
+        db, test_id = populated_db
+        for day in range(1, 4):
+            _save_scored(db, test_id, 1, f"2024-01-0{day} 10:00:00")
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+        engine.readiness(START)
+
+        _save_scored(db, test_id, 2, "2024-01-05 10:00:00")
+        engine.refresh()
+        curves = engine._test_curves
+        assert engine.readiness(START) == _fresh_readiness(db)
+        assert engine._test_curves is curves
+
+    def test_backdated_attempt_rebuilds(self, populated_db):
+        db, test_id = populated_db
+        for day in range(3, 6):
+            _save_scored(db, test_id, 2, f"2024-01-0{day} 10:00:00")
+        engine = AnalyticsEngine(db)
+        engine.refresh()
+        curves = engine._test_curves
+        engine.readiness(START)
+
+        _save_scored(db, test_id, 0, "2024-01-01 10:00:00")
+        engine.refresh()
+        assert engine.readiness(START) == _fresh_readiness(db)
+        assert engine._test_curves is not curves
+
+
+def _fresh_readiness(db):
+    engine = AnalyticsEngine(db)
+    engine.refresh()
+    return engine.readiness(START)
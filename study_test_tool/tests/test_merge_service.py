@@ -0,0 +1,210 @@
+"""Tests for MergeService."""
+
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from config.database import initialize_database
+from database.db_manager import DatabaseManager
+from database.migrations import run_migrations
+from models.question import Question, QuestionOption
+from models.test import Test
+from models.test_result import QuestionResponse, StudySession, TestAttempt
+from services.merge_service import MergeService
+
+
+@pytest.fixture
+def source_db():
+    """A second study database to merge from."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    initialize_database(path)
+    run_migrations(path)
+    yield DatabaseManager(path)
+    os.unlink(path)
+
+
+def _add_test_with_history(db, name, question_texts):
+    """Create a test with MC questions and one attempt answering them all."""
+    test_id = db.create_test(Test(name=name))
+    question_ids = []
+    for text in question_texts:
+        question_ids.append(
+            db.add_question(
+                Question(
+                    test_id=test_id,
+                    text=text,
+                    type="multiple_choice",
+                    correct_answer="A",
+                    options=[
+                        QuestionOption(text="A", is_correct=True),
+                        QuestionOption(text="B"),
+                    ],
+                )
+            )
+        )
+    attempt_id = db.save_attempt(
+        TestAttempt(test_id=test_id, score=1, total_questions=len(question_ids))
+    )
+    for qid in question_ids:
+        db.save_response(
+            QuestionResponse(
+                attempt_id=attempt_id, question_id=qid, user_answer="A", is_correct=True
+            )
+        )
+    return test_id
+
+
+class TestMergeDatabase:
+    """Tests for MergeService.merge_database."""
+
+    def test_merge_into_empty_copies_everything(self, db, source_db):
+        _add_test_with_history(source_db, "Week 1", ["Q1", "Q2"])
+
+        counts = MergeService(db._db_path).merge_database(source_db._db_path)
+
+        assert counts["tests_added"] == 1
+        assert counts["questions_added"] == 2
+        assert counts["options_added"] == 4
+        assert counts["attempts_added"] == 1
+        assert counts["responses_added"] == 2
+
+        test = db.get_all_tests()[0]
+        questions = db.get_questions_for_test(test.id)
+        assert [q.text for q in questions] == ["Q1", "Q2"]
+        assert all(len(q.options) == 2 for q in questions)
+        attempt = db.get_attempts_for_test(test.id)[0]
+        details = db.get_attempt_details(attempt.id)
+        assert {r.question_id for r in details.responses} == {q.id for q in questions}
+
+    def test_matching_question_is_reused(self, db, source_db):
+        """Same test name and question text maps onto the existing rows."""
+        local_test = _add_test_with_history(db, "Week 1", ["Q1"])
+        _add_test_with_history(source_db, "Week 1", ["  q1 ", "Q2"])
+
+        counts = MergeService(db._db_path).merge_database(source_db._db_path)
+
+        assert counts["tests_matched"] == 1
+        assert counts["questions_matched"] == 1
+        assert counts["questions_added"] == 1
+        assert len(db.get_questions_for_test(local_test)) == 2
+        assert len(db.get_attempts_for_test(local_test)) == 2
+
+    def test_merge_twice_skips_known_attempts(self, db, source_db):
+        _add_test_with_history(source_db, "Week 1", ["Q1"])
+        service = MergeService(db._db_path)
+
+        service.merge_database(source_db._db_path)
+        counts = service.merge_database(source_db._db_path)
+
+        assert counts["questions_added"] == 0
+        assert counts["attempts_added"] == 0
+        assert counts["attempts_skipped"] == 1
+        assert len(db.get_all_attempts()) == 1
+
+    def test_ids_do_not_collide(self, db, source_db):
+        """Source ids that already exist locally are remapped."""
+        _add_test_with_history(db, "Local", ["L1", "L2"])
+        _add_test_with_history(source_db, "Remote", ["R1"])
+
+        MergeService(db._db_path).merge_database(source_db._db_path)
+
+        names = sorted(t.name for t in db.get_all_tests())
+        assert names == ["Local", "Remote"]
+        remote = next(t for t in db.get_all_tests() if t.name == "Remote")
+        assert [q.text for q in db.get_questions_for_test(remote.id)] == ["R1"]
+
+    def test_mix_sessions_are_merged_once(self, db, source_db):
+        _add_test_with_history(db, "Local", ["L1"])
+        test_ids = [source_db.create_test(Test(name=n)) for n in ("Mix A", "Mix B")]
+        source_db.save_session(
+            StudySession(
+                score=1,
+                total_questions=2,
+                seed=7,
+                shuffle_version=1,
+                source_test_ids=test_ids,
+                attempts=[
+                    TestAttempt(test_id=tid, total_questions=1, seed=7,
+                                shuffle_version=1, timeline=b"\x01\x02")
+                    for tid in test_ids
+                ],
+            )
+        )
+        service = MergeService(db._db_path)
+
+        assert service.merge_database(source_db._db_path)["sessions_added"] == 1
+        assert service.merge_database(source_db._db_path)["sessions_added"] == 0
+
+        (session,) = db.get_all_sessions().values()
+        merged = {t.name: t.id for t in db.get_all_tests()}
+        assert session.source_test_ids == [merged["Mix A"], merged["Mix B"]]
+        attempts = db.get_session_details(session.id).attempts
+        assert [(a.test_id, a.seed, a.shuffle_version) for a in attempts] == [
+            (merged["Mix A"], 7, 1), (merged["Mix B"], 7, 1),
+        ]
+        assert db.get_attempt_timelines(merged["Mix B"]) == [b"\x01\x02"]
+
+    def test_merged_rows_are_tracked_for_sync(self, db, source_db):
+        _add_test_with_history(source_db, "Week 1", ["Q1"])
+        cursor = db.get_change_cursor()
+
+        MergeService(db._db_path).merge_database(source_db._db_path)
+
+        changes = db.get_changes_since(cursor)
+        assert len(changes["questions"]) == 1
+        assert len(changes["question_responses"]) == 1
+
+    def test_merge_legacy_database_without_sync_columns(self, db, tmp_path):
+        """A database that predates change tracking can still be merged."""
+        legacy = str(tmp_path / "legacy.db")
+        conn = sqlite3.connect(legacy)
+        conn.executescript(
+            "CREATE TABLE tests (id INTEGER PRIMARY KEY, name TEXT, "
+            "description TEXT, created_at TIMESTAMP);"
+            "CREATE TABLE questions (id INTEGER PRIMARY KEY, test_id INTEGER, "
+            "question_text TEXT, question_type TEXT, correct_answer TEXT, "
+            "category TEXT, created_at TIMESTAMP);"
+            "CREATE TABLE question_options (id INTEGER PRIMARY KEY, "
+            "question_id INTEGER, option_text TEXT, is_correct BOOLEAN);"
+            "CREATE TABLE test_attempts (id INTEGER PRIMARY KEY, test_id INTEGER, "
+            "score INTEGER, total_questions INTEGER, percentage REAL, "
+            "time_taken INTEGER, completed_at TIMESTAMP);"
+            "CREATE TABLE question_responses (id INTEGER PRIMARY KEY, "
+            "attempt_id INTEGER, question_id INTEGER, user_answer TEXT, "
+            "is_correct BOOLEAN, was_flagged BOOLEAN, time_spent INTEGER);"
+            "INSERT INTO tests VALUES (1, 'Old', '', '2024-01-01 00:00:00');"
+            "INSERT INTO questions VALUES "
+            "(1, 1, 'Old Q', 'essay', 'A', '', '2024-01-01 00:00:00');"
+            "INSERT INTO test_attempts VALUES "
+            "(1, 1, 0, 1, 0.0, 10, '2024-01-02 00:00:00');"
+        )
+        conn.commit()
+        conn.close()
+
+        counts = MergeService(db._db_path).merge_database(legacy)
+
+        assert counts["tests_added"] == 1
+        assert db.get_all_attempts()[0].mode == "test"
+
+        counts = MergeService(db._db_path).merge_database(legacy)
+
+        assert (counts["attempts_added"], counts["attempts_skipped"]) == (0, 1)
+        assert len(db.get_all_attempts()) == 1
+
+    def test_merge_into_itself_rejected(self, db):
+        with pytest.raises(ValueError):
+            MergeService(db._db_path).merge_database(db._db_path)
+
+    def test_merge_non_study_database_rejected(self, db, tmp_path):
+        other = str(tmp_path / "other.db")
+        sqlite3.connect(other).close()
+
+        with pytest.raises(ValueError):
+            MergeService(db._db_path).merge_database(other)
+
+    def test_merge_missing_file(self, db):
+        with pytest.raises(FileNotFoundError):
+            MergeService(db._db_path).merge_database("/nonexistent/study_tool.db")
@@ -112,3 +112,26 @@ class TestMigrations:
             assert get_schema_version(conn) == 5
         finally:
             conn.close()
+
+    def test_migration_backfills_change_tracking(self, db_path):
+        """Migration 3 gives pre-existing rows a uuid and change_seq."""
+        initialize_database(db_path)
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("INSERT INTO tests (name) VALUES ('Old Test')")
+            conn.execute("UPDATE tests SET uuid = NULL, change_seq = 0")
+            conn.commit()
+        finally:
+            conn.close()
+
+        run_migrations(db_path)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            uuid, change_seq = conn.execute(
+                "SELECT uuid, change_seq FROM tests"
+            ).fetchone()
+            assert uuid
+            assert change_seq >= 1
+        finally:
+            conn.close()
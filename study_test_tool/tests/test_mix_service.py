@@ -91,3 +91,171 @@ class TestMixService:
 
         result = service.select_questions([t1_id], 0)
         assert result == []
+
+
+def _layout(questions):
+    return [(q.id, [o.text for o in q.options]) for q in questions]
+
+
+class TestSeededSessions:
+    """A stored seed regenerates the exact layout."""
+
+    def test_same_seed_same_mix(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        service = MixService(db_path)
+
+        first = service.select_questions([t1_id, t2_id], 6, seed=1234)
+        second = service.select_questions([t1_id, t2_id], 6, seed=1234)
+        assert _layout(first) == _layout(second)
+
+    def test_different_seeds_differ(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        service = MixService(db_path)
+
+        layouts = {
+            tuple(q.id for q in service.select_questions([t1_id, t2_id], 6, seed=s))
+            for s in range(10)
+        }
+        assert len(layouts) > 1
+
+    def test_seed_stored_with_session_and_attempts(self, db_path, db):
+        from services.randomizer_service import GENERATOR_VERSION
+        from services.scoring_service import ScoringService
+        from services.test_session import TestSession
+
+        t1_id, t2_id = _create_two_tests(db)
+        questions = MixService(db_path).select_questions([t1_id, t2_id], 4, seed=99)
+
+        session = TestSession(None, questions)
+        session.seed = 99
+        session.source_test_ids = [t1_id, t2_id]
+        session.start()
+        scoring = ScoringService(db_path)
+        scoring.save_mixed_attempt(scoring.score_test(session), questions)
+
+        saved = next(iter(db.get_all_sessions().values()))
+        assert saved.seed == 99
+        assert saved.shuffle_version == GENERATOR_VERSION
+        assert saved.source_test_ids == [t1_id, t2_id]
+
+        details = db.get_session_details(saved.id)
+        assert all(a.seed == 99 for a in details.attempts)
+        regenerated = MixService(db_path).select_questions(
+            saved.source_test_ids, saved.total_questions, seed=saved.seed
+        )
+        assert _layout(regenerated) == _layout(questions)
+
+
+class TestWeightedMix:
+    """Adaptive sampling favours missed and unseen questions."""
+
+    def _answer_all(self, db, test_id, wrong_ids):
+        from models.test_result import QuestionResponse, TestAttempt
+
+        questions = db.get_questions_for_test(test_id)
+        db.save_attempt_with_responses(
+            TestAttempt(
+                test_id=test_id,
+                score=0,
+                total_questions=len(questions),
+                percentage=0.0,
+                responses=[
+                    QuestionResponse(
+                        question_id=q.id,
+                        user_answer="A",
+                        is_correct=q.id not in wrong_ids,
+                    )
+                    for q in questions
+                ],
+            )
+        )
+        return questions
+
+    def test_missed_questions_weigh_more(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        questions = self._answer_all(db, t1_id, set())
+        missed = questions[0].id
+        self._answer_all(db, t1_id, {missed})
+
+        weights = MixService(db_path).adaptive_weights([t1_id, t2_id])
+        assert weights[missed] > weights[questions[1].id]
+        # Never-seen questions from Week 2 outrank everything answered
+        unseen = [q.id for q in db.get_questions_for_test(t2_id)]
+        assert min(weights[q] for q in unseen) > weights[missed]
+
+    def test_weighted_selection_prefers_unseen(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        self._answer_all(db, t1_id, set())
+        service = MixService(db_path)
+
+        picked_unseen = 0
+        for seed in range(40):
+            chosen = service.select_questions(
+                [t1_id, t2_id], 5, seed=seed, strategy="weighted", temperature=0.25
+            )
+            picked_unseen += sum(1 for q in chosen if q.test_id == t2_id)
+        assert picked_unseen > 0.8 * 40 * 5
+
+    def test_weighted_is_deterministic_with_seed(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        service = MixService(db_path)
+
+        first = service.select_questions([t1_id, t2_id], 6, seed=7, strategy="weighted")
+        second = service.select_questions(
+            [t1_id, t2_id], 6, seed=7, strategy="weighted"
+        )
+        assert _layout(first) == _layout(second)
+
+    def test_temperature_must_be_positive(self, db_path, db):
+        t1_id, _ = _create_two_tests(db)
+        with pytest.raises(ValueError):
+            MixService(db_path).adaptive_weights([t1_id], temperature=0)
+
+
+class TestStratifiedMix:
+    """Balanced mixes draw a planned number from each test and category."""
+
+    def test_largest_remainder_sums_and_rounds(self):
+        from services.mix_service import largest_remainder
+
+        alloc = largest_remainder(
+            10, {"a": 1, "b": 1, "c": 1}, {"a": 9, "b": 9, "c": 9}
+        )
+        assert alloc == {"a": 4, "b": 3, "c": 3}
+
+    def test_largest_remainder_redistributes_capped_excess(self):
+        from services.mix_service import largest_remainder
+
+        alloc = largest_remainder(10, {"a": 1, "b": 1}, {"a": 2, "b": 20})
+        assert alloc == {"a": 2, "b": 8}
+        assert (
+            sum(largest_remainder(50, {"a": 1, "b": 1}, {"a": 2, "b": 3}).values()) == 5
+        )
+
+    def test_plan_splits_tests_then_categories(self):
+        plan = MixService.plan_stratified(6, {1: {"Math": 6, "Art": 2}, 2: {"": 4}})
+        assert plan == {1: {"Math": 3, "Art": 1}, 2: {"": 2}}
+
+    def test_plan_with_fixed_quotas(self):
+        plan = MixService.plan_stratified(
+            0, {1: {"": 5}, 2: {"": 5}}, test_quotas={1: 2, 2: 9}
+        )
+        assert plan == {1: {"": 2}, 2: {"": 5}}
+
+    def test_small_tests_and_categories_are_represented(self):
+        plan = MixService.plan_stratified(10, {1: {"": 2000}, 2: {"": 10}, 3: {"": 40}})
+        assert plan == {1: {"": 8}, 2: {"": 1}, 3: {"": 1}}
+        plan = MixService.plan_stratified(5, {1: {"a": 95, "b": 3, "c": 2}})
+        assert plan == {1: {"a": 3, "b": 1, "c": 1}}
+
+    def test_stratified_is_deterministic_with_seed(self, db_path, db):
+        t1_id, t2_id = _create_two_tests(db)
+        service = MixService(db_path)
+
+        first = service.select_questions(
+            [t1_id, t2_id], 5, seed=3, strategy="stratified"
+        )
+        second = service.select_questions(
+            [t1_id, t2_id], 5, seed=3, strategy="stratified"
+        )
+        assert _layout(first) == _layout(second)
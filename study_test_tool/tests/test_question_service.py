@@ -0,0 +1,108 @@
+"""Tests for QuestionService."""
+
+import sqlite3
+
+from models.question import QuestionOption
+from services.question_service import QuestionService
+
+
+def _options(db_path, question_id):
+    """Return stored (id, text, is_correct) rows for a question."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT id, option_text, is_correct FROM question_options "
+            "WHERE question_id = ? ORDER BY id",
+            (question_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+class TestUpdateQuestion:
+    """Tests for the diff-based QuestionService.update_question."""
+
+    def _first_question(self, db, test_id):
+        return db.get_questions_for_test(test_id)[0]
+
+    def test_option_ids_are_stable(self, populated_db):
+        db, test_id = populated_db
+        question = self._first_question(db, test_id)
+        before = [o.id for o in question.options]
+
+        question.options[0].text = "three"
+        QuestionService(db._db_path).update_question(question)
+
+        rows = _options(db._db_path, question.id)
+        assert [r[0] for r in rows] == before
+        assert rows[0][1] == "three"
+
+    def test_only_changed_rows_are_written(self, populated_db):
+        db, test_id = populated_db
+        question = self._first_question(db, test_id)
+        cursor = db.get_change_cursor()
+
+        question.options[1].text = "four"
+        QuestionService(db._db_path).update_question(question)
+
+        changes = db.get_changes_since(cursor)
+        assert [o["option_text"] for o in changes["question_options"]] == ["four"]
+        assert len(changes["questions"]) == 1
+
+    def test_unchanged_question_writes_nothing(self, populated_db):
+        db, test_id = populated_db
+        question = self._first_question(db, test_id)
+        cursor = db.get_change_cursor()
+
+        QuestionService(db._db_path).update_question(question)
+
+        assert db.get_change_cursor() == cursor
+
+    def test_added_and_removed_options(self, populated_db):
+        db, test_id = populated_db
+        question = self._first_question(db, test_id)
+        kept = question.options[:2]
+        question.options = kept + [QuestionOption(text="7")]
+
+        QuestionService(db._db_path).update_question(question)
+
+        rows = _options(db._db_path, question.id)
+        assert [r[1] for r in rows] == ["3", "4", "7"]
+        assert rows[:2] == [(o.id, o.text, int(o.is_correct)) for o in kept]
+        assert question.options[2].id == rows[2][0]
+
+    def test_options_without_ids_match_by_text(self, populated_db):
+        db, test_id = populated_db
+        question = self._first_question(db, test_id)
+        before = {o.text: o.id for o in question.options}
+        question.options = [
+            QuestionOption(text=o.text, is_correct=o.is_correct)
+            for o in reversed(question.options)
+        ]
+
+        QuestionService(db._db_path).update_question(question)
+
+        assert {r[1]: r[0] for r in _options(db._db_path, question.id)} == before
+
+
+class TestSeededLayout:
+    """Seeded shuffles of a single test."""
+
+    def test_seed_reproduces_layout_and_is_stored(self, populated_db, db_path):
+        from services.scoring_service import ScoringService
+        from services.test_session import TestSession
+
+        db, test_id = populated_db
+        service = QuestionService(db_path)
+        questions = service.get_questions_for_test(test_id, randomize=True, seed=7)
+        again = service.get_questions_for_test(test_id, randomize=True, seed=7)
+        assert [(q.id, [o.id for o in q.options]) for q in questions] == [
+            (q.id, [o.id for o in q.options]) for q in again
+        ]
+
+        session = TestSession(test_id, questions)
+        session.seed = 7
+        session.start()
+        scoring = ScoringService(db_path)
+        attempt_id = scoring.save_attempt(test_id, scoring.score_test(session))
+        assert db.get_attempt_details(attempt_id).seed == 7
@@ -68,3 +68,33 @@ class TestRandomizerService:
             orders.add(order)
         # Should have more than 1 unique ordering in 20 tries
         assert len(orders) > 1
+
+    def test_shuffle_all_shares_question_objects(self, questions):
+        shuffled = RandomizerService.shuffle_all(questions)
+        originals = {id(q) for q in questions}
+        option_ids = {id(o) for q in questions for o in q.options}
+        for view in shuffled:
+            assert id(view.question) in originals
+            assert {id(o) for o in view.options} <= option_ids
+            assert view.text == view.question.text
+
+    def test_apply_permutation_reproduces_layout(self, questions):
+        order, option_orders = RandomizerService.permutation(questions)
+        first = RandomizerService.apply_permutation(questions, order, option_orders)
+        second = RandomizerService.apply_permutation(questions, order, option_orders)
+        assert [q.id for q in first] == [q.id for q in second]
+        assert [[o.text for o in q.options] for q in first] == [
+            [o.text for o in q.options] for q in second
+        ]
+        assert sorted(order) == list(range(len(questions)))
+
+    def test_weighted_sample_without_replacement(self, questions):
+        picked = RandomizerService.weighted_sample(questions, [1.0] * len(questions), 4)
+        assert len(picked) == 4
+        assert len({q.id for q in picked}) == 4
+
+    def test_weighted_sample_skips_zero_weights(self, questions):
+        weights = [1.0 if q.id <= 3 else 0.0 for q in questions]
+        for _ in range(20):
+            picked = RandomizerService.weighted_sample(questions, weights, 3)
+            assert {q.id for q in picked} == {1, 2, 3}
@@ -0,0 +1,164 @@
+"""Tests for difficulty ratings and adaptive question order."""
+
+import pytest
+
+from models.question import Question, QuestionOption
+from services.rating_service import (
+    AdaptiveSelector,
+    RatingEngine,
+    expected_score,
+)
+from services.session_journal import SessionJournal
+from services.test_session import TestSession
+
+
+def _mc(qid, category="Math"):
+    return Question(
+        id=qid,
+        text=f"Q{qid}",
+        type="multiple_choice",
+        correct_answer="A",
+        category=category,
+        options=[
+            QuestionOption(text="A", is_correct=True),
+            QuestionOption(text="B", is_correct=False),
+        ],
+    )
+
+
+@pytest.fixture
+def rated_questions(populated_db):
+    db, test_id = populated_db
+    return db, [q for q in db.get_questions_for_test(test_id) if q.options]
+
+
+class TestRatingEngine:
+    """Tests for the online rating updates."""
+
+    def test_expected_score_is_logistic(self):
+        assert expected_score(0.0, 0.0) == 0.5
+        assert expected_score(2.0, 0.0) > 0.85
+        assert expected_score(0.0, 2.0) < 0.15
+
+    def test_correct_answer_raises_ability_and_lowers_difficulty(self, db_path, db):
+        engine = RatingEngine(db_path)
+        question = _mc(1)
+        engine.load([question])
+
+        assert engine.record(question, True) == 0.5
+        assert engine.ability("Math") > 0
+        assert engine.difficulty(1) < 0
+
+    def test_surprising_answers_move_ratings_more(self, db_path, db):
+        engine = RatingEngine(db_path)
+        easy, hard = _mc(1, "A"), _mc(2, "B")
+        engine.record(easy, True)
+        engine.record(easy, True)
+        engine.record(hard, False)
+        engine.record(hard, False)
+        before_easy = engine.difficulty(1)
+        before_hard = engine.difficulty(2)
+
+        engine.record(easy, False)  # expected to pass
+        engine.record(hard, False)  # expected to fail
+        assert engine.difficulty(1) - before_easy > engine.difficulty(2) - before_hard
+
+    def test_flush_persists_ratings(self, rated_questions):
+        db, questions = rated_questions
+        engine = RatingEngine(db._db_path)
+        engine.load(questions)
+        engine.record(questions[0], False)
+        assert engine.flush() == 1
+        assert engine.flush() == 0
+
+        reloaded = RatingEngine(db._db_path)
+        reloaded.load(questions)
+        assert reloaded.difficulty(questions[0].id) == engine.difficulty(
+            questions[0].id
+        )
+        assert reloaded.ability("Math") == engine.ability("Math")
+
+
+class TestAdaptiveSelector:
+    """Tests for picking the next question."""
+
+    def _engine_with(self, db_path, difficulties):
+        engine = RatingEngine(db_path)
+        questions = [_mc(qid) for qid in difficulties]
+        engine.load(questions)
+        for qid, difficulty in difficulties.items():
+            engine._difficulty[qid] = (difficulty, 10)
+        return engine, questions
+
+    def test_best_matches_target_difficulty(self, db_path, db):
+        engine, questions = self._engine_with(
+            db_path, {1: -3.0, 2: -0.8, 3: 0.5, 4: 2.5}
+        )
+        selector = AdaptiveSelector(engine, questions)
+        # Ability 0 targets a 70% success rate, difficulty ≈ -0.85
+        assert selector.best() == 2
+
+        selector.discard(2)
+        assert selector.best() == 3
+        assert 2 not in selector
+        assert len(selector) == 3
+
+    def test_best_follows_ability(self, db_path, db):
+        engine, questions = self._engine_with(db_path, {1: -3.0, 2: 0.0, 3: 3.0})
+        engine._ability["Math"] = (3.8, 50)
+        assert AdaptiveSelector(engine, questions).best() == 3
+
+    def test_empty_pool(self, db_path, db):
+        engine = RatingEngine(db_path)
+        assert AdaptiveSelector(engine, []).best() is None
+
+
+class TestRatedSessions:
+    """Tests for ratings driven by a practice session."""
+
+    def test_only_first_practice_answer_counts(self, db_path, db):
+        engine = RatingEngine(db_path)
+        questions = [_mc(1), _mc(2)]
+        session = TestSession(None, questions, mode="practice")
+        session.ratings = engine
+        session.start()
+
+        session.save_response(1, "B")
+        difficulty = engine.difficulty(1)
+        session.save_response(1, "A")
+        assert engine.difficulty(1) == difficulty
+        assert engine.ability("Math") < 0
+
+    def test_test_mode_does_not_rate(self, db_path, db):
+        engine = RatingEngine(db_path)
+        session = TestSession(None, [_mc(1)], mode="test")
+        session.ratings = engine
+        session.start()
+        session.save_response(1, "A")
+        assert engine.difficulty(1) == 0.0
+
+    def test_adaptive_session_serves_matching_questions(self, db_path, db, tmp_path):
+        engine = RatingEngine(db_path)
+        questions = [_mc(qid) for qid in (1, 2, 3)]
+        engine.load(questions)
+        engine._difficulty.update({1: (3.0, 10), 2: (-0.9, 10), 3: (0.4, 10)})
+
+        session = TestSession(None, questions, mode="practice")
+        session.enable_adaptive(engine)
+        assert session.get_current_question().id == 2
+        assert questions[0].id == 1  # caller's list untouched
+
+        path = tmp_path / "session.journal"
+        session.journal = SessionJournal(
+            str(path), header={"test_id": None, "questions": session.layout()}
+        )
+        session.start()
+        session.save_response(2, "A")
+        assert session.next_question().id == 3
+        session.journal.close()
+
+        state = SessionJournal.replay(str(path))
+        assert [qid for qid, _ in state.question_order] == [
+            q.id for q in session.questions
+        ]
+        assert session.state.index_of == {2: 0, 3: 1, 1: 2}
@@ -0,0 +1,37 @@
+"""Tests for the token-invalidated result cache."""
+
+import pytest
+
+from utils.result_cache import ResultCache
+
+
+class TestResultCache:
+    """Tests for lookups, eviction and invalidation."""
+
+    def test_hit_skips_compute(self):
+        cache = ResultCache()
+        calls = []
+        for _ in range(3):
+            assert cache.get("k", 1, lambda: calls.append(1) or "v") == "v"
+        assert len(calls) == 1
+        assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+
+    def test_new_token_clears_entries(self):
+        cache = ResultCache()
+        cache.get("a", 1, lambda: "old")
+        cache.get("b", 1, lambda: "old")
+        assert cache.get("a", 2, lambda: "new") == "new"
+        assert len(cache) == 1
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResultCache(maxsize=2)
+        cache.get("a", 0, lambda: 1)
+        cache.get("b", 0, lambda: 2)
+        cache.get("a", 0, lambda: 1)  # a is now the most recent
+        cache.get("c", 0, lambda: 3)
+        assert cache.get("a", 0, lambda: "recomputed") == 1
+        assert cache.get("b", 0, lambda: "recomputed") == "recomputed"
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ResultCache(maxsize=0)
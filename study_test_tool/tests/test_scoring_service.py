@@ -1,5 +1,7 @@
 """Tests for ScoringService."""
 
+import sqlite3
+
 import pytest
 
 from models.question import Question, QuestionOption
@@ -169,3 +171,138 @@ class TestScoringService:
         a2 = db.get_attempt_details(attempt_ids[1])
         assert a2.score == 0
         assert a2.percentage == 0.0
+
+    def test_save_mixed_attempt_links_session(self, db_path, db):
+        """The per-test attempts share one session carrying the mix totals."""
+        t1_id = db.create_test(Test(name="Test A"))
+        t2_id = db.create_test(Test(name="Test B"))
+        q1 = Question(test_id=t1_id, text="Q1", type="multiple_choice", correct_answer="A")
+        q2 = Question(test_id=t2_id, text="Q2", type="multiple_choice", correct_answer="B")
+        q1.id = db.add_question(q1)
+        q2.id = db.add_question(q2)
+
+        session = TestSession(test_id=None, questions=[q1, q2])
+        session.start()
+        session.responses = {q1.id: "A", q2.id: "Wrong"}
+
+        scoring = ScoringService(db_path)
+        attempt_ids = scoring.save_mixed_attempt(scoring.score_test(session), [q1, q2])
+
+        attempts = [db.get_attempt_details(a) for a in attempt_ids]
+        session_id = attempts[0].session_id
+        assert session_id is not None
+        assert attempts[1].session_id == session_id
+        saved = scoring.get_session_details(session_id)
+        assert (saved.score, saved.total_questions, saved.percentage) == (1, 2, 50.0)
+        assert [a.id for a in saved.attempts] == attempt_ids
+        assert sum(len(a.responses) for a in saved.attempts) == 2
+
+    def test_save_mixed_attempt_is_atomic(self, db_path, db):
+        """A failing response leaves no session, attempts, or responses."""
+        t1_id = db.create_test(Test(name="Test A"))
+        q1 = Question(test_id=t1_id, text="Q1", type="multiple_choice", correct_answer="A")
+        q1.id = db.add_question(q1)
+        ghost = Question(id=9999, test_id=t1_id, text="Gone", type="multiple_choice",
+                         correct_answer="A")
+
+        session = TestSession(test_id=None, questions=[q1, ghost])
+        session.start()
+        session.responses = {q1.id: "A", 9999: "A"}
+
+        scoring = ScoringService(db_path)
+        with pytest.raises(sqlite3.IntegrityError):
+            scoring.save_mixed_attempt(scoring.score_test(session), [q1, ghost])
+
+        assert db.get_all_attempts() == []
+        assert db.get_all_sessions() == {}
+
+
+class TestRescoreQuestions:
+    """Tests for ScoringService.rescore_questions."""
+
+    def _first_mc(self, db, test_id):
+        return next(
+            q for q in db.get_questions_for_test(test_id) if q.type == "multiple_choice"
+        )
+
+    def _set_answer(self, db, question, answer):
+        question.correct_answer = answer
+        db.update_question(question)
+
+    def test_fixing_answer_key_rescores_history(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        question = self._first_mc(db, test_id)
+        self._set_answer(db, question, "wrong answer")
+
+        result = ScoringService(db._db_path).rescore_questions([question.id])
+
+        assert result == {"responses_changed": 3, "attempts_changed": 3}
+        attempts = sorted(db.get_attempts_for_test(test_id), key=lambda a: a.id)
+        assert [(a.score, a.percentage) for a in attempts] == [
+            (1, 50.0), (2, 100.0), (2, 100.0),
+        ]
+        details = db.get_attempt_details(attempts[1].id)
+        response = next(r for r in details.responses if r.question_id == question.id)
+        assert response.is_correct
+
+    def test_unchanged_outcomes_are_left_alone(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        question = self._first_mc(db, test_id)
+        self._set_answer(db, question, "  3 ")
+
+        result = ScoringService(db._db_path).rescore_questions([question.id])
+
+        assert result == {"responses_changed": 1, "attempts_changed": 1}
+        assert ScoringService(db._db_path).rescore_questions([question.id]) == {
+            "responses_changed": 0, "attempts_changed": 0,
+        }
+
+    def test_essay_marks_are_left_alone(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        question = self._first_mc(db, test_id)
+        question.type = "essay"
+        question.correct_answer = "something else entirely"
+        db.update_question(question)
+        before = [(a.score, a.percentage) for a in db.get_attempts_for_test(test_id)]
+
+        result = ScoringService(db._db_path).rescore_questions([question.id])
+
+        assert result == {"responses_changed": 0, "attempts_changed": 0}
+        after = [(a.score, a.percentage) for a in db.get_attempts_for_test(test_id)]
+        assert after == before
+
+    def test_mix_session_totals_follow_rescore_and_override(self, db_path, db):
+        t1_id = db.create_test(Test(name="Test A"))
+        t2_id = db.create_test(Test(name="Test B"))
+        q1 = Question(test_id=t1_id, text="Q1", type="multiple_choice", correct_answer="A")
+        q2 = Question(test_id=t2_id, text="Q2", type="multiple_choice", correct_answer="B")
+        q1.id = db.add_question(q1)
+        q2.id = db.add_question(q2)
+        session = TestSession(test_id=None, questions=[q1, q2])
+        session.start()
+        session.responses = {q1.id: "A", q2.id: "C"}
+        scoring = ScoringService(db_path)
+        attempt_ids = scoring.save_mixed_attempt(scoring.score_test(session), [q1, q2])
+        session_id = db.get_attempt_details(attempt_ids[0]).session_id
+
+        self._set_answer(db, q2, "C")
+        scoring.rescore_questions([q2.id])
+        saved = scoring.get_session_details(session_id)
+        assert (saved.score, saved.total_questions, saved.percentage) == (2, 2, 100.0)
+
+        scoring.override_response(attempt_ids[0], q1.id, False)
+        saved = scoring.get_session_details(session_id)
+        assert (saved.score, saved.total_questions, saved.percentage) == (1, 2, 50.0)
+        assert saved.score == sum(a.score for a in saved.attempts)
+
+    def test_update_question_reports_answer_change(self, populated_db):
+        from services.question_service import QuestionService
+
+        db, test_id = populated_db
+        service = QuestionService(db._db_path)
+        question = self._first_mc(db, test_id)
+
+        question.text = "Reworded"
+        assert service.update_question(question) is False
+        question.correct_answer = "5"
+        assert service.update_question(question) is True
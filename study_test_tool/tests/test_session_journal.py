@@ -0,0 +1,132 @@
+"""Tests for the crash-safe session journal."""
+
+import pytest
+
+from models.question import Question, QuestionOption
+from services.session_journal import SessionJournal
+from services.test_session import TestSession
+
+
+@pytest.fixture
+def questions():
+    return [
+        Question(
+            id=1,
+            text="Q1",
+            type="multiple_choice",
+            correct_answer="A",
+            options=[
+                QuestionOption(id=11, text="A", is_correct=True),
+                QuestionOption(id=12, text="B", is_correct=False),
+            ],
+        ),
+        Question(
+            id=2,
+            text="Q2",
+            type="multiple_choice",
+            correct_answer="X",
+            options=[
+                QuestionOption(id=21, text="X", is_correct=True),
+                QuestionOption(id=22, text="Y", is_correct=False),
+            ],
+        ),
+        Question(id=3, text="Essay Q", type="essay", correct_answer="Answer"),
+    ]
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "session.journal")
+
+
+def _journaled_session(questions, journal_path):
+    session = TestSession(test_id=7, questions=questions, mode="practice")
+    session.start()
+    session.journal = SessionJournal(
+        journal_path,
+        header={
+            "test_id": 7,
+            "mode": "practice",
+            "title": "Biology",
+            "questions": session.layout(),
+        },
+        flush_interval=60,
+    )
+    return session
+
+
+class TestSessionJournal:
+    """Journaling and replaying session events."""
+
+    def test_replay_restores_session_exactly(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.save_response(1, "A")
+        session.flag_question(1)
+        session.next_question()
+        session.save_response(2, "Y")
+        session.flag_question(2)
+        session.flag_question(2)
+        session.go_to_question(2)
+        session.save_response(3, "draft")
+        session.save_response(3, "")
+        session.journal.close()
+
+        state = SessionJournal.replay(journal_path)
+        assert state.test_id == 7
+        assert state.mode == "practice"
+        assert state.title == "Biology"
+        assert state.question_order == [[1, [11, 12]], [2, [21, 22]], [3, []]]
+
+        restored = TestSession.from_journal(state, questions)
+        assert restored.current_index == 2
+        assert restored.responses == {1: "A", 2: "Y"}
+        assert restored.flagged == {1}
+        assert restored.question_times == session.question_times
+        assert restored.mode == "practice"
+
+    def test_events_are_buffered_until_group_flush(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.save_response(1, "A")
+        assert SessionJournal.replay(journal_path).responses == {}
+
+        session.journal.flush()
+        assert SessionJournal.replay(journal_path).responses == {1: "A"}
+        session.journal.close()
+
+    def test_unchanged_answer_is_not_journaled(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.save_response(1, "A")
+        session.save_response(1, "A")
+        session.journal.close()
+
+        with open(journal_path, encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 2  # header + one response
+
+    def test_torn_last_line_is_ignored(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.save_response(1, "A")
+        session.journal.close()
+        with open(journal_path, "a", encoding="utf-8") as f:
+            f.write('["r",2,"X"')
+
+        state = SessionJournal.replay(journal_path)
+        assert state.responses == {1: "A"}
+
+    def test_reopened_journal_appends(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.save_response(1, "A")
+        session.journal.close()
+
+        restored = TestSession.from_journal(
+            SessionJournal.replay(journal_path), questions
+        )
+        restored.journal = SessionJournal(journal_path, flush_interval=60)
+        restored.save_response(2, "X")
+        restored.journal.close()
+
+        assert SessionJournal.replay(journal_path).responses == {1: "A", 2: "X"}
+
+    def test_discard_deletes_file(self, questions, journal_path):
+        session = _journaled_session(questions, journal_path)
+        session.journal.discard()
+        assert SessionJournal.replay(journal_path) is None
@@ -0,0 +1,102 @@
+"""Tests for spaced-repetition scheduling."""
+
+import sqlite3
+
+from models.review_card import ReviewCard
+from models.test_result import QuestionResponse
+from services.scoring_service import ScoringService
+from services.spaced_repetition_service import (
+    MIN_EASE,
+    SECONDS_PER_DAY,
+    SpacedRepetitionService,
+    schedule,
+)
+from services.test_session import TestSession
+
+
+class TestSchedule:
+    """Tests for the SM-2 update."""
+
+    def test_intervals_grow_on_recall(self):
+        card = ReviewCard(question_id=1)
+        intervals = [schedule(card, 4, 0).interval_days for _ in range(4)]
+        assert intervals[:2] == [1.0, 6.0]
+        assert intervals[2] == 15.0  # 6 * 2.5, ease unchanged at quality 4
+        assert intervals[3] > intervals[2]
+        assert card.due_at == intervals[3] * SECONDS_PER_DAY
+
+    def test_lapse_resets_interval(self):
+        card = ReviewCard(question_id=1, interval_days=30.0, repetitions=5)
+        schedule(card, 1, 100.0)
+        assert card.interval_days == 1.0
+        assert card.repetitions == 0
+        assert card.lapses == 1
+        assert card.ease < 2.5
+        assert card.due_at == 100.0 + SECONDS_PER_DAY
+
+    def test_ease_has_a_floor(self):
+        card = ReviewCard(question_id=1)
+        for _ in range(10):
+            schedule(card, 0, 0)
+        assert card.ease == MIN_EASE
+
+
+class TestSpacedRepetitionService:
+    """Tests for batch updates and the due queue."""
+
+    def test_record_skips_ungraded_responses(self, db_path, db):
+        service = SpacedRepetitionService(db_path)
+        assert (
+            service.record_responses(
+                [QuestionResponse(question_id=1, user_answer="essay")]
+            )
+            == 0
+        )
+
+    def test_due_queue_is_ordered_and_limited(self, populated_db):
+        db, test_id = populated_db
+        q1, q2, q3 = (q.id for q in db.get_questions_for_test(test_id))
+        db.save_review_cards(
+            [
+                ReviewCard(question_id=q1, due_at=300.0),
+                ReviewCard(question_id=q2, due_at=100.0),
+                ReviewCard(question_id=q3, due_at=900.0),
+            ]
+        )
+        service = SpacedRepetitionService(db._db_path)
+
+        assert service.get_due(now=500.0) == [q2, q1]
+        assert service.get_due(limit=1, now=500.0) == [q2]
+        assert service.count_due(now=500.0) == 2
+        assert [q.id for q in service.get_due_questions(now=1000.0)] == [q2, q1, q3]
+
+    def test_due_query_uses_the_index(self, db_path, db):
+        conn = sqlite3.connect(db_path)
+        try:
+            plan = " ".join(
+                row[-1]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT question_id FROM review_schedule "
+                    "WHERE due_at <= ? ORDER BY due_at, question_id LIMIT ?",
+                    (0, 10),
+                )
+            )
+        finally:
+            conn.close()
+        assert "idx_review_schedule_due" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_saved_attempt_schedules_answered_questions(self, populated_db):
+        db, test_id = populated_db
+        questions = db.get_questions_for_test(test_id)
+        session = TestSession(test_id=test_id, questions=questions)
+        session.start()
+        session.responses = {questions[0].id: "4", questions[1].id: "London"}
+
+        scoring = ScoringService(db._db_path)
+        scoring.save_attempt(test_id, scoring.score_test(session))
+
+        cards = db.get_review_cards([q.id for q in questions])
+        assert cards[questions[0].id].repetitions == 1
+        assert cards[questions[1].id].lapses == 1
+        assert questions[2].id not in cards  # essay, not graded
@@ -0,0 +1,281 @@
+"""Tests for SyncService change tracking and delta sync."""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from config.database import initialize_database
+from database.db_manager import DatabaseManager
+from database.migrations import run_migrations
+from models.question import Question
+from models.test import Test
+from models.test_result import StudySession, TestAttempt
+from services.sync_service import SyncService
+
+
+@pytest.fixture
+def other_db():
+    """A second, independent database standing in for another machine."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    initialize_database(path)
+    run_migrations(path)
+    yield DatabaseManager(path)
+    os.unlink(path)
+
+
+@pytest.fixture
+def change_file(tmp_path):
+    """Path for a change file."""
+    return str(tmp_path / "changes.json")
+
+
+def _set_updated_at(db_path, table, row_id, value):
+    """Force a row's updated_at without bumping it to now."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(f"UPDATE {table} SET updated_at = ? WHERE id = ?", (value, row_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _save_mix_session(db):
+    """Save a two-test mix session with seeds and a timeline; return test ids."""
+    test_ids = [db.create_test(Test(name=name)) for name in ("Mix A", "Mix B")]
+    db.save_session(
+        StudySession(
+            score=1,
+            total_questions=2,
+            percentage=50.0,
+            seed=42,
+            shuffle_version=1,
+            source_test_ids=test_ids,
+            attempts=[
+                TestAttempt(
+                    test_id=tid,
+                    score=score,
+                    total_questions=1,
+                    seed=42,
+                    shuffle_version=1,
+                    timeline=b"\x00\x01\xff",
+                )
+                for tid, score in zip(test_ids, (1, 0))
+            ],
+        )
+    )
+    return test_ids
+
+
+class TestChangeTracking:
+    """Tests for the uuid/change_seq triggers."""
+
+    def test_rows_get_uuid_and_change_seq(self, db_with_attempts):
+        db, test_id = db_with_attempts
+        conn = sqlite3.connect(db._db_path)
+        try:
+            for table in (
+                "tests",
+                "questions",
+                "question_options",
+                "test_attempts",
+                "question_responses",
+            ):
+                missing = conn.execute(
+                    f"SELECT COUNT(*) FROM {table} "
+                    "WHERE uuid IS NULL OR change_seq = 0"
+                ).fetchone()[0]
+                assert missing == 0, table
+        finally:
+            conn.close()
+
+    def test_update_advances_cursor(self, populated_db):
+        db, test_id = populated_db
+        before = db.get_change_cursor()
+        test = db.get_test_by_id(test_id)
+        test.name = "Renamed"
+        db.update_test(test)
+        assert db.get_change_cursor() > before
+
+    def test_delete_leaves_tombstone(self, populated_db):
+        db, test_id = populated_db
+        question = db.get_questions_for_test(test_id)[0]
+        cursor = db.get_change_cursor()
+        db.delete_question(question.id)
+
+        changes = db.get_changes_since(cursor)
+        deleted_tables = {d["table"] for d in changes["deleted"]}
+        assert "questions" in deleted_tables
+        assert "question_options" in deleted_tables
+
+
+class TestExportChanges:
+    """Tests for SyncService.export_changes_since."""
+
+    def test_export_all_from_zero(self, db_with_attempts, change_file):
+        db, test_id = db_with_attempts
+        service = SyncService(db._db_path)
+
+        cursor = service.export_changes_since(0, change_file)
+
+        with open(change_file, encoding="utf-8") as f:
+            data = json.load(f)
+        assert cursor == service.get_current_cursor()
+        assert len(data["tests"]) == 1
+        assert len(data["questions"]) == 3
+        assert len(data["test_attempts"]) == 3
+        assert len(data["question_responses"]) == 6
+        assert all("test_uuid" in q for q in data["questions"])
+
+    def test_export_since_cursor_is_incremental(self, populated_db, change_file):
+        db, test_id = populated_db
+        service = SyncService(db._db_path)
+        cursor = service.export_changes_since(0, change_file)
+
+        db.add_question(
+            Question(test_id=test_id, text="New?", type="essay", correct_answer="Yes")
+        )
+        service.export_changes_since(cursor, change_file)
+
+        with open(change_file, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["tests"] == []
+        assert [q["question_text"] for q in data["questions"]] == ["New?"]
+
+
+class TestApplyChanges:
+    """Tests for SyncService.apply_changes."""
+
+    def test_apply_copies_everything(self, db_with_attempts, other_db, change_file):
+        db, test_id = db_with_attempts
+        SyncService(db._db_path).export_changes_since(0, change_file)
+
+        counts = SyncService(other_db._db_path).apply_changes(change_file)
+
+        assert counts["inserted"] == 1 + 3 + 7 + 3 + 6
+        tests = other_db.get_all_tests()
+        assert [t.name for t in tests] == ["Sample Test"]
+        assert len(other_db.get_questions_for_test(tests[0].id)) == 3
+        assert len(other_db.get_attempts_for_test(tests[0].id)) == 3
+
+    def test_apply_copies_mix_sessions(self, db, other_db, change_file):
+        _save_mix_session(db)
+        other_db.create_test(Test(name="Only here"))
+        SyncService(db._db_path).export_changes_since(0, change_file)
+
+        SyncService(other_db._db_path).apply_changes(change_file)
+
+        (session,) = other_db.get_all_sessions().values()
+        mixed = {t.name: t.id for t in other_db.get_all_tests()}
+        assert session.source_test_ids == [mixed["Mix A"], mixed["Mix B"]]
+        assert (session.score, session.seed, session.shuffle_version) == (1, 42, 1)
+        attempts = other_db.get_session_details(session.id).attempts
+        assert [(a.test_id, a.seed) for a in attempts] == [
+            (mixed["Mix A"], 42),
+            (mixed["Mix B"], 42),
+        ]
+        assert other_db.get_attempt_timelines(mixed["Mix A"]) == [b"\x00\x01\xff"]
+
+    def test_apply_twice_is_idempotent(self, populated_db, other_db, change_file):
+        db, test_id = populated_db
+        SyncService(db._db_path).export_changes_since(0, change_file)
+        target = SyncService(other_db._db_path)
+
+        target.apply_changes(change_file)
+        counts = target.apply_changes(change_file)
+
+        assert counts["inserted"] == 0
+        assert counts["updated"] == 0
+        assert len(other_db.get_all_tests()) == 1
+
+    def test_newer_edit_wins(self, populated_db, other_db, change_file):
+        db, test_id = populated_db
+        source = SyncService(db._db_path)
+        target = SyncService(other_db._db_path)
+        cursor = source.export_changes_since(0, change_file)
+        target.apply_changes(change_file)
+
+        test = db.get_test_by_id(test_id)
+        test.name = "Edited on laptop"
+        db.update_test(test)
+        _set_updated_at(db._db_path, "tests", test_id, "2099-01-01 00:00:00")
+        source.export_changes_since(cursor, change_file)
+        counts = target.apply_changes(change_file)
+
+        assert counts["updated"] == 1
+        assert other_db.get_all_tests()[0].name == "Edited on laptop"
+
+    def test_older_edit_loses(self, populated_db, other_db, change_file):
+        db, test_id = populated_db
+        source = SyncService(db._db_path)
+        cursor = source.export_changes_since(0, change_file)
+        SyncService(other_db._db_path).apply_changes(change_file)
+
+        local = other_db.get_all_tests()[0]
+        local.name = "Edited on desktop"
+        other_db.update_test(local)
+        _set_updated_at(other_db._db_path, "tests", local.id, "2099-01-01 00:00:00")
+
+        test = db.get_test_by_id(test_id)
+        test.name = "Edited on laptop"
+        db.update_test(test)
+        _set_updated_at(db._db_path, "tests", test_id, "2000-01-01 00:00:00")
+        source.export_changes_since(cursor, change_file)
+        SyncService(other_db._db_path).apply_changes(change_file)
+
+        assert other_db.get_all_tests()[0].name == "Edited on desktop"
+
+    def test_tie_resolves_identically_on_both_sides(self, other_db, db, tmp_path):
+        """Equal timestamps converge to the same winner in both directions."""
+        t_id = db.create_test(Test(name="Base"))
+        a_file = str(tmp_path / "a.json")
+        b_file = str(tmp_path / "b.json")
+        a, b = SyncService(db._db_path), SyncService(other_db._db_path)
+        a_cursor = a.export_changes_since(0, a_file)
+        b.apply_changes(a_file)
+        b_cursor = b.get_current_cursor()
+
+        for mgr, row_id, name in (
+            (db, t_id, "Name A"),
+            (other_db, other_db.get_all_tests()[0].id, "Name B"),
+        ):
+            test = mgr.get_test_by_id(row_id)
+            test.name = name
+            mgr.update_test(test)
+            _set_updated_at(mgr._db_path, "tests", row_id, "2050-01-01 00:00:00")
+
+        a.export_changes_since(a_cursor, a_file)
+        b.export_changes_since(b_cursor, b_file)
+        b.apply_changes(a_file)
+        a.apply_changes(b_file)
+
+        assert db.get_all_tests()[0].name == other_db.get_all_tests()[0].name
+
+    def test_delete_propagates(self, populated_db, other_db, change_file):
+        db, test_id = populated_db
+        source = SyncService(db._db_path)
+        cursor = source.export_changes_since(0, change_file)
+        SyncService(other_db._db_path).apply_changes(change_file)
+
+        question = db.get_questions_for_test(test_id)[0]
+        db.delete_question(question.id)
+        source.export_changes_since(cursor, change_file)
+        SyncService(other_db._db_path).apply_changes(change_file)
+
+        remote_test = other_db.get_all_tests()[0]
+        remaining = other_db.get_questions_for_test(remote_test.id)
+        assert question.text not in [q.text for q in remaining]
+
+    def test_apply_rejects_foreign_file(self, db, change_file):
+        with open(change_file, "w", encoding="utf-8") as f:
+            json.dump({"name": "A test", "questions": []}, f)
+
+        with pytest.raises(ValueError):
+            SyncService(db._db_path).apply_changes(change_file)
+
+    def test_apply_missing_file(self, db):
+        with pytest.raises(FileNotFoundError):
+            SyncService(db._db_path).apply_changes("/nonexistent/changes.json")
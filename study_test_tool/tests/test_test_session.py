@@ -123,3 +123,58 @@ class TestTestSession:
         session.finish_test()
         # Should not raise
         assert True
+
+
+class TestCompactSessionState:
+    """Positional state, O(1) counts and dirty indices."""
+
+    def test_counts_follow_changes(self, session):
+        session.save_response(1, "A")
+        session.save_response(2, "X")
+        session.save_response(1, "")
+        session.flag_question(3)
+        assert session.get_unanswered_count() == 2
+        assert session.get_flagged_count() == 1
+        assert session.state.answered_count == 1
+
+    def test_dirty_indices_report_changes_only(self, session):
+        session.take_dirty_indices()
+        session.save_response(2, "X")
+        assert session.take_dirty_indices() == [1]
+        assert session.take_dirty_indices() == []
+
+        session.go_to_question(2)
+        session.flag_question(3)
+        assert session.take_dirty_indices() == [0, 2]
+
+        session.save_response(2, "X")  # unchanged
+        assert session.take_dirty_indices() == []
+
+    def test_assigning_views_replaces_state(self, session):
+        session.save_response(3, "essay")
+        session.responses = {1: "A", 2: "Y"}
+        session.flagged = {2}
+        assert session.responses == {1: "A", 2: "Y"}
+        assert 3 not in session.responses
+        assert session.flagged == {2}
+        assert session.get_unanswered_count() == 1
+
+    def test_question_times_round_to_nearest_second(self, session):
+        session.state.set_time(0, 700_000_000)
+        session.state.set_time(1, 1_400_000_000)
+        assert session.question_times == {1: 1, 2: 1}
+
+    def test_large_session(self):
+        questions = [
+            Question(id=i, text=f"Q{i}", type="multiple_choice", correct_answer="A")
+            for i in range(1, 10_001)
+        ]
+        session = TestSession(test_id=1, questions=questions)
+        session.start()
+        for qid in range(1, 10_001, 2):
+            session.save_response(qid, "A")
+        session.flag_question(10_000)
+        assert session.get_unanswered_count() == 5_000
+        assert len(session.responses) == 5_000
+        assert list(session.flagged) == [10_000]
+        assert len(session.take_dirty_indices()) == 5_001
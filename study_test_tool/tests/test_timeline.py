@@ -0,0 +1,108 @@
+"""Tests for the packed session event timeline."""
+
+import pytest
+
+from services.analytics_service import AnalyticsService
+from services.scoring_service import ScoringService
+from services.test_session import TestSession
+from utils import timeline as events
+from utils.timeline import Timeline
+
+MS = 1_000_000  # nanoseconds per millisecond
+
+
+class TestTimeline:
+    """Recording, packing and summarising events."""
+
+    def test_round_trip(self):
+        timeline = Timeline()
+        timeline.start(0)
+        timeline.record(events.VIEW_ENTER, 1, 0)
+        timeline.record(events.ANSWER_SET, 1, 120 * MS)
+        timeline.record(events.VIEW_EXIT, 1, 250 * MS)
+        timeline.record(events.VIEW_ENTER, 2, 250 * MS)
+
+        blob = timeline.to_bytes()
+        assert len(blob) == 5 + 4 * 13
+
+        restored = Timeline.from_bytes(blob)
+        assert list(restored.events()) == [
+            (events.VIEW_ENTER, 1, 0),
+            (events.ANSWER_SET, 1, 120),
+            (events.VIEW_EXIT, 1, 250),
+            (events.VIEW_ENTER, 2, 250),
+        ]
+
+    def test_durations_sum_revisits(self):
+        timeline = Timeline()
+        timeline.start(0)
+        timeline.record(events.VIEW_ENTER, 1, 0)
+        timeline.record(events.VIEW_EXIT, 1, 40 * MS)
+        timeline.record(events.VIEW_ENTER, 2, 40 * MS)
+        timeline.record(events.VIEW_EXIT, 2, 100 * MS)
+        timeline.record(events.VIEW_ENTER, 1, 100 * MS)
+        timeline.record(events.VIEW_EXIT, 1, 107 * MS)
+
+        assert timeline.durations_ms() == {1: 47, 2: 60}
+
+    def test_filter_by_question(self):
+        timeline = Timeline()
+        timeline.start(0)
+        timeline.record(events.VIEW_ENTER, 1, 0)
+        timeline.record(events.VIEW_EXIT, 1, 5 * MS)
+        timeline.record(events.VIEW_ENTER, 2, 5 * MS)
+
+        restored = Timeline.from_bytes(timeline.to_bytes([2]))
+        assert list(restored.question_ids) == [2]
+
+    def test_truncated_blob_rejected(self):
+        timeline = Timeline()
+        timeline.record(events.FLAG, 1)
+        with pytest.raises(ValueError):
+            Timeline.from_bytes(timeline.to_bytes()[:-1])
+
+
+class TestSessionTimeline:
+    """Sessions record a timeline and persist it with the attempt."""
+
+    def test_session_records_events(self, populated_db):
+        db, test_id = populated_db
+        questions = db.get_questions_for_test(test_id)
+        first, second = questions[0].id, questions[1].id
+
+        session = TestSession(test_id=test_id, questions=questions)
+        session.start()
+        session.save_response(first, "3")
+        session.save_response(first, "4")
+        session.flag_question(first)
+        session.next_question()
+        session.finish_test()
+
+        kinds = [(kind, qid) for kind, qid, _ in session.timeline.events()]
+        assert kinds == [
+            (events.VIEW_ENTER, first),
+            (events.ANSWER_SET, first),
+            (events.ANSWER_CHANGE, first),
+            (events.FLAG, first),
+            (events.VIEW_EXIT, first),
+            (events.VIEW_ENTER, second),
+            (events.VIEW_EXIT, second),
+        ]
+        assert set(session.question_times_ms) == {first, second}
+
+    def test_time_per_question_from_saved_attempts(self, populated_db, db_path):
+        db, test_id = populated_db
+        questions = db.get_questions_for_test(test_id)
+
+        session = TestSession(test_id=test_id, questions=questions)
+        session.start()
+        session.next_question()
+        session.finish_test()
+
+        scoring = ScoringService(db_path)
+        scoring.save_attempt(test_id, scoring.score_test(session))
+
+        times = AnalyticsService(db_path).get_time_per_question(test_id)
+        assert set(times) == {questions[0].id, questions[1].id}
+        assert times[questions[0].id]["views"] == 1
+        assert times[questions[0].id]["total_ms"] >= 0
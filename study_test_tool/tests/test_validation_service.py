@@ -0,0 +1,77 @@
+"""Tests for ValidationService."""
+
+from models.question import Question, QuestionOption
+from models.test import Test
+from services.validation_service import ValidationService
+
+
+def _add_mc(db, test_id, text, correct_answer, options):
+    """Add an MC question with (text, is_correct) options."""
+    return db.add_question(
+        Question(
+            test_id=test_id,
+            text=text,
+            type="multiple_choice",
+            correct_answer=correct_answer,
+            options=[QuestionOption(text=t, is_correct=c) for t, c in options],
+        )
+    )
+
+
+class TestValidateLibrary:
+    """Tests for ValidationService.validate_library."""
+
+    def test_clean_library_has_no_warnings(self, populated_db):
+        db, test_id = populated_db
+        assert ValidationService(db._db_path).validate_library() == {}
+
+    def test_finds_each_kind_of_problem(self, db):
+        test_id = db.create_test(Test(name="Broken"))
+        _add_mc(db, test_id, "Fine", "A", [("A", True), ("B", False)])
+        _add_mc(db, test_id, "No correct", "", [("A", False), ("B", False)])
+        _add_mc(db, test_id, "No options", "", [])
+        _add_mc(db, test_id, "Two correct", "A", [("A", True), ("B", True)])
+        db.add_question(
+            Question(test_id=test_id, text="Essay", type="essay", correct_answer="  ")
+        )
+
+        warnings = ValidationService(db._db_path).validate_library()
+
+        assert warnings[test_id] == [
+            "Q2 has no correct answer set.",
+            "Q3 has no correct answer set.",
+            "Q3 has no answer options.",
+            "Q4 has 2 options marked correct.",
+            "Q5 (essay) has no expected answer set.",
+        ]
+
+    def test_positions_are_per_test(self, db):
+        first = db.create_test(Test(name="First"))
+        second = db.create_test(Test(name="Second"))
+        _add_mc(db, first, "Fine", "A", [("A", True)])
+        _add_mc(db, second, "Bad", "", [("A", False)])
+        _add_mc(db, first, "Bad too", "", [("A", False)])
+
+        warnings = ValidationService(db._db_path).validate_library()
+
+        assert warnings == {
+            first: ["Q2 has no correct answer set."],
+            second: ["Q1 has no correct answer set."],
+        }
+
+
+class TestValidateTests:
+    """Tests for ValidationService.validate_tests."""
+
+    def test_only_requested_tests_are_checked(self, db):
+        first = db.create_test(Test(name="First"))
+        second = db.create_test(Test(name="Second"))
+        _add_mc(db, first, "Bad", "", [])
+        _add_mc(db, second, "Bad", "", [])
+
+        warnings = ValidationService(db._db_path).validate_tests([second])
+
+        assert list(warnings) == [second]
+
+    def test_empty_id_list(self, db):
+        assert ValidationService(db._db_path).validate_tests([]) == {}
@@ -13,6 +13,11 @@ SCREEN_ANALYTICS = "analytics"
 MODE_TEST = "test"
 MODE_PRACTICE = "practice"
 
+# Mix test selection strategies
+MIX_UNIFORM = "uniform"
+MIX_WEIGHTED = "weighted"
+MIX_STRATIFIED = "stratified"
+
 # File extensions
 JSON_EXTENSION = ".json"
 TEXT_EXTENSION = ".txt"
@@ -21,6 +26,7 @@ TEXT_EXTENSION = ".txt"
 IMPORT_FILE_TYPES = [
     ("JSON files", "*.json"),
     ("Text files", "*.txt"),
+    ("PDF files", "*.pdf"),
     ("All files", "*.*"),
 ]
 
@@ -0,0 +1,64 @@
+"""Bounded memo of computed results, dropped whenever a change token moves."""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class ResultCache:
+    """Least-recently-used cache whose entries share one validity token.
+
+    Every lookup passes the current token (e.g. the database's change
+    token); when it differs from the token the entries were computed
+    under, the whole cache is cleared. Cached values are returned as-is,
+    so callers must not mutate them.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._token: Hashable = None
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, token: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it on a miss.
+
+        Args:
+            key: Hashable identity of the result (method name and arguments).
+            token: Current validity token; a new token empties the cache.
+            compute: Called with no arguments to produce a missing value.
+        """
+        if token != self._token:
+            self._entries.clear()
+            self._token = token
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry (the hit and miss counts are kept)."""
+        self._entries.clear()
+        self._token = None
+
+    def stats(self) -> Dict:
+        """Return hits, misses, hit_rate (0-1) and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,163 @@
+"""Compact per-session event timeline backed by ``array`` buffers."""
+
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Event kinds
+VIEW_ENTER = 1
+VIEW_EXIT = 2
+ANSWER_SET = 3
+ANSWER_CHANGE = 4
+ANSWER_CLEAR = 5
+FLAG = 6
+UNFLAG = 7
+
+TIMELINE_VERSION = 1
+
+# Blob header: version, event count
+_HEADER = struct.Struct("<BI")
+_NEEDS_SWAP = sys.byteorder == "big"
+
+
+class Timeline:
+    """Records session events as three parallel typed arrays.
+
+    Each event is a kind (uint8), a question id (int64) and a millisecond
+    offset from the start of the session (uint32), 13 bytes in total.
+    Offsets come from ``time.perf_counter_ns`` so they are unaffected by
+    wall-clock changes.
+    """
+
+    def __init__(self) -> None:
+        self.kinds = array("B")
+        self.question_ids = array("q")
+        self.offsets_ms = array("I")
+        self._origin_ns: int = time.perf_counter_ns()
+
+    def start(self, origin_ns: Optional[int] = None) -> None:
+        """Set the instant that offsets are measured from."""
+        self._origin_ns = time.perf_counter_ns() if origin_ns is None else origin_ns
+
+    def record(self, kind: int, question_id: int, at_ns: Optional[int] = None) -> None:
+        """Append one event.
+
+        Args:
+            kind: One of the event kind constants.
+            question_id: The question the event belongs to.
+            at_ns: ``perf_counter_ns`` reading; defaults to now.
+        """
+        if at_ns is None:
+            at_ns = time.perf_counter_ns()
+        self.kinds.append(kind)
+        self.question_ids.append(question_id)
+        self.offsets_ms.append(max(0, (at_ns - self._origin_ns) // 1_000_000))
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def events(self) -> Iterable[Tuple[int, int, int]]:
+        """Iterate over (kind, question_id, offset_ms) tuples."""
+        return zip(self.kinds, self.question_ids, self.offsets_ms)
+
+    def to_bytes(self, question_ids: Optional[Iterable[int]] = None) -> bytes:
+        """Pack the timeline into a blob.
+
+        Args:
+            question_ids: If given, keep only events for these questions
+                (used to split a mix session per source test).
+
+        Returns:
+            The packed timeline.
+        """
+        kinds, qids, offsets = self.kinds, self.question_ids, self.offsets_ms
+        if question_ids is not None:
+            keep = set(question_ids)
+            rows = [e for e in self.events() if e[1] in keep]
+            kinds = array("B", (e[0] for e in rows))
+            qids = array("q", (e[1] for e in rows))
+            offsets = array("I", (e[2] for e in rows))
+        elif _NEEDS_SWAP:
+            qids, offsets = array("q", qids), array("I", offsets)
+
+        if _NEEDS_SWAP:
+            qids.byteswap()
+            offsets.byteswap()
+        return (
+            _HEADER.pack(TIMELINE_VERSION, len(kinds))
+            + kinds.tobytes()
+            + qids.tobytes()
+            + offsets.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "Timeline":
+        """Unpack a blob written by ``to_bytes``.
+
+        Raises:
+            ValueError: If the blob has an unknown version or is truncated.
+        """
+        version, count = _HEADER.unpack_from(blob)
+        if version != TIMELINE_VERSION:
+            raise ValueError(f"Unsupported timeline version: {version}")
+        pos = _HEADER.size
+        if len(blob) != pos + count * 13:
+            raise ValueError("Timeline blob is truncated.")
+
+        timeline = cls()
+        timeline.kinds.frombytes(blob[pos : pos + count])
+        pos += count
+        timeline.question_ids.frombytes(blob[pos : pos + count * 8])
+        pos += count * 8
+        timeline.offsets_ms.frombytes(blob[pos : pos + count * 4])
+        if _NEEDS_SWAP:
+            timeline.question_ids.byteswap()
+            timeline.offsets_ms.byteswap()
+        return timeline
+
+    def durations_ms(self) -> Dict[int, int]:
+        """Total milliseconds each question was on screen.
+
+        A view still open at the end of the timeline counts up to the last
+        recorded event.
+        """
+        totals: Dict[int, int] = {}
+        open_views: Dict[int, int] = {}
+        last = 0
+        for kind, question_id, offset in self.events():
+            last = offset
+            if kind == VIEW_ENTER:
+                open_views[question_id] = offset
+            elif kind == VIEW_EXIT and question_id in open_views:
+                entered = open_views.pop(question_id)
+                totals[question_id] = totals.get(question_id, 0) + offset - entered
+        for question_id, entered in open_views.items():
+            totals[question_id] = totals.get(question_id, 0) + last - entered
+        return totals
+
+    def answer_changes(self) -> Dict[int, int]:
+        """Number of times each question's answer was changed or cleared."""
+        changes: Dict[int, int] = {}
+        for kind, question_id, _ in self.events():
+            if kind in (ANSWER_CHANGE, ANSWER_CLEAR):
+                changes[question_id] = changes.get(question_id, 0) + 1
+        return changes
+
+
+def merge_durations(blobs: List[bytes]) -> Dict[int, List[int]]:
+    """Collect per-question view durations across many packed timelines.
+
+    Args:
+        blobs: Packed timelines, one per attempt.
+
+    Returns:
+        Dict of question_id → list of durations in ms (one per attempt
+        in which the question was viewed).
+    """
+    merged: Dict[int, List[int]] = {}
+    for blob in blobs:
+        for question_id, ms in Timeline.from_bytes(blob).durations_ms().items():
+            merged.setdefault(question_id, []).append(ms)
+    return merged
@@ -4,42 +4,49 @@ import time
 
 
 class Timer:
-    """Tracks elapsed time with pause/resume support."""
+    """Tracks elapsed time with pause/resume support.
+
+    Uses the monotonic clock, so wall-clock changes don't affect it.
+    """
 
     def __init__(self) -> None:
         self._start_time: float = 0.0
         self._elapsed: float = 0.0
         self._running: bool = False
 
-    def start(self) -> None:
-        """Start or restart the timer."""
-        self._start_time = time.time()
-        self._elapsed = 0.0
+    def start(self, offset: float = 0.0) -> None:
+        """Start or restart the timer.
+
+        Args:
+            offset: Seconds already elapsed (when resuming a session).
+        """
+        self._start_time = time.monotonic()
+        self._elapsed = offset
         self._running = True
 
     def pause(self) -> None:
         """Pause the timer, accumulating elapsed time."""
         if self._running:
-            self._elapsed += time.time() - self._start_time
+            self._elapsed += time.monotonic() - self._start_time
             self._running = False
 
     def resume(self) -> None:
         """Resume the timer after a pause."""
         if not self._running:
-            self._start_time = time.time()
+            self._start_time = time.monotonic()
             self._running = True
 
     def stop(self) -> float:
         """Stop the timer and return total elapsed seconds."""
         if self._running:
-            self._elapsed += time.time() - self._start_time
+            self._elapsed += time.monotonic() - self._start_time
             self._running = False
         return self._elapsed
 
     def get_elapsed(self) -> float:
         """Return total elapsed seconds (works while running or paused)."""
         if self._running:
-            return self._elapsed + (time.time() - self._start_time)
+            return self._elapsed + (time.monotonic() - self._start_time)
         return self._elapsed
 
     def get_elapsed_int(self) -> int: